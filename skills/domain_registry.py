@@ -0,0 +1,131 @@
+"""
+L0 智能网关：搜索域注册表
+domain 名称 -> 处理函数 handler(query, output_format) -> str，网关按注册表分发，不再硬编码 if/elif
+
+- 处理函数可以是可调用对象（内置 domain 在函数内导入引擎），也可以是 "模块:函数" 字符串
+  （该 domain 首次被调用时才导入）；只用 PubMed 的调用不会加载浏览器 / 专利引擎
+- 新数据源（ClinicalTrials.gov、ChiCTR、USPTO 等）以插件形式接入，无需修改网关：
+  插件模块定义 register_domains(register)，在其中调用 register("clinicaltrials", "my_plugin:search", "说明")；
+  GATEWAY_PLUGINS 列出的插件模块在首次查找未知 domain 或列出全部 domain 时导入
+- 插件导入失败只记录在统计中，不影响内置 domain
+
+环境变量：
+- GATEWAY_PLUGINS: 逗号分隔的插件模块名（如 "plugins.clinicaltrials,plugins.chictr"）
+"""
+
+import os
+import sys
+import time
+import importlib
+import threading
+from typing import Any, Callable, Dict, List, Optional, Union
+
+Handler = Callable[[str, str], str]
+
+_REGISTRY: Dict[str, Dict[str, Any]] = {}
+_REGISTRY_LOCK = threading.RLock()
+_PLUGIN_STATE: Dict[str, Any] = {"loaded": False, "modules": [], "errors": {}}
+
+
+def register_domain(
+    name: str,
+    handler: Union[Handler, str],
+    description: str = "",
+    module: Optional[str] = None
+) -> None:
+    """
+    注册（或覆盖）一个搜索域
+
+    Args:
+        name: domain 名称（大小写不敏感）
+        handler: handler(query, output_format) -> str，或延迟导入的 "模块:函数" 字符串
+        description: 简短说明（用于帮助信息）
+        module: 处理函数依赖的引擎模块（仅用于统计是否已加载；字符串处理函数默认取其所在模块）
+    """
+    key = name.lower().strip()
+    if not key:
+        raise ValueError("domain 名称不能为空")
+    if isinstance(handler, str) and ":" not in handler:
+        raise ValueError(f"延迟导入的处理函数须为 '模块:函数' 格式: {handler}")
+
+    with _REGISTRY_LOCK:
+        _REGISTRY[key] = {
+            "target": handler,
+            "handler": None if isinstance(handler, str) else handler,
+            "description": description,
+            "module": module or (handler.partition(":")[0] if isinstance(handler, str) else None),
+            "load_ms": None,
+        }
+
+
+def resolve_domain(name: str) -> Optional[Handler]:
+    """
+    查找 domain 的处理函数（首次使用时导入所在模块）
+
+    Returns:
+        处理函数，未注册时返回 None
+
+    Raises:
+        ImportError / AttributeError: 延迟导入的处理函数加载失败（由网关兜底转换为错误信息）
+    """
+    key = name.lower().strip()
+    entry = _REGISTRY.get(key)
+    if entry is None:
+        load_plugins()
+        entry = _REGISTRY.get(key)
+        if entry is None:
+            return None
+
+    if entry["handler"] is not None:
+        return entry["handler"]
+
+    with _REGISTRY_LOCK:
+        if entry["handler"] is None:
+            module_name, _, attr = entry["target"].partition(":")
+            start = time.perf_counter()
+            handler = getattr(importlib.import_module(module_name), attr)
+            entry["load_ms"] = round((time.perf_counter() - start) * 1000, 1)
+            entry["handler"] = handler
+        return entry["handler"]
+
+
+def registered_domains() -> List[str]:
+    """全部已注册 domain（含插件）"""
+    load_plugins()
+    return list(_REGISTRY)
+
+
+def load_plugins() -> None:
+    """导入 GATEWAY_PLUGINS 中的插件模块（每个进程只执行一次）"""
+    if _PLUGIN_STATE["loaded"]:
+        return
+    with _REGISTRY_LOCK:
+        if _PLUGIN_STATE["loaded"]:
+            return
+        for module_name in filter(None, (m.strip() for m in os.getenv("GATEWAY_PLUGINS", "").split(","))):
+            try:
+                module = importlib.import_module(module_name)
+                register = getattr(module, "register_domains", None)
+                if register is None:
+                    raise AttributeError("插件未定义 register_domains(register)")
+                register(register_domain)
+                _PLUGIN_STATE["modules"].append(module_name)
+            except Exception as e:
+                _PLUGIN_STATE["errors"][module_name] = f"{type(e).__name__}: {str(e)}"
+        _PLUGIN_STATE["loaded"] = True
+
+
+def get_domain_registry_stats() -> Dict[str, Any]:
+    """注册表状态：各 domain 的引擎是否已加载、延迟导入耗时、插件加载结果"""
+    with _REGISTRY_LOCK:
+        return {
+            "domains": {
+                name: {
+                    "loaded": entry["module"] in sys.modules if entry["module"] else entry["handler"] is not None,
+                    "load_ms": entry["load_ms"],
+                }
+                for name, entry in _REGISTRY.items()
+            },
+            "plugins": list(_PLUGIN_STATE["modules"]),
+            "plugin_errors": dict(_PLUGIN_STATE["errors"]),
+        }
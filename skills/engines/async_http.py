@@ -0,0 +1,288 @@
+"""
+L1 引擎层：asyncio keep-alive HTTP 客户端
+基于标准库 asyncio streams 的 HTTP/1.1 客户端，供各引擎的异步接口使用（不引入第三方依赖）
+
+特性（与 http_pool 保持一致）：
+- 连接复用：按 (scheme, host, port) 保存空闲连接
+- 压缩传输：默认发送 Accept-Encoding: gzip, deflate 并自动解压
+- 失效重连：复用的连接在收到响应头之前被服务端关闭时，自动换新连接重试一次；
+  响应头之后（正文中途）断开不重试，异常交给调用方（请求可能已被服务端处理）
+- 正文支持 Content-Length / chunked / 读到连接关闭三种分帧方式
+- 返回与同步连接池相同的 HTTPResult
+
+连接绑定在创建它的事件循环上，因此连接池按事件循环各持一份（get_async_http_pool）
+"""
+
+import ssl
+import sys
+import asyncio
+import threading
+import weakref
+from pathlib import Path
+from urllib.parse import urlsplit
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+sys.path.append(str(Path(__file__).parent.parent))
+from engines.http_pool import (
+    DEFAULT_MAX_IDLE_PER_HOST, DEFAULT_TIMEOUT_S, DEFAULT_USER_AGENT, HTTPResult, _decode_body
+)
+
+# 响应头总大小上限（防止异常服务端耗尽内存）
+MAX_HEADER_BYTES = 64 * 1024
+
+# 复用连接时可能遇到的"服务端已关闭"类异常
+_STALE_CONNECTION_ERRORS = (
+    asyncio.IncompleteReadError,
+    ConnectionResetError,
+    BrokenPipeError,
+)
+
+
+class _StaleConnection(Exception):
+    """复用的连接在收到状态行之前被关闭"""
+
+
+class AsyncHTTPConnectionPool:
+    """单事件循环内使用的 keep-alive 连接池"""
+
+    def __init__(
+        self,
+        timeout: float = DEFAULT_TIMEOUT_S,
+        max_idle_per_host: int = DEFAULT_MAX_IDLE_PER_HOST,
+        user_agent: str = DEFAULT_USER_AGENT
+    ):
+        self.timeout = timeout
+        self.max_idle_per_host = max_idle_per_host
+        self.user_agent = user_agent
+
+        self._idle: Dict[Tuple[str, str, int], List[Tuple[asyncio.StreamReader, asyncio.StreamWriter]]] = {}
+        self._ssl_context = ssl.create_default_context()
+        self._stats = {
+            "requests": 0,
+            "connections_created": 0,
+            "connections_reused": 0,
+            "bytes_received": 0,
+        }
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        body: Optional[bytes] = None,
+        timeout: Optional[float] = None
+    ) -> HTTPResult:
+        """
+        发送请求并读取完整响应（整个请求受 timeout 约束）
+
+        Raises:
+            网络异常原样抛出（超时为 asyncio.TimeoutError），由调用方决定重试或降级
+        """
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        if scheme not in ("http", "https"):
+            raise ValueError(f"不支持的 URL 协议: {url}")
+
+        port = parts.port or (443 if scheme == "https" else 80)
+        key = (scheme, parts.hostname or "", port)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+
+        send_headers = {
+            "Host": parts.netloc,
+            "User-Agent": self.user_agent,
+            "Accept-Encoding": "gzip, deflate",
+            "Connection": "keep-alive",
+        }
+        if headers:
+            send_headers.update(headers)
+        if body is not None:
+            send_headers["Content-Length"] = str(len(body))
+
+        head = f"{method} {path} HTTP/1.1\r\n" + "".join(f"{k}: {v}\r\n" for k, v in send_headers.items()) + "\r\n"
+        payload = head.encode("latin-1") + (body or b"")
+
+        return await asyncio.wait_for(
+            self._exchange(key, url, method, payload),
+            timeout=timeout or self.timeout
+        )
+
+    async def get(self, url: str, headers: Optional[Dict[str, str]] = None,
+                  timeout: Optional[float] = None) -> HTTPResult:
+        return await self.request("GET", url, headers=headers, timeout=timeout)
+
+    async def post(self, url: str, body: bytes, headers: Optional[Dict[str, str]] = None,
+                   timeout: Optional[float] = None) -> HTTPResult:
+        return await self.request("POST", url, headers=headers, body=body, timeout=timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        stats = dict(self._stats)
+        stats["idle_connections"] = sum(len(conns) for conns in self._idle.values())
+        return stats
+
+    def close(self) -> None:
+        """关闭所有空闲连接"""
+        idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for _, writer in conns:
+                writer.close()
+
+    # ------------------------------------------------------------------
+    # 内部实现
+    # ------------------------------------------------------------------
+
+    async def _exchange(self, key, url: str, method: str, payload: bytes) -> HTTPResult:
+        conn, reused = await self._checkout(key)
+        try:
+            status, headers, will_close = await self._send(conn, payload)
+        except (_StaleConnection,) + _STALE_CONNECTION_ERRORS:
+            conn[1].close()
+            if not reused:
+                raise
+            # 池中连接已被服务端关闭，换新连接重试一次
+            conn, reused = await self._new_connection(key), False
+            try:
+                status, headers, will_close = await self._send(conn, payload)
+            except BaseException:
+                conn[1].close()
+                raise
+        except BaseException:
+            # 含取消：连接状态未知，不能放回池中
+            conn[1].close()
+            raise
+
+        try:
+            raw, will_close = await self._read_body(conn[0], method, status, headers, will_close)
+        except BaseException:
+            conn[1].close()
+            raise
+
+        result = HTTPResult(url, status, headers, _decode_body(raw, headers), len(raw))
+
+        if will_close:
+            conn[1].close()
+        else:
+            self._checkin(key, conn)
+
+        self._stats["requests"] += 1
+        self._stats["bytes_received"] += len(raw)
+        self._stats["connections_reused" if reused else "connections_created"] += 1
+        return result
+
+    @staticmethod
+    async def _send(conn, payload: bytes) -> Tuple[int, Dict[str, str], bool]:
+        """发送请求并读取状态行与响应头，返回 (status, headers, will_close)"""
+        reader, writer = conn
+        writer.write(payload)
+        await writer.drain()
+
+        status_line = await reader.readline()
+        if not status_line:
+            raise _StaleConnection("连接在响应前被关闭")
+        try:
+            version, status, _ = (status_line.decode("latin-1").rstrip("\r\n") + " ").split(" ", 2)
+            status = int(status)
+        except ValueError:
+            raise ConnectionError(f"无效的 HTTP 状态行: {status_line[:100]!r}")
+
+        headers: Dict[str, str] = {}
+        header_bytes = 0
+        while True:
+            line = await reader.readline()
+            header_bytes += len(line)
+            if header_bytes > MAX_HEADER_BYTES:
+                raise ConnectionError("响应头过大")
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            name = name.strip().lower()
+            value = value.strip()
+            headers[name] = f"{headers[name]}, {value}" if name in headers else value
+
+        connection = headers.get("connection", "").lower()
+        will_close = "close" in connection or (version == "HTTP/1.0" and "keep-alive" not in connection)
+        return status, headers, will_close
+
+    @staticmethod
+    async def _read_body(reader: asyncio.StreamReader, method: str, status: int,
+                         headers: Dict[str, str], will_close: bool) -> Tuple[bytes, bool]:
+        """按分帧方式读取正文，返回 (raw, will_close)"""
+        if method == "HEAD" or status in (204, 304) or 100 <= status < 200:
+            raw = b""
+        elif "chunked" in headers.get("transfer-encoding", "").lower():
+            raw = await _read_chunked(reader)
+        elif "content-length" in headers:
+            raw = await reader.readexactly(int(headers["content-length"]))
+        else:
+            raw = await reader.read()
+            will_close = True
+
+        return raw, will_close
+
+    async def _checkout(self, key):
+        conns = self._idle.get(key)
+        while conns:
+            conn = conns.pop()
+            if not conn[1].is_closing() and not conn[0].at_eof():
+                return conn, True
+            conn[1].close()
+        return await self._new_connection(key), False
+
+    def _checkin(self, key, conn) -> None:
+        conns = self._idle.setdefault(key, [])
+        if len(conns) < self.max_idle_per_host:
+            conns.append(conn)
+        else:
+            conn[1].close()
+
+    async def _new_connection(self, key):
+        scheme, host, port = key
+        if scheme == "https":
+            return await asyncio.open_connection(host, port, ssl=self._ssl_context, server_hostname=host)
+        return await asyncio.open_connection(host, port)
+
+
+async def _read_chunked(reader: asyncio.StreamReader) -> bytes:
+    chunks = []
+    while True:
+        size_line = await reader.readline()
+        if not size_line:
+            raise asyncio.IncompleteReadError(b"", None)
+        size = int(size_line.split(b";", 1)[0].strip() or b"0", 16)
+        if size == 0:
+            # 跳过 trailer
+            while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass
+            return b"".join(chunks)
+        chunks.append(await reader.readexactly(size))
+        await reader.readexactly(2)
+
+
+# ============================================================================
+# 按事件循环隔离的共享对象
+# ============================================================================
+
+_LOOP_LOCALS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, Any]]" = weakref.WeakKeyDictionary()
+_LOOP_LOCALS_LOCK = threading.Lock()
+
+
+def loop_local(name: str, factory: Callable[[], Any]) -> Any:
+    """
+    获取当前事件循环专属的共享对象（连接池、asyncio.Lock 等不能跨事件循环使用）
+
+    Args:
+        name: 对象名
+        factory: 首次使用时的构造函数
+    """
+    loop = asyncio.get_running_loop()
+    with _LOOP_LOCALS_LOCK:
+        slots = _LOOP_LOCALS.setdefault(loop, {})
+        if name not in slots:
+            slots[name] = factory()
+        return slots[name]
+
+
+def get_async_http_pool() -> AsyncHTTPConnectionPool:
+    """获取当前事件循环的共享连接池"""
+    return loop_local("http_pool", AsyncHTTPConnectionPool)
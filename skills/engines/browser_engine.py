@@ -2,96 +2,1115 @@
 L1 引擎层：浏览器引擎（基于 OpenClaw Browser）
 封装 OpenClaw 原生 browser 工具
 安全策略：15 秒超时 + 异常捕获，返回错误字符串
+
+优化：常驻浏览器控制进程（daemon 模式）
+- 默认每次抓取启动两个 `node openclaw.mjs browser ...` 子进程（open + evaluate）
+- daemon 模式下保持一个长驻控制进程，通过 stdin/stdout 管道收发 NDJSON，
+  打开页面并获取 outerHTML 只需一次往返
+- 控制进程不可用时自动回退到子进程模式
+
+新增功能：并发标签页池（fetch_webpages_concurrent）
+- 批量 URL 在有界线程池中并发抓取，按完成顺序返回
+- 每个主机单独限制并发数，避免对同一站点施压
+- 每次抓取在独立标签页中进行（按 targetId 定位，完成后关闭），互不串扰；
+  open 未返回 targetId 时对比 open 前后的标签页快照认领新标签页，无法确定时报错，绝不读取活动标签页
+
+优化：静态 HTTP 快速路径
+- 先通过 keep-alive 连接池直接 GET（gzip 压缩 + ETag/Last-Modified 条件请求）
+- 以下情况升级到浏览器渲染：已知动态站点、文本过少且含脚本、SPA 外壳标记、
+  非 200 响应或非 HTML 内容
+- timeout 是整次抓取的总预算：静态尝试最多用 timeout 的 1/3（且不超过 STATIC_TIMEOUT_S），
+  预算不足时跳过静态尝试；升级后浏览器只拿到剩余时间，子进程模式的 tabs / open / evaluate
+  共用同一个截止时间，daemon 失败回退到子进程时同样只用剩余时间
+- fetch_webpage_with_meta 返回实际服务路径，get_fetch_path_stats 汇总各路径次数与耗时
+
+优化：网页内容缓存（见 page_cache）
+- 抓取并解析成功的 HTML 与清洗后文本写入内容寻址的压缩磁盘缓存（解析失败的错误信息不写入）
+- use_cache=True 时有效期内的条目直接返回（path='cache'），不发起任何请求
+- 过期或未启用 use_cache 时，静态快速路径用缓存的 ETag / Last-Modified 发送条件请求
+
+新增功能：原生 asyncio 接口
+- fetch_webpage_content_async / fetch_webpage_with_meta_async 与同步版本参数、返回值一致
+- 静态路径经 asyncio 连接池（见 async_http），浏览器路径使用 asyncio.create_subprocess_exec，
+  daemon 模式下响应由读线程直接交给事件循环，等待期间不占用线程
+- 异步抓取始终隔离到独立标签页，可在一个事件循环中同时保持大量抓取在途
+
+优化：在途请求合并（见 single_flight）
+- 参数相同的抓取同时在途时只打开一次页面 / 发起一次请求，其余调用者共享结果
+  （如两个任务同时抓取同一 Google Patents 页面）
+
+daemon 协议（每行一个 JSON，允许多个请求同时在途，按 id 匹配响应）：
+    请求: {"id": 1, "op": "fetch", "url": "https://...", "timeout_ms": 15000}
+    响应: {"id": 1, "ok": true, "html": "<html>..."}
+          {"id": 1, "ok": false, "error": "..."}
+    每个 fetch 请求须在独立标签页中打开，取得 outerHTML 后关闭该标签页
+
+环境变量：
+- BROWSER_ENGINE_MODE: 'subprocess'（默认）| 'daemon'
+- OPENCLAW_BROWSER_DAEMON_CMD: 控制进程启动命令（daemon 模式必需）
+- BROWSER_STATIC_FAST_PATH: 是否启用静态 HTTP 快速路径（默认 1，设为 0 则始终使用浏览器）
+- BROWSER_DYNAMIC_HOSTS: 追加的动态站点主机名（逗号分隔，直接使用浏览器）
 """
 
 import subprocess
+import asyncio
 import sys
 import json
 import os
+import re
+import shlex
+import atexit
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urljoin, urlsplit
 
 # 导入 L2 清洗器
 sys.path.append(str(Path(__file__).parent.parent))
-from scrapers.data_cleaner import clean_html_to_text
+from scrapers.data_cleaner import PARSE_ERROR_PREFIX, clean_html_to_text
+from engines.http_pool import HTTPResult, get_http_pool
+from engines.async_http import get_async_http_pool
+from engines.page_cache import CachedPage, get_page_cache, normalize_url
+from engines.single_flight import get_single_flight
+
+# OpenClaw CLI 命令前缀（以 node 用户身份运行）
+OPENCLAW_CLI = ['runuser', '-u', 'node', '--', 'node', '/app/openclaw.mjs']
+
+# 并发标签页池默认配置
+DEFAULT_POOL_SIZE = 4
+DEFAULT_PER_HOST_LIMIT = 2
+
+# 从 `browser open` 输出中提取标签页 targetId
+_TARGET_ID_PATTERN = re.compile(r'(?:targetId|target_id|id)["\']?\s*[:=]\s*["\']?([A-Za-z0-9_-]{6,})')
+
+# `browser open` 未返回 targetId 时，按"打开前后的标签页差集 + URL"认领新标签页：
+# claimed 为各抓取已认领的标签页，pending_opens 为已开始 open 但尚未认领的抓取数
+_TAB_CLAIMS: Dict[str, Any] = {"claimed": set(), "pending_opens": 0}
+_TAB_CLAIMS_LOCK = threading.Lock()
+TAB_LOOKUP_RETRY_S = 0.5
+
+# 子进程模式：tabs 单步上限（仍受整次抓取的截止时间约束）；
+# 关闭标签页是清理步骤，截止时间已过时仍给予 CLI_CLOSE_GRACE_S，避免遗留标签页
+CLI_TABS_TIMEOUT_S = 10
+CLI_CLOSE_GRACE_S = 2
+
+# 静态快速路径配置
+STATIC_TIMEOUT_S = 10
+STATIC_MIN_BUDGET_S = 1         # 静态路径可用预算低于该值时直接走浏览器
+STATIC_BUDGET_SHARE = 1 / 3     # 静态路径最多使用的总预算比例（其余留给浏览器回退）
+MAX_STATIC_REDIRECTS = 5
+STATIC_MIN_TEXT_CHARS = 200     # 含脚本且清洗后文本少于该值，视为需要 JS 渲染
+SPA_MARKER_TEXT_CHARS = 1500    # 出现 SPA 外壳标记且文本少于该值，视为需要 JS 渲染
+STATIC_USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) LingNexus/1.0"
+
+# 已知必须 JS 渲染的站点（直接使用浏览器，不浪费一次静态请求）
+DYNAMIC_HOSTS = frozenset({
+    "worldwide.espacenet.com",
+    "www.j-platpat.inpit.go.jp",
+})
+# Google Patents 检索结果页为前端渲染；专利详情页（/patent/...）为服务端渲染，可走静态路径
+DYNAMIC_URL_PREFIXES = (
+    "https://patents.google.com/?",
+)
+
+_SPA_MARKER_PATTERN = re.compile(
+    r'<div[^>]+id=["\'](?:root|app|__nuxt)["\'][^>]*>\s*</div>'
+    r'|\bng-version=|\bng-app\b|window\.__INITIAL_STATE__'
+    r'|<noscript>[^<]{0,200}(?:enable|启用)\s*JavaScript',
+    re.IGNORECASE
+)
+_META_CHARSET_PATTERN = re.compile(rb'<meta[^>]+charset=["\']?([A-Za-z0-9_-]+)', re.IGNORECASE)
+
+_PATH_STATS: Dict[str, Any] = {"paths": {}, "elapsed_s": {}, "escalations": {}, "not_modified": 0}
+_PATH_STATS_LOCK = threading.Lock()
+
+
+class BrowserDaemonError(Exception):
+    """常驻控制进程不可用或返回错误"""
+
+
+class BrowserDaemon:
+    """常驻浏览器控制进程客户端（NDJSON over stdin/stdout）"""
+
+    def __init__(self, command: List[str], env: Optional[Dict[str, str]] = None):
+        self.command = command
+        self.env = env
+        self._proc: Optional[subprocess.Popen] = None
+        self._ids = itertools.count(1)
+        self._write_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._pending: Dict[int, Tuple[threading.Event, list]] = {}
+        self._pending_lock = threading.Lock()
+
+    def fetch_html(self, url: str, timeout: float) -> str:
+        """
+        通过控制进程打开 URL 并返回 outerHTML
+
+        Raises:
+            BrowserDaemonError: 控制进程无法启动、已退出或返回错误
+            TimeoutError: 超时未收到响应
+        """
+        response = self.request({"op": "fetch", "url": url, "timeout_ms": int(timeout * 1000)}, timeout)
+        if not response.get("ok"):
+            raise BrowserDaemonError(response.get("error") or "控制进程返回未知错误")
+        return response.get("html") or ""
+
+    def request(self, payload: Dict, timeout: float) -> Dict:
+        """发送一条请求并等待对应 id 的响应"""
+        event, slot = threading.Event(), []
+        request_id = self._send(payload, event, slot)
+
+        if not event.wait(timeout):
+            with self._pending_lock:
+                self._pending.pop(request_id, None)
+            raise TimeoutError(f"控制进程超过 {timeout} 秒未响应")
+
+        if not slot or slot[0] is None:
+            raise BrowserDaemonError("控制进程已退出")
+        return slot[0]
+
+    async def fetch_html_async(self, url: str, timeout: float) -> str:
+        """fetch_html 的异步版本（等待响应时不占用线程）"""
+        response = await self.request_async({"op": "fetch", "url": url, "timeout_ms": int(timeout * 1000)}, timeout)
+        if not response.get("ok"):
+            raise BrowserDaemonError(response.get("error") or "控制进程返回未知错误")
+        return response.get("html") or ""
+
+    async def request_async(self, payload: Dict, timeout: float) -> Dict:
+        """发送一条请求，响应由读线程通过 call_soon_threadsafe 交给事件循环"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        waiter, slot = _AsyncWaiter(loop, future), []
+        request_id = self._send(payload, waiter, slot)
+
+        try:
+            await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"控制进程超过 {timeout} 秒未响应")
+        finally:
+            with self._pending_lock:
+                self._pending.pop(request_id, None)
+
+        if not slot or slot[0] is None:
+            raise BrowserDaemonError("控制进程已退出")
+        return slot[0]
+
+    def _send(self, payload: Dict, waiter, slot: list) -> int:
+        """登记等待者并写入一行请求，返回请求 id"""
+        proc = self._ensure_started()
+
+        request_id = next(self._ids)
+        with self._pending_lock:
+            self._pending[request_id] = (waiter, slot)
+
+        try:
+            line = json.dumps(dict(payload, id=request_id), ensure_ascii=False) + "\n"
+            with self._write_lock:
+                proc.stdin.write(line)
+                proc.stdin.flush()
+        except (OSError, ValueError) as e:
+            with self._pending_lock:
+                self._pending.pop(request_id, None)
+            raise BrowserDaemonError(f"控制进程写入失败: {e}")
+        return request_id
+
+    def close(self) -> None:
+        proc, self._proc = self._proc, None
+        if proc is None:
+            return
+        try:
+            proc.stdin.close()
+            proc.wait(timeout=5)
+        except Exception:
+            proc.kill()
+
+    def _ensure_started(self) -> subprocess.Popen:
+        with self._start_lock:
+            if self._proc is not None and self._proc.poll() is None:
+                return self._proc
+            try:
+                self._proc = subprocess.Popen(
+                    self.command,
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL,
+                    text=True,
+                    bufsize=1,
+                    env=self.env
+                )
+            except OSError as e:
+                self._proc = None
+                raise BrowserDaemonError(f"控制进程启动失败: {e}")
+
+            threading.Thread(target=self._read_loop, args=(self._proc,), daemon=True).start()
+            return self._proc
+
+    def _read_loop(self, proc: subprocess.Popen) -> None:
+        """读取响应行并唤醒对应的等待者；进程退出时唤醒所有等待者"""
+        for line in proc.stdout:
+            try:
+                response = json.loads(line)
+                request_id = int(response.get("id"))
+            except (ValueError, TypeError, AttributeError):
+                continue  # 忽略控制进程输出的非协议行（日志等）
+            with self._pending_lock:
+                waiter = self._pending.pop(request_id, None)
+            if waiter is not None:
+                waiter[1].append(response)
+                waiter[0].set()
+
+        # stdout 关闭时进程可能尚未被回收（poll() 仍为 None），先摘下它，下一次请求重新启动控制进程
+        with self._start_lock:
+            if self._proc is proc:
+                self._proc = None
+        if proc.poll() is None:
+            proc.kill()
+        proc.wait()
+
+        with self._pending_lock:
+            waiters, self._pending = list(self._pending.values()), {}
+        for event, slot in waiters:
+            slot.append(None)
+            event.set()
+
+
+class _AsyncWaiter:
+    """与 threading.Event 接口兼容的等待者：读线程调用 set() 时在事件循环中完成 future"""
+
+    __slots__ = ("loop", "future")
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, future: asyncio.Future):
+        self.loop = loop
+        self.future = future
+
+    def set(self) -> None:
+        try:
+            self.loop.call_soon_threadsafe(self._resolve)
+        except RuntimeError:
+            pass  # 事件循环已关闭
+
+    def _resolve(self) -> None:
+        if not self.future.done():
+            self.future.set_result(None)
+
+
+_DAEMON: Optional[BrowserDaemon] = None
+_DAEMON_LOCK = threading.Lock()
+
+
+def _browser_env() -> Dict[str, str]:
+    env = os.environ.copy()
+    env['DISPLAY'] = ':99'
+    return env
+
+
+def get_browser_daemon() -> Optional[BrowserDaemon]:
+    """daemon 模式下返回进程级共享的控制进程客户端，否则返回 None"""
+    global _DAEMON
+    if os.getenv("BROWSER_ENGINE_MODE", "subprocess").lower() != "daemon":
+        return None
+
+    command = os.getenv("OPENCLAW_BROWSER_DAEMON_CMD")
+    if not command:
+        return None
+
+    with _DAEMON_LOCK:
+        if _DAEMON is None:
+            _DAEMON = BrowserDaemon(shlex.split(command), env=_browser_env())
+            atexit.register(_DAEMON.close)
+        return _DAEMON
+
+
+def _parse_target_id(open_output: str) -> Optional[str]:
+    """从 `browser open` 的输出（JSON 或文本）中解析新标签页的 targetId"""
+    try:
+        data = json.loads(open_output)
+        if isinstance(data, dict):
+            target_id = data.get("targetId") or data.get("id")
+            if target_id:
+                return str(target_id)
+    except ValueError:
+        pass
+    match = _TARGET_ID_PATTERN.search(open_output)
+    return match.group(1) if match else None
+
+
+def _parse_tabs(tabs_output: str) -> Optional[Dict[str, str]]:
+    """解析 `browser tabs --json` 的输出，返回 {targetId: url}，无法解析时返回 None"""
+    try:
+        data = json.loads(tabs_output)
+    except ValueError:
+        return None
+    tabs = data.get("tabs") if isinstance(data, dict) else data
+    if not isinstance(tabs, list):
+        return None
+
+    result = {}
+    for tab in tabs:
+        if isinstance(tab, dict):
+            target_id = tab.get("targetId") or tab.get("id")
+            if target_id:
+                result[str(target_id)] = str(tab.get("url") or "")
+    return result
+
 
+def _begin_tab_open() -> None:
+    with _TAB_CLAIMS_LOCK:
+        _TAB_CLAIMS["pending_opens"] += 1
 
-def fetch_webpage_content(url: str, timeout: int = 15) -> str:
+
+def _end_tab_open() -> None:
+    with _TAB_CLAIMS_LOCK:
+        _TAB_CLAIMS["pending_opens"] -= 1
+
+
+def _claim_tab(target_id: str) -> None:
+    with _TAB_CLAIMS_LOCK:
+        _TAB_CLAIMS["claimed"].add(target_id)
+
+
+def _release_tab(target_id: str) -> None:
+    with _TAB_CLAIMS_LOCK:
+        _TAB_CLAIMS["claimed"].discard(target_id)
+
+
+def _resolve_new_tab(url: str, before: Optional[Dict[str, str]],
+                     after: Optional[Dict[str, str]]) -> Tuple[Optional[str], bool, List[str]]:
     """
-    抓取网页内容并清洗为纯文本（使用 OpenClaw Browser）
+    在打开前后的标签页快照中认领本次 open 打开的标签页（调用方的 open 已结束并已 _end_tab_open）
 
-    Args:
-        url: 目标网页 URL
-        timeout: 超时时间（秒），默认 15 秒
+    规则：未被其他抓取认领的新标签页中，URL（规范化后）与目标一致者优先；
+    发生重定向时只有在没有其他 open 在途、且新标签页恰好一个时才认领它
 
     Returns:
-        清洗后的纯文本或错误信息
+        (targetId, 是否值得稍后重试, 无主的新标签页)；认领成功时 targetId 已加入 claimed
     """
+    with _TAB_CLAIMS_LOCK:
+        others_pending = _TAB_CLAIMS["pending_opens"] > 0
+        if after is None:
+            return None, others_pending, []
+
+        claimed = _TAB_CLAIMS["claimed"]
+        candidates = {
+            tid: tab_url for tid, tab_url in after.items()
+            if tid not in claimed and (before is None or tid not in before)
+        }
+        wanted = normalize_url(url)
+        matches = [tid for tid, tab_url in candidates.items() if tab_url and normalize_url(tab_url) == wanted]
+
+        if matches:
+            target_id = matches[-1]
+        elif before is not None and len(candidates) == 1 and not others_pending:
+            target_id = next(iter(candidates))
+        else:
+            # 其他 open 仍在途时，差集里可能有别人的标签页，稍后重试；否则差集中的标签页都无人认领
+            orphans = [] if others_pending or before is None else list(candidates)
+            return None, others_pending, orphans
+
+        claimed.add(target_id)
+        return target_id, False, []
+
+
+def _decode_eval_output(stdout: str) -> str:
+    """evaluate 返回的是 JSON 字符串时解码，否则保持原样"""
+    html_content = stdout.strip()
     try:
-        # 设置环境变量
-        env = os.environ.copy()
-        env['DISPLAY'] = ':99'
+        if html_content.startswith('"') and html_content.endswith('"'):
+            html_content = json.loads(html_content)
+    except ValueError:
+        pass
+    return html_content
 
-        # 步骤 1: 打开网页
-        open_result = subprocess.run(
-            ['runuser', '-u', 'node', '--', 'node', '/app/openclaw.mjs', 'browser', 'open', url],
-            capture_output=True,
-            text=True,
-            timeout=timeout,
-            check=False,
-            env=env
-        )
 
+_EVAL_HTML_CMD = OPENCLAW_CLI + ['browser', 'evaluate', '--fn', 'document.documentElement.outerHTML']
+
+
+def _fetch_html_via_cli(url: str, timeout: int, isolated: bool = False) -> Tuple[Optional[str], Optional[str]]:
+    """
+    子进程模式：open + evaluate 两次 CLI 调用获取 HTML
+
+    evaluate 始终按 targetId 定位标签页，不读取"当前活动标签页"（并发 open 会改变活动标签页）。
+    targetId 优先从 open 输出解析；解析不到时对比 open 前后的 `browser tabs` 快照认领新标签页，
+    仍无法确定时返回错误并关闭无主的新标签页
+
+    Args:
+        isolated: 是否隔离到独立标签页（并发抓取时使用），结束后关闭该标签页
+
+    Returns:
+        (html, None) 或 (None, 错误信息)
+    """
+    env = _browser_env()
+    deadline = time.perf_counter() + timeout
+    target_id = None
+
+    def _run(args: List[str], cap: Optional[float] = None) -> subprocess.CompletedProcess:
+        # 每一步只拿到距截止时间的剩余时间，整次调用不会超过 timeout
+        run_timeout = _time_left(deadline, cap)
+        if run_timeout <= 0:
+            raise subprocess.TimeoutExpired(args, timeout)
+        return subprocess.run(args, capture_output=True, text=True, timeout=run_timeout, check=False, env=env)
+
+    def _list_tabs() -> Optional[Dict[str, str]]:
+        result = _run(OPENCLAW_CLI + ['browser', 'tabs', '--json'], CLI_TABS_TIMEOUT_S)
+        return _parse_tabs(result.stdout) if result.returncode == 0 else None
+
+    def _close(tab_id: str) -> None:
+        _close_tab(tab_id, env, max(CLI_CLOSE_GRACE_S, _time_left(deadline, CLI_TABS_TIMEOUT_S)))
+
+    before = _list_tabs()
+    try:
+        # 步骤 1: 打开网页（open 结束前计入 pending_opens，其他抓取不会认领差集中的标签页）
+        _begin_tab_open()
+        try:
+            open_result = _run(OPENCLAW_CLI + ['browser', 'open', url])
+        finally:
+            _end_tab_open()
         if open_result.returncode != 0:
             error_msg = open_result.stderr.strip() if open_result.stderr else "未知错误"
-            return f"网页打开失败: {url} - {error_msg}"
+            return None, f"网页打开失败: {url} - {error_msg}"
+
+        target_id = _parse_target_id(open_result.stdout.strip())
+        if target_id:
+            _claim_tab(target_id)
+        else:
+            while True:
+                target_id, retry, orphans = _resolve_new_tab(url, before, _list_tabs())
+                if target_id or not retry or time.perf_counter() + TAB_LOOKUP_RETRY_S >= deadline:
+                    break
+                time.sleep(TAB_LOOKUP_RETRY_S)
+            if not target_id:
+                for orphan in orphans:
+                    _close(orphan)
+                return None, f"网页内容获取失败: {url} - 无法定位新打开的标签页（open 未返回 targetId）"
+
+        # 步骤 2: 获取页面 HTML（使用 evaluate 命令执行 JavaScript 获取完整 HTML）
+        eval_result = _run(_EVAL_HTML_CMD + ['--target-id', target_id])
+    finally:
+        if target_id:
+            _release_tab(target_id)
+            if isolated:
+                _close(target_id)
+
+    if eval_result.returncode != 0:
+        error_msg = eval_result.stderr.strip() if eval_result.stderr else "未知错误"
+        return None, f"网页内容获取失败: {url} - {error_msg}"
+
+    # 获取 HTML 内容（OpenClaw 返回的是 JSON 字符串）
+    return _decode_eval_output(eval_result.stdout), None
+
+
+async def _run_cli_async(args: List[str], timeout: float, env: Dict[str, str]) -> Tuple[int, str, str]:
+    """
+    以 asyncio 子进程执行一次 CLI 调用
+
+    Returns:
+        (returncode, stdout, stderr)
+
+    Raises:
+        asyncio.TimeoutError: 超时（子进程已被终止）
+    """
+    proc = await asyncio.create_subprocess_exec(
+        *args,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        env=env
+    )
+    try:
+        stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout)
+    except BaseException:
+        # 超时或调用方取消：终止子进程，避免遗留僵尸进程
+        if proc.returncode is None:
+            proc.kill()
+            await asyncio.shield(proc.wait())
+        raise
+    return proc.returncode, stdout.decode("utf-8", errors="replace"), stderr.decode("utf-8", errors="replace")
+
+
+async def _fetch_html_via_cli_async(url: str, timeout: int) -> Tuple[Optional[str], Optional[str]]:
+    """
+    _fetch_html_via_cli 的异步版本（始终隔离到独立标签页，标签页认领规则相同）
+
+    Returns:
+        (html, None) 或 (None, 错误信息)
+    """
+    env = _browser_env()
+    deadline = time.perf_counter() + timeout
+    target_id = None
+
+    async def _run(args: List[str], cap: Optional[float] = None) -> Tuple[int, str, str]:
+        run_timeout = _time_left(deadline, cap)
+        if run_timeout <= 0:
+            raise asyncio.TimeoutError()
+        return await _run_cli_async(args, run_timeout, env)
+
+    async def _list_tabs() -> Optional[Dict[str, str]]:
+        tabs_code, tabs_stdout, _ = await _run(OPENCLAW_CLI + ['browser', 'tabs', '--json'], CLI_TABS_TIMEOUT_S)
+        return _parse_tabs(tabs_stdout) if tabs_code == 0 else None
+
+    async def _close(tab_id: str) -> None:
+        close_timeout = max(CLI_CLOSE_GRACE_S, _time_left(deadline, CLI_TABS_TIMEOUT_S))
+        try:
+            await _run_cli_async(OPENCLAW_CLI + ['browser', 'close', tab_id], close_timeout, env)
+        except Exception:
+            pass
+
+    before = await _list_tabs()
+    try:
+        # 步骤 1: 打开网页（open 结束前计入 pending_opens，其他抓取不会认领差集中的标签页）
+        _begin_tab_open()
+        try:
+            code, stdout, stderr = await _run(OPENCLAW_CLI + ['browser', 'open', url])
+        finally:
+            _end_tab_open()
+        if code != 0:
+            return None, f"网页打开失败: {url} - {stderr.strip() or '未知错误'}"
+
+        target_id = _parse_target_id(stdout.strip())
+        if target_id:
+            _claim_tab(target_id)
+        else:
+            while True:
+                target_id, retry, orphans = _resolve_new_tab(url, before, await _list_tabs())
+                if target_id or not retry or time.perf_counter() + TAB_LOOKUP_RETRY_S >= deadline:
+                    break
+                await asyncio.sleep(TAB_LOOKUP_RETRY_S)
+            if not target_id:
+                for orphan in orphans:
+                    await _close(orphan)
+                return None, f"网页内容获取失败: {url} - 无法定位新打开的标签页（open 未返回 targetId）"
 
         # 步骤 2: 获取页面 HTML
-        # 使用 evaluate 命令执行 JavaScript 获取完整 HTML
-        eval_result = subprocess.run(
-            ['runuser', '-u', 'node', '--', 'node', '/app/openclaw.mjs', 'browser', 'evaluate',
-             '--fn', 'document.documentElement.outerHTML'],
+        code, stdout, stderr = await _run(_EVAL_HTML_CMD + ['--target-id', target_id])
+    finally:
+        if target_id:
+            _release_tab(target_id)
+            await _close(target_id)
+
+    if code != 0:
+        return None, f"网页内容获取失败: {url} - {stderr.strip() or '未知错误'}"
+
+    # 获取 HTML 内容（OpenClaw 返回的是 JSON 字符串）
+    return _decode_eval_output(stdout), None
+
+
+def _time_left(deadline: float, cap: Optional[float] = None) -> float:
+    """距截止时间的剩余秒数（cap 为单步上限），<=0 表示已超时"""
+    left = deadline - time.perf_counter()
+    return left if cap is None else min(cap, left)
+
+
+def _close_tab(target_id: str, env: Dict[str, str], timeout: float = CLI_TABS_TIMEOUT_S) -> None:
+    """关闭并发抓取打开的标签页（尽力而为）"""
+    try:
+        subprocess.run(
+            OPENCLAW_CLI + ['browser', 'close', target_id],
             capture_output=True,
             text=True,
             timeout=timeout,
             check=False,
             env=env
         )
+    except Exception:
+        pass
+
+
+def fetch_webpage_content(url: str, timeout: int = 15, use_cache: bool = False) -> str:
+    """
+    抓取网页内容并清洗为纯文本
+
+    优先走静态 HTTP 快速路径；页面需要 JS 渲染时升级到 OpenClaw Browser
+    （daemon 模式下优先通过常驻控制进程抓取，失败时回退到子进程模式）
+
+    Args:
+        url: 目标网页 URL
+        timeout: 超时时间（秒），默认 15 秒
+        use_cache: 是否直接使用有效期内的缓存内容（适合专利文档等几乎不变的页面）
+
+    Returns:
+        清洗后的纯文本或错误信息
+    """
+    return _fetch_webpage(url, timeout, isolated=False, use_cache=use_cache)
+
+
+def fetch_webpage_with_meta(url: str, timeout: int = 15, use_cache: bool = False) -> Dict[str, Any]:
+    """
+    抓取网页并返回服务路径等元信息（用于观察快速路径命中情况）
+
+    Returns:
+        {
+            "url": 目标 URL,
+            "content": 清洗后的纯文本或错误信息（同 fetch_webpage_content）,
+            "path": 'cache' | 'http' | 'browser-daemon' | 'browser-cli',
+            "escalation": 升级到浏览器的原因（静态路径直接命中时为 None）,
+            "elapsed_s": 总耗时
+        }
+    """
+    return _fetch_webpage_meta(url, timeout, isolated=False, use_cache=use_cache)
+
+
+async def fetch_webpage_content_async(url: str, timeout: int = 15, use_cache: bool = False) -> str:
+    """
+    fetch_webpage_content 的异步版本（参数与返回值一致）
+
+    静态路径经 asyncio 连接池，浏览器路径经 asyncio 子进程 / 常驻控制进程，
+    等待期间不占用线程，单个事件循环可同时保持大量抓取在途
+    """
+    return (await _fetch_webpage_meta_async(url, timeout, use_cache))["content"]
+
+
+async def fetch_webpage_with_meta_async(url: str, timeout: int = 15, use_cache: bool = False) -> Dict[str, Any]:
+    """fetch_webpage_with_meta 的异步版本"""
+    return await _fetch_webpage_meta_async(url, timeout, use_cache)
+
+
+def get_fetch_path_stats() -> Dict[str, Any]:
+    """各抓取路径的次数 / 耗时及升级原因分布"""
+    with _PATH_STATS_LOCK:
+        stats = {
+            "paths": dict(_PATH_STATS["paths"]),
+            "elapsed_s": {k: round(v, 3) for k, v in _PATH_STATS["elapsed_s"].items()},
+            "escalations": dict(_PATH_STATS["escalations"]),
+            "not_modified": _PATH_STATS["not_modified"],
+        }
+    total = sum(stats["paths"].values())
+    stats["static_ratio"] = round(stats["paths"].get("http", 0) / total, 4) if total else 0.0
+    return stats
+
+
+def _fetch_webpage(url: str, timeout: int, isolated: bool, use_cache: bool = False) -> str:
+    """抓取并清洗单个网页（isolated=True 时浏览器抓取隔离到独立标签页）"""
+    return _fetch_webpage_meta(url, timeout, isolated, use_cache)["content"]
 
-        if eval_result.returncode != 0:
-            error_msg = eval_result.stderr.strip() if eval_result.stderr else "未知错误"
-            return f"网页内容获取失败: {url} - {error_msg}"
 
-        # 获取 HTML 内容（OpenClaw 返回的是 JSON 字符串）
-        html_content = eval_result.stdout.strip()
+def _fetch_webpage_meta(url: str, timeout: int, isolated: bool, use_cache: bool = False) -> Dict[str, Any]:
+    return get_single_flight("browser").do(
+        (url, timeout, isolated, use_cache), _fetch_webpage_meta_once, url, timeout, isolated, use_cache
+    )
 
-        # 尝试解析 JSON（如果是 JSON 格式）
+
+def _fetch_webpage_meta_once(url: str, timeout: int, isolated: bool, use_cache: bool) -> Dict[str, Any]:
+    start = time.perf_counter()
+
+    cache = get_page_cache()
+    cached = cache.lookup(url)
+    if use_cache and cached is not None and cached.fresh:
+        return _record_fetch(url, cached.text, "cache", None, start)
+
+    if _static_fast_path_enabled():
+        content, escalation = _fetch_static(url, _static_budget(timeout), cached)
+        if content is not None:
+            return _record_fetch(url, content, "http", None, start)
+    else:
+        escalation = "disabled"
+
+    timeout = _remaining_budget(timeout, start)
+
+    content, path, html = _fetch_via_browser(url, timeout, isolated)
+    if html is not None:
+        cache.store(url, content, html)
+    return _record_fetch(url, content, path, escalation, start)
+
+
+async def _fetch_webpage_meta_async(url: str, timeout: int, use_cache: bool = False) -> Dict[str, Any]:
+    return await get_single_flight("browser").do_async(
+        (url, timeout, use_cache), _fetch_webpage_meta_once_async, url, timeout, use_cache
+    )
+
+
+async def _fetch_webpage_meta_once_async(url: str, timeout: int, use_cache: bool) -> Dict[str, Any]:
+    start = time.perf_counter()
+
+    cache = get_page_cache()
+    cached = cache.lookup(url)
+    if use_cache and cached is not None and cached.fresh:
+        return _record_fetch(url, cached.text, "cache", None, start)
+
+    if _static_fast_path_enabled():
+        content, escalation = await _fetch_static_async(url, _static_budget(timeout), cached)
+        if content is not None:
+            return _record_fetch(url, content, "http", None, start)
+    else:
+        escalation = "disabled"
+
+    timeout = _remaining_budget(timeout, start)
+
+    content, path, html = await _fetch_via_browser_async(url, timeout)
+    if html is not None:
+        cache.store(url, content, html)
+    return _record_fetch(url, content, path, escalation, start)
+
+
+def _static_budget(timeout: float) -> float:
+    """静态快速路径的总时间预算（不超过总预算的 STATIC_BUDGET_SHARE，其余留给浏览器回退）"""
+    return min(STATIC_TIMEOUT_S, timeout * STATIC_BUDGET_SHARE)
+
+
+def _remaining_budget(timeout: float, start: float) -> float:
+    """扣除已耗时间后留给浏览器路径的超时（至少 1 秒）"""
+    return max(1.0, round(timeout - (time.perf_counter() - start), 1))
+
+
+def _record_fetch(url: str, content: str, path: str, escalation: Optional[str], start: float) -> Dict[str, Any]:
+    elapsed = time.perf_counter() - start
+    with _PATH_STATS_LOCK:
+        _PATH_STATS["paths"][path] = _PATH_STATS["paths"].get(path, 0) + 1
+        _PATH_STATS["elapsed_s"][path] = _PATH_STATS["elapsed_s"].get(path, 0.0) + elapsed
+        if escalation:
+            reason = escalation.split(":", 1)[0]
+            _PATH_STATS["escalations"][reason] = _PATH_STATS["escalations"].get(reason, 0) + 1
+    return {
+        "url": url,
+        "content": content,
+        "path": path,
+        "escalation": escalation,
+        "elapsed_s": round(elapsed, 3),
+    }
+
+
+# ============================================================================
+# 静态 HTTP 快速路径
+# ============================================================================
+
+def _static_fast_path_enabled() -> bool:
+    return os.getenv("BROWSER_STATIC_FAST_PATH", "1").lower() not in ("0", "false", "no", "off")
+
+
+def _is_dynamic_url(url: str) -> bool:
+    """已知必须 JS 渲染的站点 / 页面"""
+    if url.startswith(DYNAMIC_URL_PREFIXES):
+        return True
+    host = (urlsplit(url).hostname or "").lower()
+    extra = {h.strip().lower() for h in os.getenv("BROWSER_DYNAMIC_HOSTS", "").split(",") if h.strip()}
+    return host in DYNAMIC_HOSTS or host in extra
+
+
+def _needs_js_rendering(html: str, text: str) -> Optional[str]:
+    """
+    判断静态 HTML 是否需要浏览器渲染
+
+    Returns:
+        升级原因，无需升级时返回 None
+    """
+    has_script = "<script" in html.lower()
+    # 没有脚本的页面在浏览器中也不会多出内容，文本再短也直接采用
+    if has_script and len(text) < STATIC_MIN_TEXT_CHARS:
+        return "too_little_text"
+    if len(text) < SPA_MARKER_TEXT_CHARS and _SPA_MARKER_PATTERN.search(html):
+        return "spa_marker"
+    return None
+
+
+def _decode_html(result: HTTPResult) -> str:
+    """解码 HTML：优先响应头字符集，其次 <meta charset>，默认 UTF-8"""
+    if "charset=" in result.headers.get("content-type", "").lower():
+        return result.text()
+    match = _META_CHARSET_PATTERN.search(result.body[:4096])
+    if match:
         try:
-            if html_content.startswith('"') and html_content.endswith('"'):
-                html_content = json.loads(html_content)
-        except:
-            pass  # 如果不是 JSON，保持原样
+            return result.body.decode(match.group(1).decode("ascii"), errors="replace")
+        except LookupError:
+            pass
+    return result.body.decode("utf-8", errors="replace")
+
 
-        if not html_content or len(html_content) < 50:
-            return f"网页抓取失败: {url} - 返回内容为空或过短"
+def _fetch_static(url: str, budget: float, cached: Optional[CachedPage] = None) -> Tuple[Optional[str], Optional[str]]:
+    """
+    通过 keep-alive 连接池直接 GET 页面（有缓存校验信息时发送条件请求）
+
+    budget 为整个静态尝试（含重定向）的总时间；不足 STATIC_MIN_BUDGET_S 时直接返回升级原因
+
+    Returns:
+        (清洗后的纯文本, None) 或 (None, 升级原因)
+    """
+    if _is_dynamic_url(url):
+        return None, "dynamic_host"
+
+    if budget < STATIC_MIN_BUDGET_S:
+        return None, "no_budget"
+
+    deadline = time.perf_counter() + budget
+    pool = get_http_pool()
+    request_url = url
+    headers = _static_headers(cached)
+
+    try:
+        for _ in range(MAX_STATIC_REDIRECTS + 1):
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                return None, "static_timeout"
+            result = pool.get(request_url, headers=headers, timeout=remaining)
+            next_url = _redirect_target(request_url, result, headers)
+            if next_url is None:
+                break
+            request_url = next_url
+            if _is_dynamic_url(request_url):
+                return None, "dynamic_host"
+        else:
+            return None, "too_many_redirects"
+    except Exception as e:
+        return None, f"http_error:{type(e).__name__}"
+
+    return _process_static_response(url, request_url, result, cached)
+
+
+async def _fetch_static_async(url: str, budget: float,
+                              cached: Optional[CachedPage] = None) -> Tuple[Optional[str], Optional[str]]:
+    """_fetch_static 的异步版本（asyncio 连接池）"""
+    if _is_dynamic_url(url):
+        return None, "dynamic_host"
+
+    if budget < STATIC_MIN_BUDGET_S:
+        return None, "no_budget"
+
+    deadline = time.perf_counter() + budget
+    pool = get_async_http_pool()
+    request_url = url
+    headers = _static_headers(cached)
+
+    try:
+        for _ in range(MAX_STATIC_REDIRECTS + 1):
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                return None, "static_timeout"
+            result = await pool.get(request_url, headers=headers, timeout=remaining)
+            next_url = _redirect_target(request_url, result, headers)
+            if next_url is None:
+                break
+            request_url = next_url
+            if _is_dynamic_url(request_url):
+                return None, "dynamic_host"
+        else:
+            return None, "too_many_redirects"
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        return None, f"http_error:{type(e).__name__}"
+
+    return _process_static_response(url, request_url, result, cached)
+
+
+def _static_headers(cached: Optional[CachedPage]) -> Dict[str, str]:
+    headers = {"User-Agent": STATIC_USER_AGENT, "Accept": "text/html,application/xhtml+xml;q=0.9,*/*;q=0.5"}
+    if cached is not None and cached.revalidatable:
+        # 条件请求只用于原始 URL（重定向后的目标不使用该校验信息）
+        if cached.etag:
+            headers["If-None-Match"] = cached.etag
+        if cached.last_modified:
+            headers["If-Modified-Since"] = cached.last_modified
+    return headers
+
+
+def _redirect_target(request_url: str, result: HTTPResult, headers: Dict[str, str]) -> Optional[str]:
+    """重定向响应返回下一跳 URL（并移除条件请求头），否则返回 None"""
+    location = result.headers.get("location")
+    if result.status in (301, 302, 303, 307, 308) and location:
+        headers.pop("If-None-Match", None)
+        headers.pop("If-Modified-Since", None)
+        return urljoin(request_url, location)
+    return None
+
+
+def _process_static_response(url: str, request_url: str, result: HTTPResult,
+                             cached: Optional[CachedPage]) -> Tuple[Optional[str], Optional[str]]:
+    """处理静态路径的最终响应：304 复用缓存、检查内容类型、判断是否需要 JS 渲染并写入缓存"""
+    cache = get_page_cache()
+    if result.status == 304 and request_url == url and cached is not None:
+        cache.touch(url)
+        with _PATH_STATS_LOCK:
+            _PATH_STATS["not_modified"] += 1
+        return cached.text, None
+
+    if result.status != 200:
+        return None, f"http_status:{result.status}"
+    content_type = result.headers.get("content-type", "").lower()
+    if content_type and "html" not in content_type:
+        return None, f"non_html:{content_type.split(';')[0]}"
+
+    html = _decode_html(result)
+    if not html or len(html) < 50:
+        return None, "empty_body"
+
+    text = clean_html_to_text(html)
+    if text.startswith(PARSE_ERROR_PREFIX):
+        return None, "parse_error"
+    reason = _needs_js_rendering(html, text)
+    if reason:
+        return None, reason
+
+    # 校验信息属于最终响应，发生重定向时不保存，避免对原始 URL 发送错误的条件请求
+    redirected = request_url != url
+    cache.store(
+        url, text, html,
+        etag=None if redirected else result.headers.get("etag"),
+        last_modified=None if redirected else result.headers.get("last-modified")
+    )
+    return text, None
+
+
+# ============================================================================
+# 浏览器路径
+# ============================================================================
+
+def _fetch_via_browser(url: str, timeout: int, isolated: bool) -> Tuple[str, str, Optional[str]]:
+    """
+    通过 OpenClaw Browser 抓取并清洗单个网页
 
-        # 调用 L2 清洗器
-        cleaned_text = clean_html_to_text(html_content)
+    Returns:
+        (清洗后的纯文本或错误信息, 'browser-daemon' | 'browser-cli', 成功时的 HTML 否则 None)
+    """
+    start = time.perf_counter()
+    path = "browser-cli"
+    try:
+        html_content = None
+
+        daemon = get_browser_daemon()
+        if daemon is not None:
+            path = "browser-daemon"
+            try:
+                html_content = daemon.fetch_html(url, timeout)
+            except TimeoutError:
+                return f"网页抓取超时: {url} - 超过 {timeout} 秒未响应", path, None
+            except BrowserDaemonError as e:
+                print(f"⚠️ 浏览器控制进程不可用，回退到子进程模式: {e}", file=sys.stderr)
+
+        if html_content is None:
+            path = "browser-cli"
+            # daemon 失败后的回退只使用剩余时间
+            html_content, error = _fetch_html_via_cli(url, _remaining_budget(timeout, start), isolated=isolated)
+            if error:
+                return error, path, None
 
-        return cleaned_text
+        content, html = _clean_browser_html(url, html_content)
+        return content, path, html
 
     except subprocess.TimeoutExpired:
-        return f"网页抓取超时: {url} - 超过 {timeout} 秒未响应"
+        return f"网页抓取超时: {url} - 超过 {timeout} 秒未响应", path, None
+
+    except FileNotFoundError:
+        return f"网页抓取失败: OpenClaw 命令未找到，请检查环境", path, None
+
+    except Exception as e:
+        return f"网页抓取异常: {url} - {type(e).__name__}: {str(e)}", path, None
+
+
+async def _fetch_via_browser_async(url: str, timeout: int) -> Tuple[str, str, Optional[str]]:
+    """_fetch_via_browser 的异步版本（并发调用时每次抓取都隔离到独立标签页）"""
+    start = time.perf_counter()
+    path = "browser-cli"
+    try:
+        html_content = None
+
+        daemon = get_browser_daemon()
+        if daemon is not None:
+            path = "browser-daemon"
+            try:
+                html_content = await daemon.fetch_html_async(url, timeout)
+            except TimeoutError:
+                return f"网页抓取超时: {url} - 超过 {timeout} 秒未响应", path, None
+            except BrowserDaemonError as e:
+                print(f"⚠️ 浏览器控制进程不可用，回退到子进程模式: {e}", file=sys.stderr)
+
+        if html_content is None:
+            path = "browser-cli"
+            html_content, error = await _fetch_html_via_cli_async(url, _remaining_budget(timeout, start))
+            if error:
+                return error, path, None
+
+        content, html = _clean_browser_html(url, html_content)
+        return content, path, html
+
+    except asyncio.CancelledError:
+        raise
+
+    except (asyncio.TimeoutError, TimeoutError):
+        return f"网页抓取超时: {url} - 超过 {timeout} 秒未响应", path, None
 
     except FileNotFoundError:
-        return f"网页抓取失败: OpenClaw 命令未找到，请检查环境"
+        return f"网页抓取失败: OpenClaw 命令未找到，请检查环境", path, None
 
     except Exception as e:
-        return f"网页抓取异常: {url} - {type(e).__name__}: {str(e)}"
+        return f"网页抓取异常: {url} - {type(e).__name__}: {str(e)}", path, None
+
+
+def _clean_browser_html(url: str, html_content: Optional[str]) -> Tuple[str, Optional[str]]:
+    """清洗浏览器返回的 HTML，返回 (清洗后的纯文本或错误信息, 成功时的 HTML 否则 None)"""
+    if not html_content or len(html_content) < 50:
+        return f"网页抓取失败: {url} - 返回内容为空或过短", None
+
+    # 调用 L2 清洗器（解析失败时不返回 HTML，错误信息不会写入缓存）
+    text = clean_html_to_text(html_content)
+    if text.startswith(PARSE_ERROR_PREFIX):
+        return text, None
+    return text, html_content
+
+
+def fetch_webpages_concurrent(
+    urls: List[str],
+    max_concurrency: int = DEFAULT_POOL_SIZE,
+    per_host_limit: int = DEFAULT_PER_HOST_LIMIT,
+    timeout: int = 15
+) -> Iterator[Tuple[str, str]]:
+    """
+    并发抓取多个网页（有界标签页池 + 每主机并发上限），按完成顺序返回
+
+    每个 URL 在独立标签页中抓取；某个主机的并发已满时，调度器先处理
+    其他主机的 URL，不会占用空闲的池槽位等待。
+
+    Args:
+        urls: 目标 URL 列表
+        max_concurrency: 同时在途的抓取数（标签页池大小）
+        per_host_limit: 同一主机同时在途的抓取数上限
+        timeout: 单个 URL 的超时时间（秒）
+
+    Yields:
+        (url, 清洗后的纯文本或错误信息)，按完成先后顺序
+    """
+    pending = list(urls)
+    if not pending:
+        return
+
+    max_concurrency = max(1, max_concurrency)
+    per_host_limit = max(1, per_host_limit)
+    host_inflight: Dict[str, int] = {}
+    inflight = {}
+
+    def _host(url: str) -> str:
+        try:
+            return (urlsplit(url).hostname or "").lower()
+        except ValueError:
+            return ""
+
+    with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        while pending or inflight:
+            # 调度：在池容量和主机上限内，按原顺序提交可运行的 URL
+            for url in list(pending):
+                if len(inflight) >= max_concurrency:
+                    break
+                host = _host(url)
+                if host_inflight.get(host, 0) >= per_host_limit:
+                    continue
+                pending.remove(url)
+                host_inflight[host] = host_inflight.get(host, 0) + 1
+                inflight[executor.submit(_fetch_webpage, url, timeout, True)] = (url, host)
+
+            done, _ = wait(list(inflight), return_when=FIRST_COMPLETED)
+            for future in done:
+                url, host = inflight.pop(future)
+                host_inflight[host] -= 1
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = f"网页抓取异常: {url} - {type(e).__name__}: {str(e)}"
+                yield url, result
 
 
 if __name__ == "__main__":
     # 测试用例
     test_url = "https://example.com"
     print(f"正在抓取: {test_url}")
-    result = fetch_webpage_content(test_url)
-    print(result[:500])  # 只打印前 500 字符
+    result = fetch_webpage_with_meta(test_url)
+    print(f"服务路径: {result['path']}（升级原因: {result['escalation']}，耗时 {result['elapsed_s']}s）")
+    print(result["content"][:500])  # 只打印前 500 字符
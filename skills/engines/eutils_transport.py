@@ -0,0 +1,273 @@
+"""
+L1 引擎层：NCBI E-utilities 传输后端
+medical_engine 通过统一的 esearch / esummary / efetch 接口发出请求，返回文件句柄，
+解析逻辑（Entrez.read / iter_efetch_articles）与传输方式无关
+
+后端：
+- entrez（默认）: Bio.Entrez 原生实现，每次请求新建 urllib 连接
+- pooled: keep-alive 连接池 + gzip 压缩传输（见 http_pool）
+- async: asyncio 连接池（见 async_http），供 *_async 接口使用，与 NCBI_TRANSPORT 无关
+
+环境变量：
+- NCBI_TRANSPORT: 'entrez' | 'pooled'（默认 'entrez'）
+- NCBI_EUTILS_BASE_URL: E-utilities 根地址（pooled 后端使用，便于指向本地桩服务）
+
+基准测试：
+    python skills/engines/eutils_transport.py --bench [-n 200]
+    在本地桩服务上对比"每次新建连接"（Bio.Entrez 默认行为）与连接池
+"""
+
+import io
+import os
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+from urllib.parse import urlencode
+
+try:
+    from Bio import Entrez
+    BIOPYTHON_AVAILABLE = True
+except ImportError:
+    BIOPYTHON_AVAILABLE = False
+
+sys.path.append(str(Path(__file__).parent.parent))
+from engines.http_pool import HTTPConnectionPool, get_http_pool
+from engines.async_http import get_async_http_pool, loop_local
+
+EUTILS_BASE_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/"
+
+# 超过该数量的 ID 改用 POST（与 Bio.Entrez 行为一致）
+POST_ID_THRESHOLD = 200
+
+
+class EntrezTransport:
+    """Bio.Entrez 原生传输（默认）"""
+
+    name = "entrez"
+
+    def esearch(self, **params):
+        return Entrez.esearch(**params)
+
+    def esummary(self, **params):
+        return Entrez.esummary(**params)
+
+    def efetch(self, **params):
+        return Entrez.efetch(**params)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"transport": self.name}
+
+
+class PooledEutilsTransport:
+    """keep-alive 连接池 + gzip 传输，返回与 Bio.Entrez 相同的 XML 字节流"""
+
+    name = "pooled"
+
+    def __init__(self, base_url: Optional[str] = None, pool: Optional[HTTPConnectionPool] = None):
+        self.base_url = (base_url or os.getenv("NCBI_EUTILS_BASE_URL") or EUTILS_BASE_URL).rstrip("/") + "/"
+        self.pool = pool or get_http_pool()
+        self._lock = threading.Lock()
+        self._bytes_downloaded = 0
+
+    def esearch(self, **params) -> io.BytesIO:
+        return self._call("esearch.fcgi", params)
+
+    def esummary(self, **params) -> io.BytesIO:
+        return self._call("esummary.fcgi", params)
+
+    def efetch(self, **params) -> io.BytesIO:
+        return self._call("efetch.fcgi", params)
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self.pool.stats()
+        stats["transport"] = self.name
+        with self._lock:
+            stats["eutils_bytes_downloaded"] = self._bytes_downloaded
+        return stats
+
+    def _call(self, cgi: str, params: Dict[str, Any]) -> io.BytesIO:
+        query = self._encode_params(params)
+        url = self.base_url + cgi
+
+        id_count = len(params["id"]) if isinstance(params.get("id"), (list, tuple)) else 0
+        if id_count > POST_ID_THRESHOLD:
+            result = self.pool.post(url, query.encode("utf-8"), headers={
+                "Content-Type": "application/x-www-form-urlencoded"
+            })
+        else:
+            result = self.pool.get(f"{url}?{query}")
+
+        if result.status >= 400:
+            raise IOError(f"E-utilities HTTP {result.status}: {cgi}")
+
+        with self._lock:
+            self._bytes_downloaded += result.wire_bytes
+        return io.BytesIO(result.body)
+
+    @staticmethod
+    def _encode_params(params: Dict[str, Any]) -> str:
+        """补充 tool/email/api_key 并编码参数（列表参数以逗号拼接）"""
+        merged = {}
+        for key, value in params.items():
+            if value is None:
+                continue
+            if isinstance(value, (list, tuple)):
+                value = ",".join(str(v) for v in value)
+            merged[key] = value
+
+        email = getattr(Entrez, "email", None) if BIOPYTHON_AVAILABLE else None
+        api_key = getattr(Entrez, "api_key", None) if BIOPYTHON_AVAILABLE else None
+        merged.setdefault("tool", "lingnexus")
+        if email or os.getenv("NCBI_EMAIL"):
+            merged.setdefault("email", email or os.getenv("NCBI_EMAIL"))
+        if api_key or os.getenv("NCBI_API_KEY"):
+            merged.setdefault("api_key", api_key or os.getenv("NCBI_API_KEY"))
+        return urlencode(merged)
+
+
+class AsyncEutilsTransport:
+    """
+    异步传输（asyncio keep-alive 连接池 + gzip），供 medical_engine 的 *_async 接口使用
+
+    Bio.Entrez 没有异步实现，因此异步接口始终直连 E-utilities；
+    返回的 XML 字节流与同步后端一致，解析逻辑共用
+    """
+
+    name = "async"
+
+    def __init__(self, base_url: Optional[str] = None):
+        self.base_url = (base_url or os.getenv("NCBI_EUTILS_BASE_URL") or EUTILS_BASE_URL).rstrip("/") + "/"
+        self._bytes_downloaded = 0
+
+    async def esearch(self, **params) -> io.BytesIO:
+        return await self._call("esearch.fcgi", params)
+
+    async def esummary(self, **params) -> io.BytesIO:
+        return await self._call("esummary.fcgi", params)
+
+    async def efetch(self, **params) -> io.BytesIO:
+        return await self._call("efetch.fcgi", params)
+
+    def stats(self) -> Dict[str, Any]:
+        stats = get_async_http_pool().stats()
+        stats["transport"] = self.name
+        stats["eutils_bytes_downloaded"] = self._bytes_downloaded
+        return stats
+
+    async def _call(self, cgi: str, params: Dict[str, Any]) -> io.BytesIO:
+        query = PooledEutilsTransport._encode_params(params)
+        url = self.base_url + cgi
+        pool = get_async_http_pool()
+
+        id_count = len(params["id"]) if isinstance(params.get("id"), (list, tuple)) else 0
+        if id_count > POST_ID_THRESHOLD:
+            result = await pool.post(url, query.encode("utf-8"), headers={
+                "Content-Type": "application/x-www-form-urlencoded"
+            })
+        else:
+            result = await pool.get(f"{url}?{query}")
+
+        if result.status >= 400:
+            raise IOError(f"E-utilities HTTP {result.status}: {cgi}")
+
+        self._bytes_downloaded += result.wire_bytes
+        return io.BytesIO(result.body)
+
+
+_TRANSPORT = None
+_TRANSPORT_LOCK = threading.Lock()
+
+
+def get_eutils_transport():
+    """按 NCBI_TRANSPORT 环境变量获取进程级传输后端"""
+    global _TRANSPORT
+    with _TRANSPORT_LOCK:
+        if _TRANSPORT is None:
+            if os.getenv("NCBI_TRANSPORT", "entrez").lower() == "pooled":
+                _TRANSPORT = PooledEutilsTransport()
+            else:
+                _TRANSPORT = EntrezTransport()
+        return _TRANSPORT
+
+
+def get_async_eutils_transport() -> AsyncEutilsTransport:
+    """获取当前事件循环的异步传输后端"""
+    return loop_local("eutils_transport", AsyncEutilsTransport)
+
+
+# ============================================================================
+# 基准测试：本地桩服务（urllib 每次新建连接 vs 连接池）
+# ============================================================================
+
+def _run_benchmark(requests_count: int = 200) -> None:
+    import gzip
+    import time
+    import urllib.request
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    payload = (
+        b'<?xml version="1.0" ?>\n<eSearchResult><Count>1000</Count><RetMax>20</RetMax>'
+        b'<IdList>' + b''.join(b'<Id>%d</Id>' % (38000000 + i) for i in range(20)) +
+        b'</IdList><QueryTranslation>"PROTAC"[All Fields]</QueryTranslation></eSearchResult>\n'
+    ) * 20
+    compressed = gzip.compress(payload)
+
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            use_gzip = "gzip" in self.headers.get("Accept-Encoding", "")
+            body = compressed if use_gzip else payload
+            self.send_response(200)
+            self.send_header("Content-Type", "text/xml; charset=UTF-8")
+            self.send_header("Content-Length", str(len(body)))
+            if use_gzip:
+                self.send_header("Content-Encoding", "gzip")
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/entrez/eutils/"
+
+    def bench_urllib():
+        # Bio.Entrez 默认行为：每次请求 urlopen 新连接，不请求压缩
+        received = 0
+        for _ in range(requests_count):
+            with urllib.request.urlopen(base_url + "esearch.fcgi?db=pubmed&term=PROTAC") as resp:
+                received += len(resp.read())
+        return received
+
+    transport = PooledEutilsTransport(base_url=base_url, pool=HTTPConnectionPool())
+
+    def bench_pooled():
+        for _ in range(requests_count):
+            transport.esearch(db="pubmed", term="PROTAC").read()
+        return transport.stats()["eutils_bytes_downloaded"]
+
+    print(f"本地桩服务: {base_url}（{requests_count} 次 esearch，响应 {len(payload)} 字节）")
+    for label, func in (("urllib 每次新建连接", bench_urllib), ("keep-alive 连接池 + gzip", bench_pooled)):
+        start = time.perf_counter()
+        received = func()
+        elapsed = time.perf_counter() - start
+        print(f"  {label:<24} 总耗时 {elapsed:.3f}s  "
+              f"平均 {elapsed / requests_count * 1000:.2f}ms/次  传输 {received} 字节")
+
+    print(f"  连接池统计: {transport.pool.stats()}")
+    print("注意：桩服务为明文 HTTP，不含 TLS 握手开销；真实 eutils 上连接复用的收益更大。")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    if "--bench" in sys.argv:
+        count = 200
+        if "-n" in sys.argv:
+            count = int(sys.argv[sys.argv.index("-n") + 1])
+        _run_benchmark(count)
+    else:
+        print("用法: python3 eutils_transport.py --bench [-n 次数]")
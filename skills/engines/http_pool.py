@@ -0,0 +1,231 @@
+"""
+L1 引擎层：keep-alive HTTP 连接池
+按 (scheme, host, port) 复用 HTTP/1.1 长连接，避免每次请求重新 TCP/TLS 握手
+
+特性：
+- 连接复用：空闲连接放回池中，下次同主机请求直接复用
+- 压缩传输：默认发送 Accept-Encoding: gzip, deflate 并自动解压
+- 失效重连：复用的连接被服务端关闭时，自动换新连接重试一次
+- 统计：requests / connections_created / connections_reused / bytes_received
+"""
+
+import ssl
+import gzip
+import zlib
+import threading
+import http.client
+from urllib.parse import urlsplit
+from typing import Any, Dict, List, Optional, Tuple
+
+DEFAULT_TIMEOUT_S = 30
+DEFAULT_MAX_IDLE_PER_HOST = 4
+DEFAULT_USER_AGENT = "LingNexus/1.0 (+global-intelligence-search)"
+
+# 复用连接时可能遇到的"服务端已关闭"类异常
+_STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.BadStatusLine,
+    ConnectionResetError,
+    BrokenPipeError,
+)
+
+
+class HTTPResult:
+    """HTTP 响应（正文已读取并解压）"""
+
+    __slots__ = ("url", "status", "headers", "body", "wire_bytes")
+
+    def __init__(self, url: str, status: int, headers: Dict[str, str], body: bytes, wire_bytes: int):
+        self.url = url
+        self.status = status
+        self.headers = headers      # 键统一为小写
+        self.body = body            # 解压后的正文
+        self.wire_bytes = wire_bytes  # 网络传输字节数（压缩后）
+
+    def text(self, default_encoding: str = "utf-8") -> str:
+        """按 Content-Type 声明的字符集解码正文"""
+        encoding = default_encoding
+        content_type = self.headers.get("content-type", "")
+        for part in content_type.split(";"):
+            part = part.strip()
+            if part.lower().startswith("charset="):
+                encoding = part.split("=", 1)[1].strip("\"' ") or default_encoding
+        try:
+            return self.body.decode(encoding, errors="replace")
+        except LookupError:
+            return self.body.decode(default_encoding, errors="replace")
+
+
+class HTTPConnectionPool:
+    """线程安全的 keep-alive 连接池"""
+
+    def __init__(
+        self,
+        timeout: float = DEFAULT_TIMEOUT_S,
+        max_idle_per_host: int = DEFAULT_MAX_IDLE_PER_HOST,
+        user_agent: str = DEFAULT_USER_AGENT
+    ):
+        self.timeout = timeout
+        self.max_idle_per_host = max_idle_per_host
+        self.user_agent = user_agent
+
+        self._idle: Dict[Tuple[str, str, int], List[http.client.HTTPConnection]] = {}
+        self._lock = threading.Lock()
+        self._ssl_context = ssl.create_default_context()
+        self._stats = {
+            "requests": 0,
+            "connections_created": 0,
+            "connections_reused": 0,
+            "bytes_received": 0,
+        }
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        body: Optional[bytes] = None,
+        timeout: Optional[float] = None
+    ) -> HTTPResult:
+        """
+        发送请求并读取完整响应（正文读完后连接才能放回池中）
+
+        Raises:
+            网络异常原样抛出，由调用方决定重试或降级
+        """
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        if scheme not in ("http", "https"):
+            raise ValueError(f"不支持的 URL 协议: {url}")
+
+        port = parts.port or (443 if scheme == "https" else 80)
+        key = (scheme, parts.hostname or "", port)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+
+        send_headers = {
+            "Host": parts.netloc,
+            "User-Agent": self.user_agent,
+            "Accept-Encoding": "gzip, deflate",
+            "Connection": "keep-alive",
+        }
+        if headers:
+            send_headers.update(headers)
+
+        conn, reused = self._checkout(key, timeout)
+        try:
+            response = self._send(conn, method, path, send_headers, body)
+        except _STALE_CONNECTION_ERRORS:
+            conn.close()
+            if not reused:
+                raise
+            # 池中连接已被服务端关闭，换新连接重试一次
+            conn, reused = self._new_connection(key, timeout), False
+            response = self._send(conn, method, path, send_headers, body)
+        except Exception:
+            conn.close()
+            raise
+
+        try:
+            raw = response.read()
+        except Exception:
+            conn.close()
+            raise
+
+        result_headers = {k.lower(): v for k, v in response.getheaders()}
+        result = HTTPResult(url, response.status, result_headers, _decode_body(raw, result_headers), len(raw))
+
+        if response.will_close:
+            conn.close()
+        else:
+            self._checkin(key, conn)
+
+        with self._lock:
+            self._stats["requests"] += 1
+            self._stats["bytes_received"] += len(raw)
+            self._stats["connections_reused" if reused else "connections_created"] += 1
+
+        return result
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None, timeout: Optional[float] = None) -> HTTPResult:
+        return self.request("GET", url, headers=headers, timeout=timeout)
+
+    def post(self, url: str, body: bytes, headers: Optional[Dict[str, str]] = None,
+             timeout: Optional[float] = None) -> HTTPResult:
+        return self.request("POST", url, headers=headers, body=body, timeout=timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["idle_connections"] = sum(len(conns) for conns in self._idle.values())
+        return stats
+
+    def close(self) -> None:
+        """关闭所有空闲连接"""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for conn in conns:
+                conn.close()
+
+    # ------------------------------------------------------------------
+    # 内部实现
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _send(conn, method, path, headers, body):
+        conn.request(method, path, body=body, headers=headers)
+        return conn.getresponse()
+
+    def _checkout(self, key, timeout) -> Tuple[http.client.HTTPConnection, bool]:
+        with self._lock:
+            conns = self._idle.get(key)
+            conn = conns.pop() if conns else None
+        if conn is not None:
+            conn.timeout = timeout or self.timeout
+            if conn.sock is not None:
+                conn.sock.settimeout(conn.timeout)
+            return conn, True
+        return self._new_connection(key, timeout), False
+
+    def _checkin(self, key, conn) -> None:
+        with self._lock:
+            conns = self._idle.setdefault(key, [])
+            if len(conns) < self.max_idle_per_host:
+                conns.append(conn)
+                return
+        conn.close()
+
+    def _new_connection(self, key, timeout) -> http.client.HTTPConnection:
+        scheme, host, port = key
+        if scheme == "https":
+            return http.client.HTTPSConnection(host, port, timeout=timeout or self.timeout,
+                                               context=self._ssl_context)
+        return http.client.HTTPConnection(host, port, timeout=timeout or self.timeout)
+
+
+def _decode_body(raw: bytes, headers: Dict[str, str]) -> bytes:
+    """按 Content-Encoding 解压正文"""
+    encoding = headers.get("content-encoding", "").lower()
+    if encoding == "gzip":
+        return gzip.decompress(raw)
+    if encoding == "deflate":
+        try:
+            return zlib.decompress(raw)
+        except zlib.error:
+            return zlib.decompress(raw, -zlib.MAX_WBITS)  # 部分服务器发送 raw deflate
+    return raw
+
+
+_POOL: Optional[HTTPConnectionPool] = None
+_POOL_LOCK = threading.Lock()
+
+
+def get_http_pool() -> HTTPConnectionPool:
+    """获取进程级共享连接池"""
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            _POOL = HTTPConnectionPool()
+        return _POOL
@@ -12,14 +12,68 @@ L1 引擎层：医疗数据库检索引擎
 - PubMed API 调用超时时自动重试
 - 最大重试次数：3 次
 - 退避策略：1s, 2s, 4s
+
+优化：PubMed 响应缓存
+- esearch 按 (query, retmax, sort) 缓存 PMID 列表
+- efetch 按单篇 PMID 缓存文献，跨查询复用
+- 内存 LRU + 磁盘持久化，TTL 与容量可配置（见 pubmed_cache）
+
+优化：文献只解析一次
+- efetch 结果解析为紧凑的 PubMedArticle 记录（见 pubmed_article）
+- 文本输出、JSON 输出、COI 解析均基于同一记录渲染
+- efetch 响应经 iterparse 流式解码，逐篇产出，峰值内存与批量大小无关
+
+新增功能：大规模分页检索（Entrez History Server）
+- esearch usehistory 获取 WebEnv/query_key，按页 efetch
+- 生成器 API 逐篇产出，单页失败只重试该页，不重启整个扫描
+
+优化：NCBI 进程级限流
+- 所有 Entrez 调用先经过跨进程共享的令牌桶（见 ncbi_rate_limiter）
+- 根据 NCBI_API_KEY 自动选择 3 次/秒或 10 次/秒限额
+
+优化：可选 keep-alive 传输后端
+- NCBI_TRANSPORT=pooled 时复用 eutils 长连接并启用 gzip（见 eutils_transport）
+- 传输层只返回 XML 句柄，解析结构与默认 Bio.Entrez 后端完全一致
+
+优化：COI 两阶段检索（可选）
+- 先取全部候选的 esummary（标题 / 日期 / 出版类型），打分预筛
+- 只对幸存文献 efetch 完整摘要，减少下载字节与解析时间
+
+新增功能：结构化过滤器下推
+- 日期窗口编译为 esearch mindate / maxdate / datetype 参数
+- 出版类型、MeSH、关键词约束编译为检索式子句，窗口外文献不离开 NCBI
+- VALIDATOR_FILTERS 与 Validator 硬性拦截规则保持一致
+
+新增功能：增量抓取（Delta Crawl）
+- 每个检索式记录水位线（上次运行日期 + 已见 PMID，见 pubmed_watermark）
+- 再次运行时只检索上次运行以来入库的文献，并与已见 PMID 做集合差
+- 增量检索按日期排序、经 History Server 分页读完全部 PMID（不走 esearch 缓存）
+- 只有未见过的 PMID 才会分页 efetch 并进入下游验证环节；超出单次上限的部分记入水位线待处理队列，
+  下次运行优先处理，日期水位照常推进（之后的运行始终带入库日期下限）
+
+新增功能：离线 baseline 批量 COI 挖掘
+- 单篇 COI 解析抽取为 analyze_article_coi，在线检索与离线批量共用
+- 本地 baseline / updatefile 的进程池挖掘见 pubmed_baseline
+
+新增功能：原生 asyncio 接口
+- search_medical_db_json_async / extract_coi_from_pubmed_async 与同步版本参数、返回结构一致
+- E-utilities 请求经 asyncio 连接池发出（见 async_http / eutils_transport）
+- 限流等待与重试退避均为 asyncio.sleep，单进程可同时保持大量检索在途
+- 与同步接口共用缓存、限流令牌桶与解析逻辑
+
+优化：在途请求合并（见 single_flight）
+- 参数相同的 search_medical_db / search_medical_db_json（含异步版本）同时在途时只执行一次
+  esearch / efetch，其余调用者共享结果（如多个专利数据源同时回退到同一 PubMed 查询）
 """
 
 import os
 import sys
 import re
+import json
 import time
+import asyncio
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
 
 try:
     from Bio import Entrez
@@ -27,10 +81,79 @@ try:
 except ImportError:
     BIOPYTHON_AVAILABLE = False
 
+sys.path.append(str(Path(__file__).parent.parent))
+from engines.pubmed_cache import get_pubmed_cache, esearch_key
+from engines.pubmed_article import PubMedArticle, iter_efetch_articles, parse_esummary
+
+from engines.ncbi_rate_limiter import get_ncbi_rate_limiter
+from engines.eutils_transport import get_async_eutils_transport, get_eutils_transport
+from engines.pubmed_watermark import watermark_key, load_watermark, save_watermark
+from engines.single_flight import get_single_flight
+from scrapers.entity_extractor import COMPANY_EXTRACTOR, context_window
+from scrapers.patent_normalizer import find_patent_ids
+
+get_pubmed_cache().register_codec("article", PubMedArticle.to_dict, PubMedArticle.from_dict)
+
+# NCBI API Key（配置后限额由 3 次/秒提升至 10 次/秒）
+if BIOPYTHON_AVAILABLE and os.getenv("NCBI_API_KEY"):
+    Entrez.api_key = os.getenv("NCBI_API_KEY")
+
 # 重试配置
 MAX_RETRIES = 3
 INITIAL_BACKOFF_S = 1
 
+# History Server 分页配置
+DEFAULT_PAGE_SIZE = 200
+
+# 两阶段检索（esummary 预筛 → efetch 精取）配置
+# 直接淘汰的出版类型（勘误、评论等不含研发/专利线索）
+EXCLUDED_PUB_TYPES = {
+    "Erratum", "Published Erratum", "Retraction Notice", "Retraction of Publication",
+    "Comment", "Editorial", "News", "Newspaper Article", "Biography", "Portrait",
+}
+# 出版类型加权（原始研究与临床试验更可能披露专利/企业关联）
+PUB_TYPE_WEIGHTS = {
+    "Clinical Trial": 1.5,
+    "Clinical Trial, Phase I": 1.5,
+    "Clinical Trial, Phase II": 1.5,
+    "Clinical Trial, Phase III": 1.5,
+    "Journal Article": 1.0,
+    "Research Support, Non-U.S. Gov't": 0.5,
+    "Review": 0.5,
+    "Letter": 0.2,
+}
+# 标题中提示 COI/专利线索的关键词
+TITLE_COI_HINT = re.compile(
+    r'patent|licens|compan|industr|startup|spin-?off|pharmaceutical|biotech|'
+    r'discovery|clinical candidate|first-in-class|\b(?:WO|US|CN|JP|EP)\s?\d{6,}',
+    re.IGNORECASE
+)
+# 近 N 年的文献获得时效加分
+RECENCY_WINDOW_YEARS = 5
+
+# 与 Validator 硬性拦截规则一致的过滤器（时间窗口 + 靶向降解剂技术类别）
+VALIDATOR_FILTERS = {
+    "mindate": "2023/01/01",
+    "maxdate": "2026/12/31",
+    "datetype": "pdat",
+    "keywords": [
+        "PROTAC", "molecular glue", "LYTAC", "ATTEC", "AUTAC",
+        "degrader", "targeted protein degradation",
+    ],
+}
+
+# 增量抓取：向前重叠的天数（覆盖 NCBI 入库延迟，重复部分由集合差去除）
+DELTA_OVERLAP_DAYS = 2
+# 增量抓取：从 History Server 分页读取 PMID 时每页的条数（只传 PMID，页可以很大）
+DELTA_ID_PAGE_SIZE = 5000
+
+# 过滤器支持的键
+FILTER_KEYS = {
+    "mindate", "maxdate", "datetype",
+    "publication_types", "exclude_publication_types",
+    "mesh_terms", "keywords",
+}
+
 
 def _retry_with_backoff(func, *args, **kwargs):
     """
@@ -64,7 +187,371 @@ def _retry_with_backoff(func, *args, **kwargs):
     raise last_exception
 
 
-def search_medical_db(query: str, source: str = 'pubmed', max_results: int = 10) -> str:
+async def _retry_with_backoff_async(func, *args, **kwargs):
+    """
+    指数退避重试（异步版本，退避期间 asyncio.sleep 让出事件循环）
+
+    Args:
+        func: 要重试的协程函数
+        *args, **kwargs: 函数参数
+
+    Raises:
+        最后一次尝试的异常
+    """
+    last_exception = None
+
+    for attempt in range(MAX_RETRIES):
+        try:
+            return await func(*args, **kwargs)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            last_exception = e
+            if attempt < MAX_RETRIES - 1:
+                backoff_s = INITIAL_BACKOFF_S * (2 ** attempt)
+                print(f"⚠️ PubMed API 调用失败 (attempt {attempt + 1}/{MAX_RETRIES}): {e}")
+                print(f"   等待 {backoff_s}s 后重试...")
+                await asyncio.sleep(backoff_s)
+            else:
+                print(f"❌ PubMed API 调用失败，已达最大重试次数")
+
+    raise last_exception
+
+
+def _ncbi_throttle() -> None:
+    """在每次 Entrez 请求前获取令牌（跨进程共享限额）"""
+    get_ncbi_rate_limiter().acquire()
+
+
+async def _ncbi_throttle_async() -> None:
+    """异步获取令牌（与同步调用共用同一个令牌桶）"""
+    await get_ncbi_rate_limiter().acquire_async()
+
+
+def _quote_terms(terms: List[str], tag: str) -> str:
+    """将多个检索词编译为 OR 子句，如 ("A"[pt] OR "B"[pt])"""
+    clauses = ['"{}"[{}]'.format(str(t).replace('"', ''), tag) for t in terms if str(t).strip()]
+    return "(" + " OR ".join(clauses) + ")" if clauses else ""
+
+
+def build_pubmed_query(query: str, filters: Optional[Dict] = None) -> Tuple[str, Dict[str, str]]:
+    """
+    将结构化过滤器编译为 esearch 检索式与参数
+
+    Args:
+        query: 原始检索关键词
+        filters: 过滤器字典，支持的键：
+            - mindate / maxdate: 日期窗口（YYYY/MM/DD、YYYY/MM 或 YYYY）
+            - datetype: 日期类型（pdat 出版日期 | edat 入库日期 | mdat 修改日期，默认 pdat）
+            - publication_types: 出版类型白名单（任一命中，[pt]）
+            - exclude_publication_types: 出版类型黑名单（[pt]，NOT 子句）
+            - mesh_terms: MeSH 主题词（任一命中，[MeSH Terms]）
+            - keywords: 标题/摘要关键词（任一命中，[tiab]）
+
+    Returns:
+        (检索式, esearch 附加参数)
+
+    Raises:
+        ValueError: 过滤器包含不支持的键
+    """
+    if not filters:
+        return query, {}
+
+    unknown = set(filters) - FILTER_KEYS
+    if unknown:
+        raise ValueError(f"不支持的过滤条件: {', '.join(sorted(unknown))}")
+
+    clauses = [f"({query})"]
+    for key, tag in (("publication_types", "pt"), ("mesh_terms", "MeSH Terms"), ("keywords", "tiab")):
+        clause = _quote_terms(filters.get(key) or [], tag)
+        if clause:
+            clauses.append(clause)
+
+    term = " AND ".join(clauses)
+    excluded = _quote_terms(filters.get("exclude_publication_types") or [], "pt")
+    if excluded:
+        term = f"{term} NOT {excluded}"
+
+    params = {}
+    mindate, maxdate = filters.get("mindate"), filters.get("maxdate")
+    if mindate or maxdate:
+        # E-utilities 要求 mindate 与 maxdate 成对出现
+        params["mindate"] = str(mindate or "1800/01/01")
+        params["maxdate"] = str(maxdate or "3000/12/31")
+        params["datetype"] = str(filters.get("datetype") or "pdat")
+
+    return term, params
+
+
+def _esearch_ids(
+    query: str,
+    retmax: int,
+    sort: str = "relevance",
+    filters: Optional[Dict] = None
+) -> List[str]:
+    """
+    执行 esearch 并返回 PMID 列表（带缓存 + 重试）
+
+    缓存键为 (检索式, retmax, sort, 日期参数)，过滤器先编译为检索式
+    """
+    cache = get_pubmed_cache()
+    term, params = build_pubmed_query(query, filters)
+    key = esearch_key(term, retmax, sort, params)
+
+    cached = cache.get("esearch", key)
+    if cached is not None:
+        return cached
+
+    def _search():
+        _ncbi_throttle()
+        handle = get_eutils_transport().esearch(
+            db="pubmed",
+            term=term,
+            retmax=retmax,
+            sort=sort,
+            **params
+        )
+        results = Entrez.read(handle)
+        handle.close()
+        return results
+
+    search_results = _retry_with_backoff(_search)
+    id_list = [str(pmid) for pmid in search_results.get("IdList", [])]
+
+    cache.set("esearch", key, id_list)
+    return id_list
+
+
+async def _esearch_ids_async(
+    query: str,
+    retmax: int,
+    sort: str = "relevance",
+    filters: Optional[Dict] = None
+) -> List[str]:
+    """_esearch_ids 的异步版本（缓存键与同步版本一致，两者共享缓存）"""
+    cache = get_pubmed_cache()
+    term, params = build_pubmed_query(query, filters)
+    key = esearch_key(term, retmax, sort, params)
+
+    cached = cache.get("esearch", key)
+    if cached is not None:
+        return cached
+
+    async def _search():
+        await _ncbi_throttle_async()
+        handle = await get_async_eutils_transport().esearch(
+            db="pubmed",
+            term=term,
+            retmax=retmax,
+            sort=sort,
+            **params
+        )
+        return Entrez.read(handle)
+
+    search_results = await _retry_with_backoff_async(_search)
+    id_list = [str(pmid) for pmid in search_results.get("IdList", [])]
+
+    cache.set("esearch", key, id_list)
+    return id_list
+
+
+def _split_cached(kind: str, id_list: List[str]) -> Tuple[Dict, List[str]]:
+    """按 PMID 查缓存，返回 (已命中 {pmid: 记录}, 未命中的 PMID 列表)"""
+    cache = get_pubmed_cache()
+    found = {}
+    missing = []
+
+    for pmid in id_list:
+        cached = cache.get(kind, pmid)
+        if cached is not None:
+            found[pmid] = cached
+        else:
+            missing.append(pmid)
+
+    return found, missing
+
+
+def _esummary(id_list: List[str]) -> List[Dict]:
+    """
+    获取轻量 esummary 记录（带缓存 + 重试）
+
+    Returns:
+        与 id_list 顺序一致的 [{"pmid", "title", "pub_date", "pub_types"}]
+    """
+    cache = get_pubmed_cache()
+    found, missing = _split_cached("summary", id_list)
+
+    if missing:
+        def _summarize():
+            _ncbi_throttle()
+            handle = get_eutils_transport().esummary(db="pubmed", id=missing)
+            try:
+                return parse_esummary(handle)
+            finally:
+                handle.close()
+
+        for summary in _retry_with_backoff(_summarize):
+            cache.set("summary", summary["pmid"], summary)
+            found[summary["pmid"]] = summary
+
+    return [found[pmid] for pmid in id_list if pmid in found]
+
+
+async def _esummary_async(id_list: List[str]) -> List[Dict]:
+    """_esummary 的异步版本"""
+    cache = get_pubmed_cache()
+    found, missing = _split_cached("summary", id_list)
+
+    if missing:
+        async def _summarize():
+            await _ncbi_throttle_async()
+            handle = await get_async_eutils_transport().esummary(db="pubmed", id=missing)
+            return parse_esummary(handle)
+
+        for summary in await _retry_with_backoff_async(_summarize):
+            cache.set("summary", summary["pmid"], summary)
+            found[summary["pmid"]] = summary
+
+    return [found[pmid] for pmid in id_list if pmid in found]
+
+
+def _score_summary(summary: Dict) -> Optional[float]:
+    """
+    基于标题、出版日期、出版类型为文献打分
+
+    Returns:
+        分数（越高越可能包含 COI 线索），应淘汰时返回 None
+    """
+    pub_types = summary.get("pub_types", [])
+    if any(t in EXCLUDED_PUB_TYPES for t in pub_types):
+        return None
+
+    score = max([PUB_TYPE_WEIGHTS.get(t, 0.0) for t in pub_types] or [0.0])
+
+    if TITLE_COI_HINT.search(summary.get("title", "")):
+        score += 2.0
+
+    year_match = re.match(r'(\d{4})', summary.get("pub_date", ""))
+    if year_match:
+        age = time.localtime().tm_year - int(year_match.group(1))
+        if 0 <= age < RECENCY_WINDOW_YEARS:
+            score += 1.0 - age / RECENCY_WINDOW_YEARS
+
+    return score
+
+
+def _prefilter_by_summary(id_list: List[str], keep: int) -> Tuple[List[str], Dict]:
+    """
+    两阶段检索第一阶段：按 esummary 打分，只保留得分最高的 keep 篇
+
+    Returns:
+        (保留的 PMID 列表（保持原相关性顺序）, 预筛统计)
+    """
+    return _rank_summaries(id_list, _esummary(id_list), keep)
+
+
+async def _prefilter_by_summary_async(id_list: List[str], keep: int) -> Tuple[List[str], Dict]:
+    """_prefilter_by_summary 的异步版本"""
+    return _rank_summaries(id_list, await _esummary_async(id_list), keep)
+
+
+def _rank_summaries(id_list: List[str], summaries: List[Dict], keep: int) -> Tuple[List[str], Dict]:
+    """按 esummary 打分排序，保留得分最高的 keep 篇"""
+    scored = []
+    for rank, summary in enumerate(summaries):
+        score = _score_summary(summary)
+        if score is not None:
+            scored.append((score, -rank, summary["pmid"]))
+
+    scored.sort(reverse=True)
+    survivors = {pmid for _, _, pmid in scored[:keep]}
+    kept = [pmid for pmid in id_list if pmid in survivors]
+
+    return kept, {
+        "summaries": len(summaries),
+        "excluded_by_pub_type": len(summaries) - len(scored),
+        "survivors": len(kept)
+    }
+
+
+def _open_efetch(id_list: List[str]):
+    """打开 efetch XML 响应流（带重试）"""
+    def _open():
+        _ncbi_throttle()
+        return get_eutils_transport().efetch(
+            db="pubmed",
+            id=id_list,
+            rettype="abstract",
+            retmode="xml"
+        )
+
+    return _retry_with_backoff(_open)
+
+
+def _iter_articles(id_list: List[str]) -> Iterator[PubMedArticle]:
+    """
+    按 PMID 逐篇产出文献记录（带缓存 + 重试，流式解码）
+
+    已缓存的 PMID 直接复用，未命中的 PMID 合并为一次 efetch，
+    响应经 iterparse 逐篇解码，每篇文献在进程内只解析一次。
+
+    Yields:
+        按 id_list 顺序产出的 PubMedArticle
+    """
+    found, missing = _split_cached("article", id_list)
+    stream = _open_efetch(missing) if missing else None
+    yield from _merge_articles(id_list, found, stream)
+
+
+async def _fetch_articles_async(id_list: List[str]) -> List[PubMedArticle]:
+    """_iter_articles 的异步版本（efetch 响应整体下载后解码，返回按 id_list 排序的列表）"""
+    found, missing = _split_cached("article", id_list)
+
+    stream = None
+    if missing:
+        async def _open():
+            await _ncbi_throttle_async()
+            return await get_async_eutils_transport().efetch(
+                db="pubmed",
+                id=missing,
+                rettype="abstract",
+                retmode="xml"
+            )
+
+        stream = await _retry_with_backoff_async(_open)
+
+    return list(_merge_articles(id_list, found, stream))
+
+
+def _merge_articles(id_list: List[str], found: Dict, stream) -> Iterator[PubMedArticle]:
+    """合并缓存命中的文献与 efetch 解码流，按 id_list 顺序产出（新解码的文献写入缓存）"""
+    cache = get_pubmed_cache()
+    decoded = iter_efetch_articles(stream) if stream is not None else iter(())
+
+    try:
+        for pmid in id_list:
+            # 按需推进解码流，直到当前 PMID 就绪（efetch 未返回的 PMID 直接跳过）
+            while pmid not in found:
+                article = next(decoded, None)
+                if article is None:
+                    break
+                cache.set("article", article.pmid, article)
+                found[article.pmid] = article
+
+            article = found.pop(pmid, None)
+            if article is not None:
+                yield article
+    finally:
+        if stream is not None:
+            stream.close()
+
+
+def search_medical_db(
+    query: str,
+    source: str = 'pubmed',
+    max_results: int = 10,
+    filters: Optional[Dict] = None
+) -> str:
     """
     检索医疗数据库（PubMed 等）
 
@@ -72,10 +559,24 @@ def search_medical_db(query: str, source: str = 'pubmed', max_results: int = 10)
         query: 检索关键词
         source: 数据源（目前仅支持 'pubmed'）
         max_results: 最大返回结果数
+        filters: 结构化过滤器（见 build_pubmed_query）
 
     Returns:
         格式化的检索结果（标题 + 摘要）或错误信息
     """
+    return get_single_flight("medical").do(
+        _search_key("text", query, source, max_results, filters),
+        _search_medical_db, query, source, max_results, filters
+    )
+
+
+def _search_key(kind: str, query: str, source: str, max_results: int, filters: Optional[Dict]) -> Tuple:
+    """在途合并的 key（filters 按排序后的 JSON 序列化）"""
+    filters_key = json.dumps(filters, sort_keys=True, ensure_ascii=False, default=str) if filters else ""
+    return (kind, query, source.lower(), max_results, filters_key)
+
+
+def _search_medical_db(query: str, source: str, max_results: int, filters: Optional[Dict]) -> str:
     try:
         # 检查 Biopython 是否可用
         if not BIOPYTHON_AVAILABLE:
@@ -92,58 +593,24 @@ def search_medical_db(query: str, source: str = 'pubmed', max_results: int = 10)
 
         Entrez.email = email
 
-        # 执行检索（带重试）
-        def _search():
-            handle = Entrez.esearch(
-                db="pubmed",
-                term=query,
-                retmax=max_results,
-                sort="relevance"
-            )
-            results = Entrez.read(handle)
-            handle.close()
-            return results
-
-        search_results = _retry_with_backoff(_search)
-        id_list = search_results.get("IdList", [])
+        # 执行检索（带缓存 + 重试）
+        id_list = _esearch_ids(query, max_results, filters=filters)
 
         if not id_list:
             return f"医疗数据库检索结果为空: 关键词 '{query}' 未找到相关文献"
 
-        # 获取文章摘要（带重试）
-        def _fetch():
-            handle = Entrez.efetch(
-                db="pubmed",
-                id=id_list,
-                rettype="abstract",
-                retmode="xml"
-            )
-            articles = Entrez.read(handle)
-            handle.close()
-            return articles
-
-        articles = _retry_with_backoff(_fetch)
-
-        # 格式化输出
+        # 获取文章摘要（带缓存 + 重试，逐篇流式解码）
         results = []
-        for i, article in enumerate(articles['PubmedArticle'][:max_results], 1):
+        for i, article in enumerate(_iter_articles(id_list[:max_results]), 1):
             try:
-                medline = article['MedlineCitation']
-                pmid = str(medline['PMID'])
-                title = medline['Article'].get('ArticleTitle', '无标题')
-
-                # 提取摘要
-                abstract_parts = medline['Article'].get('Abstract', {}).get('AbstractText', [])
-                if abstract_parts:
-                    abstract = ' '.join(str(part) for part in abstract_parts)
-                else:
-                    abstract = '无摘要'
+                title = article.title or '无标题'
+                abstract = article.abstract or '无摘要'
 
                 # 截断摘要至 500 字符
                 if len(abstract) > 500:
                     abstract = abstract[:500] + '...'
 
-                results.append(f"[{i}] PMID: {pmid}\n标题: {title}\n摘要: {abstract}\n")
+                results.append(f"[{i}] PMID: {article.pmid}\n标题: {title}\n摘要: {abstract}\n")
 
             except Exception as e:
                 results.append(f"[{i}] 解析文章失败: {str(e)}\n")
@@ -154,13 +621,28 @@ def search_medical_db(query: str, source: str = 'pubmed', max_results: int = 10)
         return f"医疗数据库检索失败: {source} - {type(e).__name__}: {str(e)}"
 
 
-def search_medical_db_json(query: str, source: str = 'pubmed', max_results: int = 10) -> list:
+def search_medical_db_json(
+    query: str,
+    source: str = 'pubmed',
+    max_results: int = 10,
+    filters: Optional[Dict] = None
+) -> list:
     """
     检索医疗数据库，返回结构化 JSON 列表（每条文献为独立对象）
 
+    Args:
+        filters: 结构化过滤器（见 build_pubmed_query），在 NCBI 侧完成筛选
+
     Returns:
-        list of dicts with keys: pmid, title, abstract, url
+        list of dicts with keys: pmid, title, abstract, pub_date, affiliation, url
     """
+    return get_single_flight("medical").do(
+        _search_key("json", query, source, max_results, filters),
+        _search_medical_db_json, query, source, max_results, filters
+    )
+
+
+def _search_medical_db_json(query: str, source: str, max_results: int, filters: Optional[Dict]) -> list:
     if not BIOPYTHON_AVAILABLE:
         return []
 
@@ -174,66 +656,54 @@ def search_medical_db_json(query: str, source: str = 'pubmed', max_results: int
     try:
         Entrez.email = email
 
-        search_handle = Entrez.esearch(db="pubmed", term=query, retmax=max_results, sort="relevance")
-        search_results = Entrez.read(search_handle)
-        search_handle.close()
-
-        id_list = search_results.get("IdList", [])
+        id_list = _esearch_ids(query, max_results, filters=filters)
         if not id_list:
             return []
 
-        fetch_handle = Entrez.efetch(db="pubmed", id=id_list, rettype="abstract", retmode="xml")
-        articles = Entrez.read(fetch_handle)
-        fetch_handle.close()
+        return [article.to_dict() for article in _iter_articles(id_list[:max_results])]
 
-        results = []
-        for article in articles['PubmedArticle'][:max_results]:
-            try:
-                medline = article['MedlineCitation']
-                pmid = str(medline['PMID'])
-                title = str(medline['Article'].get('ArticleTitle', ''))
-
-                abstract_parts = medline['Article'].get('Abstract', {}).get('AbstractText', [])
-                abstract = ' '.join(str(p) for p in abstract_parts) if abstract_parts else ''
-
-                # 提取出版日期
-                pub_date = ''
-                try:
-                    pd = medline['Article']['Journal']['JournalIssue']['PubDate']
-                    year = str(pd.get('Year', ''))
-                    month = str(pd.get('Month', ''))
-                    day = str(pd.get('Day', ''))
-                    if year:
-                        pub_date = '-'.join(filter(None, [year, month.zfill(2) if month.isdigit() else month, day.zfill(2) if day.isdigit() else day]))
-                    elif 'MedlineDate' in pd:
-                        pub_date = str(pd['MedlineDate'])[:7]  # e.g. "2024 Jan-Feb" -> "2024 Ja"
-                except Exception:
-                    pass
-
-                # 提取第一作者机构（含国别信息）
-                affiliation = ''
-                try:
-                    authors = medline['Article'].get('AuthorList', [])
-                    for author in authors:
-                        aff_list = author.get('AffiliationInfo', [])
-                        if aff_list:
-                            affiliation = str(aff_list[0].get('Affiliation', ''))
-                            break
-                except Exception:
-                    pass
-
-                results.append({
-                    "pmid": pmid,
-                    "title": title,
-                    "abstract": abstract,
-                    "pub_date": pub_date,
-                    "affiliation": affiliation,
-                    "url": f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/"
-                })
-            except Exception:
-                continue
+    except Exception:
+        return []
 
-        return results
+
+async def search_medical_db_json_async(
+    query: str,
+    source: str = 'pubmed',
+    max_results: int = 10,
+    filters: Optional[Dict] = None
+) -> list:
+    """
+    search_medical_db_json 的异步版本（非阻塞 HTTP + asyncio 退避，返回结构一致）
+
+    Returns:
+        list of dicts with keys: pmid, title, abstract, pub_date, affiliation, url
+    """
+    return await get_single_flight("medical").do_async(
+        _search_key("json", query, source, max_results, filters),
+        _search_medical_db_json_async, query, source, max_results, filters
+    )
+
+
+async def _search_medical_db_json_async(query: str, source: str, max_results: int,
+                                        filters: Optional[Dict]) -> list:
+    if not BIOPYTHON_AVAILABLE:
+        return []
+
+    if source.lower() != 'pubmed':
+        return []
+
+    email = os.getenv("NCBI_EMAIL")
+    if not email:
+        return []
+
+    try:
+        Entrez.email = email
+
+        id_list = await _esearch_ids_async(query, max_results, filters=filters)
+        if not id_list:
+            return []
+
+        return [article.to_dict() for article in await _fetch_articles_async(id_list[:max_results])]
 
     except Exception:
         return []
@@ -251,7 +721,63 @@ if __name__ == "__main__":
 # Deep COI Parsing（深度利益冲突解析）
 # ============================================================================
 
-def extract_coi_from_pubmed(query: str, max_results: int = 20) -> Dict[str, any]:
+def analyze_article_coi(article: PubMedArticle) -> Optional[Dict]:
+    """
+    单篇文献的 COI 解析（在线检索与离线 baseline 批量挖掘共用）
+
+    单次扫描标题 + 摘要，提取专利号与企业授权 / 雇佣 / 持股信息，上下文按匹配偏移截取
+
+    Args:
+        article: PubMedArticle 记录
+
+    Returns:
+        {"pmid", "title", "url", "patents", "companies", "coi_score"}，无 COI 信息时返回 None
+    """
+    pmid = article.pmid
+    full_text = article.text
+
+    # 专利号与专利引擎使用同一套扫描规则；同一篇文献内同一专利的不同写法只保留首次出现
+    patents_found = []
+    seen_patents = set()
+    for pid, start, end in find_patent_ids(full_text):
+        if pid.key in seen_patents:
+            continue
+        seen_patents.add(pid.key)
+        patents_found.append({
+            "type": pid.office,
+            "number": re.sub(r'\s+', '', full_text[start:end]).upper(),  # 清理空格
+            "canonical_id": str(pid),
+            "context": context_window(full_text, start, end, 100)
+        })
+
+    companies_found = []
+    for match in COMPANY_EXTRACTOR.finditer(full_text):
+        companies_found.append({
+            "company": match.value.strip(),
+            "context": context_window(full_text, match.start, match.end, 100)
+        })
+
+    # 只保留有 COI 信息的文献
+    if not patents_found and not companies_found:
+        return None
+
+    return {
+        "pmid": pmid,
+        "title": article.title[:150],
+        "url": f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/",
+        "patents": patents_found,
+        "companies": companies_found,
+        "coi_score": len(patents_found) + len(companies_found)  # 简单评分
+    }
+
+
+def extract_coi_from_pubmed(
+    query: str,
+    max_results: int = 20,
+    two_phase: bool = False,
+    prefilter_keep: Optional[int] = None,
+    filters: Optional[Dict] = None
+) -> Dict[str, any]:
     """
     深度解析 PubMed 文献中的利益冲突声明（Conflicts of Interest）
 
@@ -261,9 +787,16 @@ def extract_coi_from_pubmed(query: str, max_results: int = 20) -> Dict[str, any]
     3. 使用正则匹配提取专利号、企业授权、Startup 项目
     4. 当 general_web_search 返回空时，强制触发此模式
 
+    两阶段模式（two_phase=True）：
+    先取全部候选的 esummary，按标题 / 日期 / 出版类型打分预筛，
+    只对得分最高的 prefilter_keep 篇 efetch 完整摘要
+
     Args:
         query: 搜索关键词（药物名称、靶点等）
         max_results: 最大文献数
+        two_phase: 是否启用 esummary 预筛
+        prefilter_keep: 预筛保留篇数（默认 max_results 的一半，至少 5 篇）
+        filters: 结构化过滤器（见 build_pubmed_query），如 VALIDATOR_FILTERS
 
     Returns:
         包含 COI 信息的字典
@@ -286,17 +819,8 @@ def extract_coi_from_pubmed(query: str, max_results: int = 20) -> Dict[str, any]
     try:
         Entrez.email = email
 
-        # 搜索文献
-        search_handle = Entrez.esearch(
-            db="pubmed",
-            term=query,
-            retmax=max_results,
-            sort="relevance"
-        )
-        search_results = Entrez.read(search_handle)
-        search_handle.close()
-
-        id_list = search_results.get("IdList", [])
+        # 搜索文献（带缓存 + 重试，过滤条件下推到 esearch）
+        id_list = _esearch_ids(query, max_results, filters=filters)
         if not id_list:
             return {
                 "status": "no_results",
@@ -304,127 +828,115 @@ def extract_coi_from_pubmed(query: str, max_results: int = 20) -> Dict[str, any]
                 "coi_findings": []
             }
 
-        # 获取文章详细信息
-        fetch_handle = Entrez.efetch(
-            db="pubmed",
-            id=id_list,
-            rettype="abstract",
-            retmode="xml"
-        )
-        articles = Entrez.read(fetch_handle)
-        fetch_handle.close()
-
-        # 专利号正则表达式
-        patent_patterns = {
-            'WO': r'\b(WO\s?/?\s?\d{4}\s?/?\s?\d{6})\b',  # WO/2024/123456 or WO2024123456
-            'US': r'\b(US\s?\d{7,13}[A-Z]\d?)\b',          # US20240182490A1 (支持 7-13 位数字)
-            'CN': r'\b(CN\s?\d{9}[A-Z])\b',                # CN114269365A
-            'JP': r'\b(JP\s?\d{7,10}[A-Z]?)\b',            # JP2023123456A
-            'EP': r'\b(EP\s?\d{7}[A-Z]\d?)\b',             # EP1234567A1
-        }
-
-        # 企业授权关键词
-        company_keywords = [
-            r'licensed\s+to\s+(\w+(?:\s+\w+){0,3})',
-            r'sponsored\s+by\s+(\w+(?:\s+\w+){0,3})',
-            r'funded\s+by\s+(\w+(?:\s+\w+){0,3})',
-            r'collaboration\s+with\s+(\w+(?:\s+\w+){0,3})',
-            r'employee\s+of\s+(\w+(?:\s+\w+){0,3})',
-            r'consultant\s+for\s+(\w+(?:\s+\w+){0,3})',
-            r'stock\s+in\s+(\w+(?:\s+\w+){0,3})',
-            r'equity\s+in\s+(\w+(?:\s+\w+){0,3})',
-        ]
+        # 两阶段模式：esummary 预筛，只 efetch 幸存文献
+        id_list = id_list[:max_results]
+        prefilter_stats = None
+        if two_phase:
+            keep = prefilter_keep if prefilter_keep is not None else max(5, max_results // 2)
+            id_list, prefilter_stats = _prefilter_by_summary(id_list, keep)
 
         coi_findings = []
+        articles_searched = 0
 
-        for article in articles['PubmedArticle'][:max_results]:
+        # 获取文章详细信息（带缓存 + 重试，逐篇流式解码）
+        for article in _iter_articles(id_list):
+            articles_searched += 1
             try:
-                medline = article['MedlineCitation']
-                pmid = str(medline['PMID'])
-                title = str(medline['Article'].get('ArticleTitle', ''))
-
-                # 提取摘要
-                abstract_parts = medline['Article'].get('Abstract', {}).get('AbstractText', [])
-                abstract = ' '.join(str(p) for p in abstract_parts) if abstract_parts else ''
-
-                # 合并文本用于 COI 分析
-                full_text = f"{title} {abstract}"
-
-                # 提取专利号
-                patents_found = []
-                for patent_type, pattern in patent_patterns.items():
-                    matches = re.findall(pattern, full_text, re.IGNORECASE)
-                    for match in matches:
-                        # 清理空格
-                        clean_patent = re.sub(r'\s+', '', match).upper()
-                        patents_found.append({
-                            "type": patent_type,
-                            "number": clean_patent,
-                            "context": _extract_context_coi(full_text, match)
-                        })
-
-                # 提取企业授权信息
-                companies_found = []
-                for pattern in company_keywords:
-                    matches = re.findall(pattern, full_text, re.IGNORECASE)
-                    for match in matches:
-                        companies_found.append({
-                            "company": match.strip(),
-                            "context": _extract_context_coi(full_text, match)
-                        })
-
-                # 只保存有 COI 信息的文献
-                if patents_found or companies_found:
-                    coi_findings.append({
-                        "pmid": pmid,
-                        "title": title[:150],
-                        "url": f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/",
-                        "patents": patents_found,
-                        "companies": companies_found,
-                        "coi_score": len(patents_found) + len(companies_found)  # 简单评分
-                    })
-
+                finding = analyze_article_coi(article)
+                if finding is not None:
+                    coi_findings.append(finding)
             except Exception as e:
                 continue
 
-        # 按 COI 分数排序
-        coi_findings.sort(key=lambda x: x['coi_score'], reverse=True)
+        return _coi_result(query, articles_searched, coi_findings, prefilter_stats)
 
+    except Exception as e:
         return {
-            "status": "success",
-            "query": query,
-            "articles_searched": len(articles['PubmedArticle']),
-            "coi_findings_count": len(coi_findings),
-            "coi_findings": coi_findings
+            "status": "error",
+            "error": f"{type(e).__name__}: {str(e)}",
+            "coi_findings": []
         }
 
-    except Exception as e:
+
+async def extract_coi_from_pubmed_async(
+    query: str,
+    max_results: int = 20,
+    two_phase: bool = False,
+    prefilter_keep: Optional[int] = None,
+    filters: Optional[Dict] = None
+) -> Dict[str, any]:
+    """
+    extract_coi_from_pubmed 的异步版本（参数与返回结构一致）
+
+    esearch / esummary / efetch 经 asyncio 连接池发出，限流等待与重试退避均不阻塞事件循环
+    """
+    if not BIOPYTHON_AVAILABLE:
         return {
             "status": "error",
-            "error": f"{type(e).__name__}: {str(e)}",
+            "error": "Biopython not available",
             "coi_findings": []
         }
 
+    email = os.getenv("NCBI_EMAIL")
+    if not email:
+        return {
+            "status": "error",
+            "error": "NCBI_EMAIL not set",
+            "coi_findings": []
+        }
 
-def _extract_context_coi(text: str, keyword: str, context_chars: int = 100) -> str:
-    """提取关键词周围的上下文"""
     try:
-        idx = text.upper().find(keyword.upper())
-        if idx == -1:
-            return ""
+        Entrez.email = email
 
-        start = max(0, idx - context_chars)
-        end = min(len(text), idx + len(keyword) + context_chars)
+        id_list = await _esearch_ids_async(query, max_results, filters=filters)
+        if not id_list:
+            return {
+                "status": "no_results",
+                "message": f"未找到与 '{query}' 相关的文献",
+                "coi_findings": []
+            }
 
-        context = text[start:end]
-        if start > 0:
-            context = "..." + context
-        if end < len(text):
-            context = context + "..."
+        id_list = id_list[:max_results]
+        prefilter_stats = None
+        if two_phase:
+            keep = prefilter_keep if prefilter_keep is not None else max(5, max_results // 2)
+            id_list, prefilter_stats = await _prefilter_by_summary_async(id_list, keep)
 
-        return context.strip()
-    except:
-        return ""
+        articles = await _fetch_articles_async(id_list)
+        coi_findings = []
+        for article in articles:
+            try:
+                finding = analyze_article_coi(article)
+                if finding is not None:
+                    coi_findings.append(finding)
+            except Exception:
+                continue
+
+        return _coi_result(query, len(articles), coi_findings, prefilter_stats)
+
+    except Exception as e:
+        return {
+            "status": "error",
+            "error": f"{type(e).__name__}: {str(e)}",
+            "coi_findings": []
+        }
+
+
+def _coi_result(query: str, articles_searched: int, coi_findings: List[Dict],
+                prefilter_stats: Optional[Dict]) -> Dict[str, any]:
+    """按 COI 分数排序并组装 extract_coi_from_pubmed 的返回结构"""
+    coi_findings.sort(key=lambda x: x['coi_score'], reverse=True)
+
+    result = {
+        "status": "success",
+        "query": query,
+        "articles_searched": articles_searched,
+        "coi_findings_count": len(coi_findings),
+        "coi_findings": coi_findings
+    }
+    if prefilter_stats is not None:
+        result["prefilter"] = prefilter_stats
+    return result
 
 
 def search_with_coi_fallback(query: str, max_results: int = 20) -> str:
@@ -503,3 +1015,257 @@ def search_with_coi_fallback(query: str, max_results: int = 20) -> str:
     output.append("3. 访问全文获取完整的 Conflicts of Interest 声明")
 
     return "\n".join(output)
+
+
+# ============================================================================
+# 大规模分页检索（Entrez History Server）
+# ============================================================================
+
+def _esearch_history(query: str, sort: str = "relevance", filters: Optional[Dict] = None) -> Tuple[int, str, str]:
+    """
+    执行 usehistory esearch，将结果集保存在 NCBI History Server（带重试）
+
+    Returns:
+        (命中总数, WebEnv, query_key)
+    """
+    term, params = build_pubmed_query(query, filters)
+
+    def _search():
+        _ncbi_throttle()
+        handle = get_eutils_transport().esearch(
+            db="pubmed",
+            term=term,
+            retmax=0,
+            sort=sort,
+            usehistory="y",
+            **params
+        )
+        results = Entrez.read(handle)
+        handle.close()
+        return results
+
+    results = _retry_with_backoff(_search)
+    return int(results.get("Count", 0)), str(results["WebEnv"]), str(results["QueryKey"])
+
+
+def _fetch_history_page(webenv: str, query_key: str, retstart: int, retmax: int) -> List[PubMedArticle]:
+    """
+    从 History Server 拉取一页文献（整页重试，页内流式解码）
+
+    单页失败时只重试该页；页大小有上限，因此整页物化不会影响内存稳定性。
+    """
+    def _fetch():
+        _ncbi_throttle()
+        handle = get_eutils_transport().efetch(
+            db="pubmed",
+            webenv=webenv,
+            query_key=query_key,
+            retstart=retstart,
+            retmax=retmax,
+            rettype="abstract",
+            retmode="xml"
+        )
+        try:
+            return list(iter_efetch_articles(handle))
+        finally:
+            handle.close()
+
+    return _retry_with_backoff(_fetch)
+
+
+def _fetch_history_ids(webenv: str, query_key: str, retstart: int, retmax: int) -> List[str]:
+    """从 History Server 拉取一页 PMID（efetch rettype=uilist，整页重试）"""
+    def _fetch():
+        _ncbi_throttle()
+        handle = get_eutils_transport().efetch(
+            db="pubmed",
+            webenv=webenv,
+            query_key=query_key,
+            retstart=retstart,
+            retmax=retmax,
+            rettype="uilist",
+            retmode="text"
+        )
+        try:
+            data = handle.read()
+        finally:
+            handle.close()
+        if isinstance(data, bytes):
+            data = data.decode("utf-8", errors="replace")
+        return [line.strip() for line in data.splitlines() if line.strip().isdigit()]
+
+    return _retry_with_backoff(_fetch)
+
+
+def iter_pubmed_articles(
+    query: str,
+    max_results: Optional[int] = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    sort: str = "relevance",
+    retstart: int = 0,
+    filters: Optional[Dict] = None
+) -> Iterator[PubMedArticle]:
+    """
+    大规模分页检索 PubMed（生成器 API，适用于数千篇文献的全景扫描）
+
+    策略：
+    1. esearch usehistory=y 只获取 WebEnv/query_key，不传输 PMID 列表
+    2. 按 page_size 分页 efetch，每页到达后立即逐篇产出
+    3. 每页独立走 _retry_with_backoff，失败页单独重试
+
+    Args:
+        query: 检索关键词
+        max_results: 最大文献数（None 表示取全部命中）
+        page_size: 每页 efetch 的文献数
+        sort: 排序方式
+        retstart: 起始偏移（用于中断后续扫）
+        filters: 结构化过滤器（见 build_pubmed_query）
+
+    Yields:
+        PubMedArticle
+
+    Raises:
+        某页重试耗尽后抛出最后一次异常（已产出的文献不受影响，可用 retstart 续扫）
+    """
+    if not BIOPYTHON_AVAILABLE:
+        return
+
+    email = os.getenv("NCBI_EMAIL")
+    if not email:
+        return
+
+    Entrez.email = email
+    page_size = max(1, int(page_size))
+
+    count, webenv, query_key = _esearch_history(query, sort, filters)
+    end = count if max_results is None else min(count, retstart + max_results)
+
+    cache = get_pubmed_cache()
+    offset = retstart
+    while offset < end:
+        retmax = min(page_size, end - offset)
+        page = _fetch_history_page(webenv, query_key, offset, retmax)
+
+        for article in page:
+            cache.set("article", article.pmid, article)
+            yield article
+
+        if not page:
+            break
+        offset += retmax
+
+
+# ============================================================================
+# 增量抓取（Delta Crawl）
+# ============================================================================
+
+def search_medical_db_delta(
+    query: str,
+    max_results: Optional[int] = 100,
+    filters: Optional[Dict] = None,
+    overlap_days: int = DELTA_OVERLAP_DAYS,
+    commit: bool = True
+) -> Dict[str, any]:
+    """
+    增量检索：只返回上次运行以来新出现的文献
+
+    策略：
+    1. 按检索式 + 过滤器读取水位线（上次运行日期 + 已见 PMID + 待处理队列）
+    2. 以"上次运行日期 - overlap_days"为下限按入库日期（edat）检索，
+       usehistory 结果集按日期排序，分页读完全部 PMID（不走 esearch 缓存，避免 24 小时内看不到新文献）
+    3. 待处理队列 + 未见过的 PMID 按 DEFAULT_PAGE_SIZE 分页 efetch（最多 max_results 篇）
+    4. commit=True 时更新水位线：日期推进到本次运行，超出 max_results 的 PMID 留在待处理队列
+       （首次运行相当于全量检索并建立水位线，之后的运行始终带日期下限）
+
+    Args:
+        query: 检索关键词
+        max_results: 单次最多处理的新文献数（None 表示不限）
+        filters: 结构化过滤器（见 build_pubmed_query）
+        overlap_days: 日期下限向前重叠的天数
+        commit: 是否更新水位线（下游处理失败时可传 False 以便重跑）
+
+    Returns:
+        {"status", "query", "since", "candidates", "new_count", "pending", "truncated", "articles"}
+    """
+    if not BIOPYTHON_AVAILABLE:
+        return {"status": "error", "error": "Biopython not available", "articles": []}
+
+    email = os.getenv("NCBI_EMAIL")
+    if not email:
+        return {"status": "error", "error": "NCBI_EMAIL not set", "articles": []}
+
+    try:
+        Entrez.email = email
+
+        term, params = build_pubmed_query(query, filters)
+        key = watermark_key(term, params)
+        watermark = load_watermark(key) or {}
+        seen = watermark.get("seen_pmids", set())
+        seen_floor = watermark.get("seen_floor", 0)
+
+        since = None
+        delta_filters = dict(filters or {})
+        if watermark.get("last_run"):
+            last_run = time.mktime(time.strptime(watermark["last_run"], "%Y/%m/%d"))
+            since = time.strftime("%Y/%m/%d", time.localtime(last_run - overlap_days * 86400))
+            if "mindate" in params:
+                # 过滤器已占用 mindate/maxdate（出版日期窗口），入库日期下限改用检索式子句
+                delta_query = f'({query}) AND ("{since}"[edat] : "3000"[edat])'
+            else:
+                delta_query = query
+                delta_filters.update({"mindate": since, "maxdate": "3000/12/31", "datetype": "edat"})
+        else:
+            delta_query = query
+
+        # 上次未处理完的 PMID 排在最前
+        new_ids = [pmid for pmid in watermark.get("pending_pmids", []) if pmid not in seen]
+        new_set = set(new_ids)
+
+        # 按日期排序（最新在前）分页读完全部候选 PMID
+        count, webenv, query_key = _esearch_history(delta_query, "pub_date", delta_filters or None)
+        candidates = 0
+        offset = 0
+        while offset < count:
+            page = _fetch_history_ids(webenv, query_key, offset, min(DELTA_ID_PAGE_SIZE, count - offset))
+            if not page:
+                break
+            candidates += len(page)
+            for pmid in page:
+                if pmid in seen or pmid in new_set or (pmid.isdigit() and int(pmid) <= seen_floor):
+                    continue
+                new_ids.append(pmid)
+                new_set.add(pmid)
+            offset += len(page)
+
+        limit = len(new_ids) if max_results is None else max(0, max_results)
+        batch, pending = new_ids[:limit], new_ids[limit:]
+
+        articles = []
+        for start in range(0, len(batch), DEFAULT_PAGE_SIZE):
+            articles.extend(article.to_dict() for article in _iter_articles(batch[start:start + DEFAULT_PAGE_SIZE]))
+
+        if commit:
+            save_watermark(
+                key, term, seen | set(batch),
+                runs=watermark.get("runs", 0) + 1,
+                pending_pmids=pending,
+                seen_floor=seen_floor
+            )
+
+        return {
+            "status": "success",
+            "query": query,
+            "since": since,
+            "candidates": candidates,
+            "new_count": len(articles),
+            "pending": len(pending),
+            "truncated": bool(pending),
+            "articles": articles
+        }
+
+    except Exception as e:
+        return {
+            "status": "error",
+            "error": f"{type(e).__name__}: {str(e)}",
+            "articles": []
+        }
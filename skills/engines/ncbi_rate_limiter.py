@@ -0,0 +1,194 @@
+"""
+L1 引擎层：NCBI E-utilities 进程级限流器（令牌桶）
+所有 Entrez 调用在发出请求前先获取令牌，避免并发调查任务触发 429
+
+限额（NCBI 官方策略）：
+- 未配置 API Key: 3 次/秒
+- 配置 NCBI_API_KEY: 10 次/秒
+
+跨进程协调：
+- 令牌桶状态保存在本地状态文件中，通过 fcntl.flock 串行化读写
+- 同一台机器上的所有 Investigator 进程共享同一个桶
+- 不支持 fcntl 的平台退化为进程内限流
+
+环境变量：
+- NCBI_API_KEY: NCBI API Key（决定限额）
+- NCBI_MAX_RPS: 手动覆盖每秒请求数上限
+- NCBI_RATE_LIMIT_FILE: 令牌桶状态文件路径（默认系统临时目录）
+"""
+
+import os
+import time
+import asyncio
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+
+# NCBI 限额
+RPS_WITHOUT_API_KEY = 3
+RPS_WITH_API_KEY = 10
+
+DEFAULT_STATE_FILE = Path(tempfile.gettempdir()) / "lingnexus_ncbi_ratelimit.state"
+
+
+class NCBIRateLimiter:
+    """令牌桶限流器（支持跨进程共享）"""
+
+    def __init__(self, rate_per_s: float, burst: float = 1.0, state_file: Optional[Path] = None):
+        """
+        Args:
+            rate_per_s: 每秒补充的令牌数
+            burst: 桶容量（允许的瞬时突发请求数）
+            state_file: 跨进程共享的状态文件，None 表示仅进程内限流
+        """
+        self.rate_per_s = float(rate_per_s)
+        self.burst = float(burst)
+        self.state_file = Path(state_file) if state_file and FCNTL_AVAILABLE else None
+
+        self._lock = threading.Lock()
+        self._tokens = self.burst
+        self._updated_at = time.time()
+        self._stats = {
+            "acquired": 0,
+            "throttled": 0,
+            "total_wait_s": 0.0,
+            "max_wait_s": 0.0,
+        }
+
+    def acquire(self) -> float:
+        """
+        获取一个令牌，必要时阻塞等待
+
+        令牌先预订后等待：预订在锁内完成，睡眠在锁外进行，
+        因此并发调用者会按预订顺序依次放行。
+
+        Returns:
+            本次等待的秒数
+        """
+        wait_s = self._reserve()
+        if wait_s > 0:
+            time.sleep(wait_s)
+        return wait_s
+
+    async def acquire_async(self) -> float:
+        """
+        异步获取一个令牌：预订与同步版本共用同一个桶，等待改为 asyncio.sleep，不阻塞事件循环
+
+        Returns:
+            本次等待的秒数
+        """
+        wait_s = self._reserve()
+        if wait_s > 0:
+            await asyncio.sleep(wait_s)
+        return wait_s
+
+    def stats(self) -> Dict[str, Any]:
+        """返回限流等待指标"""
+        with self._lock:
+            stats = dict(self._stats)
+        stats["rate_per_s"] = self.rate_per_s
+        stats["shared"] = self.state_file is not None
+        stats["total_wait_s"] = round(stats["total_wait_s"], 3)
+        stats["max_wait_s"] = round(stats["max_wait_s"], 3)
+        stats["avg_wait_s"] = round(stats["total_wait_s"] / stats["acquired"], 4) if stats["acquired"] else 0.0
+        return stats
+
+    # ------------------------------------------------------------------
+    # 内部实现
+    # ------------------------------------------------------------------
+
+    def _reserve(self) -> float:
+        """预订一个令牌（锁内完成，不睡眠），返回需等待的秒数"""
+        with self._lock:
+            if self.state_file is not None:
+                try:
+                    wait_s = self._reserve_shared()
+                except OSError:
+                    wait_s = self._reserve_local()
+            else:
+                wait_s = self._reserve_local()
+
+            self._stats["acquired"] += 1
+            if wait_s > 0:
+                self._stats["throttled"] += 1
+                self._stats["total_wait_s"] += wait_s
+                self._stats["max_wait_s"] = max(self._stats["max_wait_s"], wait_s)
+        return wait_s
+
+    def _refill(self, tokens: float, updated_at: float, now: float) -> float:
+        return min(self.burst, tokens + (now - updated_at) * self.rate_per_s)
+
+    def _consume(self, tokens: float) -> Tuple[float, float]:
+        """消耗一个令牌（允许透支），返回 (剩余令牌, 需等待秒数)"""
+        tokens -= 1.0
+        wait_s = -tokens / self.rate_per_s if tokens < 0 else 0.0
+        return tokens, wait_s
+
+    def _reserve_local(self) -> float:
+        now = time.time()
+        tokens = self._refill(self._tokens, self._updated_at, now)
+        self._tokens, wait_s = self._consume(tokens)
+        self._updated_at = now
+        return wait_s
+
+    def _reserve_shared(self) -> float:
+        """在文件锁保护下读取、更新共享令牌桶"""
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(str(self.state_file), os.O_RDWR | os.O_CREAT, 0o666)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            raw = os.read(fd, 128).decode("ascii", "ignore").split()
+            now = time.time()
+            try:
+                tokens, updated_at = float(raw[0]), float(raw[1])
+            except (IndexError, ValueError):
+                tokens, updated_at = self.burst, now
+
+            tokens = self._refill(tokens, updated_at, now)
+            tokens, wait_s = self._consume(tokens)
+
+            os.lseek(fd, 0, os.SEEK_SET)
+            os.ftruncate(fd, 0)
+            os.write(fd, f"{tokens:.6f} {now:.6f}".encode("ascii"))
+            return wait_s
+        finally:
+            os.close(fd)  # 关闭文件描述符同时释放 flock
+
+
+def get_ncbi_rate_limit() -> float:
+    """根据环境变量确定每秒请求数上限"""
+    override = os.getenv("NCBI_MAX_RPS")
+    if override:
+        try:
+            return max(0.1, float(override))
+        except ValueError:
+            pass
+    return RPS_WITH_API_KEY if os.getenv("NCBI_API_KEY") else RPS_WITHOUT_API_KEY
+
+
+_LIMITER: Optional[NCBIRateLimiter] = None
+_LIMITER_LOCK = threading.Lock()
+
+
+def get_ncbi_rate_limiter() -> NCBIRateLimiter:
+    """获取进程级共享限流器"""
+    global _LIMITER
+    with _LIMITER_LOCK:
+        if _LIMITER is None:
+            _LIMITER = NCBIRateLimiter(
+                rate_per_s=get_ncbi_rate_limit(),
+                state_file=Path(os.getenv("NCBI_RATE_LIMIT_FILE", str(DEFAULT_STATE_FILE)))
+            )
+        return _LIMITER
+
+
+def get_ncbi_rate_limiter_stats() -> Dict[str, Any]:
+    """返回限流等待指标（用于观察是否被限流）"""
+    return get_ncbi_rate_limiter().stats()
@@ -0,0 +1,408 @@
+"""
+L1 引擎层：网页内容缓存（内容寻址 + 压缩存储）
+browser_engine 抓取到的 HTML 与清洗后文本按规范化 URL 索引，重复查询专利页面只需一次磁盘读取
+
+存储结构：
+- index/<xx>/<sha1(规范化 URL)>.json: 索引条目（抓取时间、ETag / Last-Modified、内容摘要）
+- blobs/<xx>/<sha256(内容)>.gz: gzip 压缩的内容块，相同内容只保存一份（不同 URL 共享）
+
+策略：
+- 分域名 TTL：专利详情页（/patent/<id>）几乎不变，默认保存 30 天；其他站点默认 1 天
+- 带查询参数的 URL（检索结果页，如 ?q=）随新文献入库而变化，有效期不超过 PAGE_CACHE_QUERY_TTL_S
+- 过期条目不立即删除：静态快速路径用其 ETag / Last-Modified 发送条件请求，304 时直接续期
+- 容量淘汰：总字节数超过上限时按最久未访问顺序删除索引条目，并回收不再被引用的内容块
+- 安全策略：缓存读写失败只记为未命中，绝不影响抓取主流程
+
+环境变量：
+- PAGE_CACHE_DIR: 缓存目录（默认 ~/.cache/lingnexus/pages）
+- PAGE_CACHE_TTL_S: 默认有效期（秒，默认 86400；<=0 表示禁用缓存）
+- PAGE_CACHE_DOMAIN_TTLS: 分域名有效期覆盖，如 "patents.google.com=2592000,example.com=3600"
+- PAGE_CACHE_QUERY_TTL_S: 带查询参数 URL 的有效期上限（秒，默认 3600；<=0 表示不缓存检索结果页）
+- PAGE_CACHE_MAX_MB: 磁盘缓存上限（MB，默认 256）
+"""
+
+import os
+import gzip
+import json
+import time
+import hashlib
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "lingnexus" / "pages"
+DEFAULT_TTL_S = 86400
+DEFAULT_QUERY_TTL_S = 3600
+DEFAULT_MAX_DISK_MB = 256
+
+# 分域名默认有效期（匹配主机名本身及其子域名）
+DEFAULT_DOMAIN_TTLS = {
+    "patents.google.com": 30 * 86400,
+    "worldwide.espacenet.com": 30 * 86400,
+}
+
+# 磁盘淘汰时清理到上限的比例，避免每次写入都触发扫描
+EVICT_LOW_WATERMARK = 0.9
+
+# 规范化时去除的跟踪参数
+_TRACKING_PARAMS = ("utm_", "fbclid", "gclid")
+
+
+def _env_int(name: str, default: int) -> int:
+    """读取整数环境变量，非法值回退到默认值"""
+    try:
+        return int(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def _parse_domain_ttls(raw: str) -> Dict[str, int]:
+    """解析 "host=seconds,host=seconds" 格式的分域名有效期"""
+    ttls = {}
+    for item in raw.split(","):
+        host, _, seconds = item.partition("=")
+        try:
+            ttls[host.strip().lower()] = int(seconds)
+        except ValueError:
+            continue
+    return ttls
+
+
+def normalize_url(url: str) -> str:
+    """
+    规范化 URL 作为缓存键
+
+    协议与主机名小写、去除默认端口与片段、去除跟踪参数、查询参数排序
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and not ((scheme == "http" and parts.port == 80) or (scheme == "https" and parts.port == 443)):
+        host = f"{host}:{parts.port}"
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith(_TRACKING_PARAMS)
+    )
+    return urlunsplit((scheme, host, parts.path or "/", urlencode(query), ""))
+
+
+class CachedPage:
+    """缓存的网页（HTML 按需通过 PageCache.read_html 读取）"""
+
+    __slots__ = ("url", "text", "html_sha", "etag", "last_modified", "fetched_at", "ttl_s")
+
+    def __init__(self, url: str, text: str, html_sha: Optional[str], etag: Optional[str],
+                 last_modified: Optional[str], fetched_at: float, ttl_s: int):
+        self.url = url
+        self.text = text
+        self.html_sha = html_sha
+        self.etag = etag
+        self.last_modified = last_modified
+        self.fetched_at = fetched_at
+        self.ttl_s = ttl_s
+
+    @property
+    def fresh(self) -> bool:
+        return time.time() - self.fetched_at < self.ttl_s
+
+    @property
+    def revalidatable(self) -> bool:
+        return bool(self.etag or self.last_modified)
+
+
+class PageCache:
+    """网页内容缓存（内容寻址的压缩块 + URL 索引）"""
+
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        default_ttl_s: int = DEFAULT_TTL_S,
+        domain_ttls: Optional[Dict[str, int]] = None,
+        max_disk_bytes: int = DEFAULT_MAX_DISK_MB * 1024 * 1024,
+        query_ttl_s: int = DEFAULT_QUERY_TTL_S
+    ):
+        self.cache_dir = Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR
+        self.default_ttl_s = default_ttl_s
+        self.domain_ttls = dict(DEFAULT_DOMAIN_TTLS if domain_ttls is None else domain_ttls)
+        self.max_disk_bytes = max_disk_bytes
+        self.query_ttl_s = query_ttl_s
+
+        self._lock = threading.Lock()
+        self._disk_bytes: Optional[int] = None  # 首次写入时扫描得到
+        self._stats = {
+            "hits": 0,
+            "stale_hits": 0,
+            "misses": 0,
+            "revalidated": 0,
+            "writes": 0,
+            "deduplicated": 0,
+            "evictions": 0,
+        }
+
+    @property
+    def enabled(self) -> bool:
+        return self.default_ttl_s > 0
+
+    def ttl_for(self, url: str) -> int:
+        """按主机名匹配有效期（最长后缀优先）；带查询参数的 URL 不超过 query_ttl_s"""
+        parts = urlsplit(url)
+        host = (parts.hostname or "").lower()
+        best, best_len = self.default_ttl_s, -1
+        for domain, ttl in self.domain_ttls.items():
+            if (host == domain or host.endswith("." + domain)) and len(domain) > best_len:
+                best, best_len = ttl, len(domain)
+        if parts.query:
+            best = min(best, self.query_ttl_s)
+        return best
+
+    def lookup(self, url: str) -> Optional[CachedPage]:
+        """
+        读取缓存条目（过期条目同样返回，由调用方决定重新验证或重新抓取）
+
+        Returns:
+            CachedPage，未缓存或读取失败时返回 None
+        """
+        if not self.enabled:
+            return None
+
+        key = normalize_url(url)
+        path = self._index_path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            text = self._read_blob(entry["text_sha"])
+            os.utime(path, None)  # 刷新访问时间，供 LRU 淘汰使用
+        except Exception:
+            with self._lock:
+                self._stats["misses"] += 1
+            return None
+
+        page = CachedPage(key, text, entry.get("html_sha"), entry.get("etag"), entry.get("last_modified"),
+                          float(entry["fetched_at"]), self.ttl_for(key))
+        with self._lock:
+            self._stats["hits" if page.fresh else "stale_hits"] += 1
+        return page
+
+    def read_html(self, page: CachedPage) -> Optional[str]:
+        """读取条目对应的原始 HTML（未保存或已被淘汰时返回 None）"""
+        if not page.html_sha:
+            return None
+        try:
+            return self._read_blob(page.html_sha)
+        except Exception:
+            return None
+
+    def store(self, url: str, text: str, html: Optional[str] = None,
+              etag: Optional[str] = None, last_modified: Optional[str] = None) -> None:
+        """写入（或覆盖）URL 对应的缓存条目（有效期 <=0 的 URL 不写入）"""
+        if not self.enabled:
+            return
+
+        key = normalize_url(url)
+        if self.ttl_for(key) <= 0:
+            return
+        try:
+            written = 0
+            text_sha, size = self._write_blob(text)
+            written += size
+            html_sha = None
+            if html:
+                html_sha, size = self._write_blob(html)
+                written += size
+            written += self._write_index(key, {
+                "url": key,
+                "fetched_at": time.time(),
+                "etag": etag,
+                "last_modified": last_modified,
+                "text_sha": text_sha,
+                "html_sha": html_sha,
+            })
+        except Exception:
+            return
+
+        with self._lock:
+            self._stats["writes"] += 1
+            if self._disk_bytes is None:
+                self._disk_bytes = self._scan_disk_bytes()
+            else:
+                self._disk_bytes += written
+            over_limit = self._disk_bytes > self.max_disk_bytes
+
+        if over_limit:
+            self._evict_disk()
+
+    def touch(self, url: str) -> None:
+        """条件请求返回 304 后续期条目"""
+        if not self.enabled:
+            return
+
+        key = normalize_url(url)
+        path = self._index_path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            entry["fetched_at"] = time.time()
+            self._write_index(key, entry)
+        except Exception:
+            return
+
+        with self._lock:
+            self._stats["revalidated"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """返回命中/未命中计数及当前容量"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["disk_bytes"] = self._disk_bytes
+        lookups = stats["hits"] + stats["stale_hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+        return stats
+
+    def clear(self) -> None:
+        """清空磁盘缓存"""
+        with self._lock:
+            self._disk_bytes = 0
+        for path in self._iter_files("index") + self._iter_files("blobs"):
+            self._remove_file(path)
+
+    # ------------------------------------------------------------------
+    # 内部实现
+    # ------------------------------------------------------------------
+
+    def _index_path(self, key: str) -> Path:
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return self.cache_dir / "index" / digest[:2] / f"{digest}.json"
+
+    def _blob_path(self, sha: str) -> Path:
+        return self.cache_dir / "blobs" / sha[:2] / f"{sha}.gz"
+
+    def _read_blob(self, sha: str) -> str:
+        with open(self._blob_path(sha), "rb") as f:
+            return gzip.decompress(f.read()).decode("utf-8")
+
+    def _write_blob(self, content: str) -> Tuple[str, int]:
+        """写入内容块，已存在时跳过；返回 (sha256, 新增字节数)"""
+        raw = content.encode("utf-8")
+        sha = hashlib.sha256(raw).hexdigest()
+        path = self._blob_path(sha)
+        if path.exists():
+            os.utime(path, None)
+            with self._lock:
+                self._stats["deduplicated"] += 1
+            return sha, 0
+        return sha, self._atomic_write(path, gzip.compress(raw, compresslevel=6))
+
+    def _write_index(self, key: str, entry: Dict[str, Any]) -> int:
+        payload = json.dumps(entry, ensure_ascii=False).encode("utf-8")
+        return self._atomic_write(self._index_path(key), payload)
+
+    @staticmethod
+    def _atomic_write(path: Path, payload: bytes) -> int:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+        return len(payload)
+
+    def _iter_files(self, kind: str):
+        directory = self.cache_dir / kind
+        if not directory.exists():
+            return []
+        return [p for p in directory.glob("*/*") if p.is_file() and not p.name.endswith(".tmp")]
+
+    def _scan_disk_bytes(self) -> int:
+        total = 0
+        for path in self._iter_files("index") + self._iter_files("blobs"):
+            try:
+                total += path.stat().st_size
+            except OSError:
+                continue
+        return total
+
+    def _evict_disk(self) -> None:
+        """按最久未访问顺序删除索引条目，回收引用计数归零的内容块，直到低于低水位"""
+        entries = []
+        refs: Dict[str, int] = {}
+        for path in self._iter_files("index"):
+            try:
+                st = path.stat()
+                with open(path, "r", encoding="utf-8") as f:
+                    entry = json.load(f)
+            except Exception:
+                self._remove_file(path)
+                continue
+            shas = [s for s in (entry.get("text_sha"), entry.get("html_sha")) if s]
+            for sha in shas:
+                refs[sha] = refs.get(sha, 0) + 1
+            entries.append((st.st_mtime, st.st_size, path, shas))
+
+        blob_sizes = {}
+        for path in self._iter_files("blobs"):
+            try:
+                blob_sizes[path.stem] = (path.stat().st_size, path)
+            except OSError:
+                continue
+
+        total = sum(size for _, size, _, _ in entries) + sum(size for size, _ in blob_sizes.values())
+        target = int(self.max_disk_bytes * EVICT_LOW_WATERMARK)
+        evicted = 0
+
+        # 先回收无人引用的内容块（被覆盖的旧版本）
+        for sha, (size, path) in list(blob_sizes.items()):
+            if sha not in refs and self._remove_file(path):
+                total -= size
+                del blob_sizes[sha]
+
+        for _, size, path, shas in sorted(entries, key=lambda e: e[0]):
+            if total <= target:
+                break
+            if not self._remove_file(path):
+                continue
+            total -= size
+            evicted += 1
+            for sha in shas:
+                refs[sha] -= 1
+                if refs[sha] == 0 and sha in blob_sizes:
+                    blob_size, blob_path = blob_sizes.pop(sha)
+                    if self._remove_file(blob_path):
+                        total -= blob_size
+
+        with self._lock:
+            self._disk_bytes = total
+            self._stats["evictions"] += evicted
+
+    @staticmethod
+    def _remove_file(path: Path) -> bool:
+        try:
+            path.unlink()
+            return True
+        except OSError:
+            return False
+
+
+_CACHE: Optional[PageCache] = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_page_cache() -> PageCache:
+    """获取进程级共享缓存实例（按环境变量配置）"""
+    global _CACHE
+    with _CACHE_LOCK:
+        if _CACHE is None:
+            domain_ttls = dict(DEFAULT_DOMAIN_TTLS)
+            domain_ttls.update(_parse_domain_ttls(os.getenv("PAGE_CACHE_DOMAIN_TTLS", "")))
+            _CACHE = PageCache(
+                cache_dir=Path(os.getenv("PAGE_CACHE_DIR", str(DEFAULT_CACHE_DIR))),
+                default_ttl_s=_env_int("PAGE_CACHE_TTL_S", DEFAULT_TTL_S),
+                domain_ttls=domain_ttls,
+                max_disk_bytes=_env_int("PAGE_CACHE_MAX_MB", DEFAULT_MAX_DISK_MB) * 1024 * 1024,
+                query_ttl_s=_env_int("PAGE_CACHE_QUERY_TTL_S", DEFAULT_QUERY_TTL_S)
+            )
+        return _CACHE
+
+
+def get_page_cache_stats() -> Dict[str, Any]:
+    """返回共享缓存的命中统计"""
+    return get_page_cache().stats()
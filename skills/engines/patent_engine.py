@@ -7,18 +7,49 @@ L1 引擎层：专利数据库引擎
 1. 优先使用 PubMed 文献中的专利信息（最可靠）
 2. 使用 Google Patents 作为补充验证
 3. 对于动态网站，提供智能回退到 PubMed
+
+异步接口：
+- search_patent_db_async / search_patent_by_number_async / extract_patents_from_pubmed_async
+  与同步版本参数、返回值一致，底层使用浏览器引擎与医疗引擎的 asyncio 接口
+
+全源检索（search_all_patent_dbs）：
+- 并发查询全部数据源；动态网站与直接抓取失败的数据源共享同一次 PubMed 回退，而不是每个数据源各查一次
+- 结果按规范化专利号合并去重，每条专利记录命中它的数据源与获取途径
+
+对冲检索（Google Patents / Espacenet，默认关闭，需显式开启）：
+- 开启后直接抓取在 PATENT_HEDGE_DELAY_S 秒内未返回时，并行启动 PubMed 回退，两路竞速
+- 先返回可用结果的一路胜出；另一路在合并窗口（PATENT_HEDGE_MERGE_WINDOW_S）内也返回可用结果时两者合并输出
+- 落败的一路被取消（异步接口取消 Task；同步接口取消未开始的任务，已在运行的结果直接丢弃）
+- 最坏延迟由"直接抓取超时 + PubMed 检索"降为约 max(延迟 + PubMed 检索, 直接抓取)
+- 代价：慢查询会额外发出一次 PubMed 检索，同步接口中落败的直接抓取仍会跑完，因此按需开启
+
+环境变量：
+- PATENT_HEDGE_DELAY_S: 启动 PubMed 回退前等待直接抓取的秒数（未设置时不对冲；设为 on 使用推荐值 5 秒）
+- PATENT_HEDGE_MERGE_WINDOW_S: 先到的结果可用后等待另一路的秒数（默认 2）
+
+在途请求合并（见 single_flight）：
+- 参数相同的 search_patent_db / search_all_patent_dbs 同时在途时只执行一次；
+  底层的网页抓取与 PubMed 检索在浏览器引擎 / 医疗引擎中另行合并
 """
 
 import sys
-import re
 import json
+import time
+import os
+import asyncio
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 # 导入浏览器引擎和医疗引擎
 sys.path.append(str(Path(__file__).parent.parent))
-from engines.browser_engine import fetch_webpage_content
-from engines.medical_engine import search_medical_db_json
+from engines.browser_engine import fetch_webpage_content, fetch_webpage_content_async
+from engines.medical_engine import search_medical_db_json, search_medical_db_json_async
+from scrapers.entity_extractor import context_window
+from scrapers.data_cleaner import PARSE_ERROR_PREFIX
+from engines.single_flight import get_single_flight
+from scrapers.patent_normalizer import find_patent_ids, normalize_patent_number
 
 
 class PatentDatabase:
@@ -30,6 +61,19 @@ class PatentDatabase:
     ESPACENET = "espacenet"      # 欧洲专利局
 
 
+# 需要动态渲染的数据库（无法直接抓取，始终使用 PubMed 回退）
+DYNAMIC_DATABASES = (PatentDatabase.CNIPA, PatentDatabase.JPLATPAT, PatentDatabase.YAOZH)
+
+# 全源检索的默认数据源
+ALL_PATENT_DATABASES = (
+    PatentDatabase.GOOGLE_PATENTS,
+    PatentDatabase.ESPACENET,
+    PatentDatabase.YAOZH,
+    PatentDatabase.CNIPA,
+    PatentDatabase.JPLATPAT,
+)
+
+
 # 专利数据库 URL 模板
 PATENT_DB_URLS = {
     PatentDatabase.YAOZH: "https://db.yaozh.com/patent?q={query}",
@@ -40,7 +84,11 @@ PATENT_DB_URLS = {
 }
 
 
-def extract_patents_from_pubmed(query: str, max_results: int = 10) -> Dict[str, any]:
+def extract_patents_from_pubmed(
+    query: str,
+    max_results: int = 10,
+    filters: Optional[Dict] = None
+) -> Dict[str, any]:
     """
     从 PubMed 文献中提取专利信息
 
@@ -55,80 +103,35 @@ def extract_patents_from_pubmed(query: str, max_results: int = 10) -> Dict[str,
     Args:
         query: 搜索关键词（药物名称、靶点等）
         max_results: 最大文献数
+        filters: PubMed 结构化过滤器（日期窗口 / 出版类型 / MeSH / 关键词）
 
     Returns:
         包含专利信息的字典
     """
     try:
-        # 搜索 PubMed 文献
-        articles = search_medical_db_json(query, max_results=max_results)
-
-        if not articles:
-            return {
-                "status": "no_results",
-                "message": f"未找到与 '{query}' 相关的文献",
-                "patents": [],
-                "articles": []
-            }
-
-        # 专利号正则表达式
-        patent_patterns = [
-            r'\b(US\d{7,10}[A-Z]\d?)\b',  # US20240182490A1
-            r'\b(CN\d{9}[A-Z])\b',         # CN114269365A
-            r'\b(JP\d{7,10}[A-Z]?)\b',     # JP2023123456A
-            r'\b(EP\d{7}[A-Z]\d?)\b',      # EP1234567A1
-            r'\b(WO\d{4}/\d{6})\b',        # WO2024/123456
-        ]
-
-        patents_found = []
-        articles_info = []
-
-        for article in articles:
-            pmid = article.get('pmid', 'N/A')
-            title = article.get('title', '')
-            abstract = article.get('abstract', '')
-            url = article.get('url', f'https://pubmed.ncbi.nlm.nih.gov/{pmid}/')
-
-            # 保存文章信息（即使没找到专利号也保存，因为全文可能包含）
-            articles_info.append({
-                "pmid": pmid,
-                "title": title,
-                "url": url,
-                "has_patent_in_abstract": False
-            })
-
-            # 合并文本用于搜索
-            full_text = f"{title} {abstract}"
-
-            # 提取专利号
-            for pattern in patent_patterns:
-                matches = re.findall(pattern, full_text, re.IGNORECASE)
-                for patent_num in matches:
-                    patents_found.append({
-                        "patent_number": patent_num.upper(),
-                        "source_pmid": pmid,
-                        "source_title": title[:100],
-                        "source_url": url,
-                        "context": _extract_context(full_text, patent_num)
-                    })
-                    articles_info[-1]["has_patent_in_abstract"] = True
-
-        # 去重
-        unique_patents = {}
-        for p in patents_found:
-            pnum = p['patent_number']
-            if pnum not in unique_patents:
-                unique_patents[pnum] = p
+        # 搜索 PubMed 文献（过滤条件下推到 esearch）
+        articles = search_medical_db_json(query, max_results=max_results, filters=filters)
+        return _collect_patents(query, articles)
 
+    except Exception as e:
         return {
-            "status": "success",
-            "query": query,
-            "articles_searched": len(articles),
-            "patents_found": len(unique_patents),
-            "patents": list(unique_patents.values()),
-            "articles": articles_info  # 返回所有文章，即使摘要中没有专利号
+            "status": "error",
+            "error": f"{type(e).__name__}: {str(e)}",
+            "patents": [],
+            "articles": []
         }
 
+
+async def extract_patents_from_pubmed_async(
+    query: str,
+    max_results: int = 10,
+    filters: Optional[Dict] = None
+) -> Dict[str, any]:
+    """extract_patents_from_pubmed 的异步版本（参数与返回结构一致）"""
+    try:
+        articles = await search_medical_db_json_async(query, max_results=max_results, filters=filters)
+        return _collect_patents(query, articles)
+
     except Exception as e:
         return {
             "status": "error",
@@ -138,32 +141,72 @@ def extract_patents_from_pubmed(query: str, max_results: int = 10) -> Dict[str,
         }
 
 
-def _extract_context(text: str, patent_num: str, context_chars: int = 150) -> str:
-    """提取专利号周围的上下文"""
-    try:
-        idx = text.upper().find(patent_num.upper())
-        if idx == -1:
-            return ""
+def _collect_patents(query: str, articles: List[Dict]) -> Dict[str, any]:
+    """从文献列表中提取专利号并按规范化专利号去重，组装 extract_patents_from_pubmed 的返回结构"""
+    if not articles:
+        return {
+            "status": "no_results",
+            "message": f"未找到与 '{query}' 相关的文献",
+            "patents": [],
+            "articles": []
+        }
+
+    patents_found = []
+    articles_info = []
 
-        start = max(0, idx - context_chars)
-        end = min(len(text), idx + len(patent_num) + context_chars)
+    for article in articles:
+        pmid = article.get('pmid', 'N/A')
+        title = article.get('title', '')
+        abstract = article.get('abstract', '')
+        url = article.get('url', f'https://pubmed.ncbi.nlm.nih.gov/{pmid}/')
+
+        # 保存文章信息（即使没找到专利号也保存，因为全文可能包含）
+        articles_info.append({
+            "pmid": pmid,
+            "title": title,
+            "url": url,
+            "has_patent_in_abstract": False
+        })
+
+        # 合并文本用于搜索
+        full_text = f"{title} {abstract}"
+
+        # 提取专利号（单次扫描，容忍空格 / 斜杠 / 连字符写法，上下文按匹配偏移截取）
+        for pid, start, end in find_patent_ids(full_text):
+            patents_found.append({
+                "patent_number": full_text[start:end].upper(),
+                "canonical_id": str(pid),
+                "patent_key": pid.key,
+                "source_pmid": pmid,
+                "source_title": title[:100],
+                "source_url": url,
+                "context": context_window(full_text, start, end, 150)
+            })
+            articles_info[-1]["has_patent_in_abstract"] = True
 
-        context = text[start:end]
-        if start > 0:
-            context = "..." + context
-        if end < len(text):
-            context = context + "..."
+    # 按规范化专利号去重（同一专利的不同写法 / 带不带类型码合并为一条）
+    unique_patents = {}
+    for p in patents_found:
+        if p['patent_key'] not in unique_patents:
+            unique_patents[p['patent_key']] = p
 
-        return context.strip()
-    except:
-        return ""
+    return {
+        "status": "success",
+        "query": query,
+        "articles_searched": len(articles),
+        "patents_found": len(unique_patents),
+        "patents": list(unique_patents.values()),
+        "articles": articles_info  # 返回所有文章，即使摘要中没有专利号
+    }
 
 
 def search_patent_db(
     query: str,
     database: str = PatentDatabase.GOOGLE_PATENTS,
     max_results: int = 10,
-    fallback_to_pubmed: bool = True
+    fallback_to_pubmed: bool = True,
+    filters: Optional[Dict] = None,
+    hedge_delay_s: Optional[float] = None
 ) -> str:
     """
     搜索专利数据库（智能回退策略）
@@ -173,58 +216,331 @@ def search_patent_db(
         database: 数据库名称（yaozh, cnipa, jplatpat, google, espacenet）
         max_results: 最大结果数
         fallback_to_pubmed: 当专利库访问失败时，是否回退到 PubMed
+        filters: PubMed 回退时使用的结构化过滤器（如 VALIDATOR_FILTERS）
+        hedge_delay_s: 直接抓取多久未返回即并行启动 PubMed 回退（默认按 PATENT_HEDGE_DELAY_S，未设置时不对冲；负数关闭对冲）
 
     Returns:
         专利搜索结果文本
     """
+    hedge_delay_s = _hedge_delay(hedge_delay_s)
+    return get_single_flight("patent").do(
+        ("db", query, database, max_results, fallback_to_pubmed, _filters_key(filters), hedge_delay_s),
+        _search_patent_db, query, database, max_results, fallback_to_pubmed, filters, hedge_delay_s
+    )
+
+
+def _filters_key(filters: Optional[Dict]) -> str:
+    return json.dumps(filters, sort_keys=True, ensure_ascii=False, default=str) if filters else ""
+
+
+def _search_patent_db(query: str, database: str, max_results: int, fallback_to_pubmed: bool,
+                      filters: Optional[Dict], hedge_delay_s: Optional[float]) -> str:
     try:
         # 验证数据库
         if database not in PATENT_DB_URLS:
             return f"错误: 不支持的专利数据库 '{database}'"
 
         # 对于动态网站，直接使用 PubMed 回退策略
-        if database in [PatentDatabase.CNIPA, PatentDatabase.JPLATPAT, PatentDatabase.YAOZH]:
+        if database in DYNAMIC_DATABASES:
             if fallback_to_pubmed:
                 print(f"⚠️ {database.upper()} 需要动态渲染，自动回退到 PubMed 策略")
-                return _fallback_to_pubmed_search(query, database)
+                return _fallback_to_pubmed_search(query, database, filters)
             else:
-                search_url = PATENT_DB_URLS[database].format(query=query)
-                return f"""⚠️ {database.upper()} 需要动态渲染支持
-
-数据库: {database}
-查询: {query}
-URL: {search_url}
+                return _dynamic_db_message(database, query)
 
-建议：使用 fallback_to_pubmed=True 自动切换到 PubMed 策略
-"""
-
-        # Google Patents 和 Espacenet - 尝试直接访问
+        # Google Patents 和 Espacenet - 尝试直接访问（慢时与 PubMed 回退对冲）
         search_url = PATENT_DB_URLS[database].format(query=query)
-        result = fetch_webpage_content(search_url, timeout=30)
+        if fallback_to_pubmed and hedge_delay_s is not None:
+            return _hedged_search(query, database, search_url, filters, hedge_delay_s)
+
+        result = fetch_webpage_content(search_url, timeout=30, use_cache=True)
 
         # 检查结果
-        if result.startswith("网页") or "NO_RESULTS" in result:
+        if _direct_fetch_failed(result):
             if fallback_to_pubmed:
                 print(f"⚠️ {database.upper()} 直接访问失败，回退到 PubMed 策略")
-                return _fallback_to_pubmed_search(query, database)
+                return _fallback_to_pubmed_search(query, database, filters)
             else:
-                return f"""专利数据库访问受限: {database}
+                return _restricted_message(database, result)
 
-{result}
+        return _format_direct_result(database, query, result)
 
-建议：使用 fallback_to_pubmed=True 自动切换到 PubMed 策略
-"""
+    except Exception as e:
+        if fallback_to_pubmed:
+            print(f"⚠️ 专利搜索异常，回退到 PubMed 策略: {e}")
+            return _fallback_to_pubmed_search(query, database, filters)
+        return f"专利搜索异常: {database} - {type(e).__name__}: {str(e)}"
 
-        return f"=== {database.upper()} 专利搜索结果 ===\n查询: {query}\n\n{result[:2000]}"
+
+async def search_patent_db_async(
+    query: str,
+    database: str = PatentDatabase.GOOGLE_PATENTS,
+    max_results: int = 10,
+    fallback_to_pubmed: bool = True,
+    filters: Optional[Dict] = None,
+    hedge_delay_s: Optional[float] = None
+) -> str:
+    """search_patent_db 的异步版本（参数、回退与对冲策略、返回文本一致）"""
+    hedge_delay_s = _hedge_delay(hedge_delay_s)
+    return await get_single_flight("patent").do_async(
+        ("db", query, database, max_results, fallback_to_pubmed, _filters_key(filters), hedge_delay_s),
+        _search_patent_db_async, query, database, max_results, fallback_to_pubmed, filters, hedge_delay_s
+    )
+
+
+async def _search_patent_db_async(query: str, database: str, max_results: int, fallback_to_pubmed: bool,
+                                  filters: Optional[Dict], hedge_delay_s: Optional[float]) -> str:
+    try:
+        if database not in PATENT_DB_URLS:
+            return f"错误: 不支持的专利数据库 '{database}'"
+
+        if database in DYNAMIC_DATABASES:
+            if fallback_to_pubmed:
+                print(f"⚠️ {database.upper()} 需要动态渲染，自动回退到 PubMed 策略")
+                return await _fallback_to_pubmed_search_async(query, database, filters)
+            else:
+                return _dynamic_db_message(database, query)
+
+        search_url = PATENT_DB_URLS[database].format(query=query)
+        if fallback_to_pubmed and hedge_delay_s is not None:
+            return await _hedged_search_async(query, database, search_url, filters, hedge_delay_s)
+
+        result = await fetch_webpage_content_async(search_url, timeout=30, use_cache=True)
+
+        if _direct_fetch_failed(result):
+            if fallback_to_pubmed:
+                print(f"⚠️ {database.upper()} 直接访问失败，回退到 PubMed 策略")
+                return await _fallback_to_pubmed_search_async(query, database, filters)
+            else:
+                return _restricted_message(database, result)
+
+        return _format_direct_result(database, query, result)
 
     except Exception as e:
         if fallback_to_pubmed:
             print(f"⚠️ 专利搜索异常，回退到 PubMed 策略: {e}")
-            return _fallback_to_pubmed_search(query, database)
+            return await _fallback_to_pubmed_search_async(query, database, filters)
         return f"专利搜索异常: {database} - {type(e).__name__}: {str(e)}"
 
 
-def _fallback_to_pubmed_search(query: str, original_database: str) -> str:
+# ============================================================================
+# 对冲检索：直接抓取与 PubMed 回退竞速
+# ============================================================================
+
+# PATENT_HEDGE_DELAY_S=on 时使用的推荐延迟（对冲默认关闭）
+DEFAULT_HEDGE_DELAY_S = 5.0
+DEFAULT_HEDGE_MERGE_WINDOW_S = 2.0
+
+_HEDGE_STATS = {"direct_fast": 0, "pubmed_started": 0, "direct_won": 0, "pubmed_won": 0, "merged": 0, "both_failed": 0}
+_HEDGE_STATS_LOCK = threading.Lock()
+_HEDGE_EXECUTOR: Optional[ThreadPoolExecutor] = None
+_HEDGE_EXECUTOR_LOCK = threading.Lock()
+
+
+def _hedge_delay(delay: Optional[float]) -> Optional[float]:
+    """对冲延迟：参数 > PATENT_HEDGE_DELAY_S（未设置时不对冲，on 为推荐值）；关闭对冲时返回 None"""
+    if delay is None:
+        raw = os.getenv("PATENT_HEDGE_DELAY_S", "").strip().lower()
+        if raw in ("off", "none", "false", "no", ""):
+            return None
+        try:
+            delay = float(raw)
+        except ValueError:
+            delay = DEFAULT_HEDGE_DELAY_S
+    return None if delay < 0 else delay
+
+
+def _hedge_merge_window() -> float:
+    try:
+        return max(0.0, float(os.getenv("PATENT_HEDGE_MERGE_WINDOW_S", str(DEFAULT_HEDGE_MERGE_WINDOW_S))))
+    except ValueError:
+        return DEFAULT_HEDGE_MERGE_WINDOW_S
+
+
+def _get_hedge_executor() -> ThreadPoolExecutor:
+    """对冲检索共享线程池（落败的一路可能仍在运行，不能随调用结束而等待关闭）"""
+    global _HEDGE_EXECUTOR
+    with _HEDGE_EXECUTOR_LOCK:
+        if _HEDGE_EXECUTOR is None:
+            _HEDGE_EXECUTOR = ThreadPoolExecutor(max_workers=16, thread_name_prefix="patent-hedge")
+        return _HEDGE_EXECUTOR
+
+
+def _record_hedge(outcome: str) -> None:
+    with _HEDGE_STATS_LOCK:
+        _HEDGE_STATS[outcome] += 1
+
+
+def get_patent_hedge_stats() -> Dict[str, int]:
+    """
+    对冲检索结果分布
+
+    direct_fast: 延迟内直接抓取已成功，未启动 PubMed；pubmed_started: 启动了 PubMed 回退（超时对冲或直接抓取失败）；
+    direct_won / pubmed_won / merged / both_failed: 启动 PubMed 后的最终结果
+    """
+    with _HEDGE_STATS_LOCK:
+        return dict(_HEDGE_STATS)
+
+
+def _hedge_usable(source: str, outcome) -> bool:
+    if source == "direct":
+        return isinstance(outcome, str) and not _direct_fetch_failed(outcome)
+    return isinstance(outcome, dict) and outcome.get("status") == "success"
+
+
+def _hedge_winner(outcomes: Dict[str, any]) -> Optional[str]:
+    for source in ("direct", "pubmed"):
+        if source in outcomes and _hedge_usable(source, outcomes[source]):
+            return source
+    return None
+
+
+def _hedge_result(query: str, database: str, outcomes: Dict[str, any], first: Optional[str]) -> str:
+    """按两路结果组装输出：都可用时合并，否则取可用的一路（都不可用时沿用回退策略的输出）"""
+    direct_ok = _hedge_usable("direct", outcomes.get("direct"))
+    pubmed_ok = _hedge_usable("pubmed", outcomes.get("pubmed"))
+
+    if direct_ok and pubmed_ok:
+        _record_hedge("merged")
+        return "\n\n".join([
+            _format_direct_result(database, query, outcomes["direct"]),
+            _format_fallback_result(outcomes["pubmed"], query, database),
+        ])
+    if direct_ok:
+        _record_hedge("direct_won")
+        return _format_direct_result(database, query, outcomes["direct"])
+    if first is None:
+        _record_hedge("both_failed")
+    else:
+        _record_hedge("pubmed_won")
+
+    pubmed = outcomes.get("pubmed")
+    if not isinstance(pubmed, dict):
+        pubmed = {"status": "error", "error": str(pubmed)}
+    return _format_fallback_result(pubmed, query, database)
+
+
+def _hedged_search(query: str, database: str, search_url: str, filters: Optional[Dict], delay: float) -> str:
+    pool = _get_hedge_executor()
+    futures = {pool.submit(fetch_webpage_content, search_url, 30, True): "direct"}
+    outcomes: Dict[str, any] = {}
+
+    done, _ = wait(futures, timeout=delay)
+    if done:
+        outcomes["direct"] = _future_outcome(next(iter(done)))
+        if _hedge_usable("direct", outcomes["direct"]):
+            _record_hedge("direct_fast")
+            return _format_direct_result(database, query, outcomes["direct"])
+        print(f"⚠️ {database.upper()} 直接访问失败，回退到 PubMed 策略")
+    else:
+        print(f"⏱️ {database.upper()} {delay:g}s 内未返回，并行启动 PubMed 回退")
+    _record_hedge("pubmed_started")
+
+    print(f"🔄 执行 PubMed 回退策略: {query}")
+    futures[pool.submit(extract_patents_from_pubmed, query, 20, filters)] = "pubmed"
+    pending = {f for f, source in futures.items() if source not in outcomes}
+
+    first = None
+    while pending and first is None:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            outcomes[futures[future]] = _future_outcome(future)
+        first = _hedge_winner(outcomes)
+
+    if pending and first is not None:
+        done, pending = wait(pending, timeout=_hedge_merge_window())
+        for future in done:
+            outcomes[futures[future]] = _future_outcome(future)
+
+    # 落败的一路：未开始的直接取消，已在运行的让其在后台结束，结果丢弃
+    for future in pending:
+        future.cancel()
+
+    return _hedge_result(query, database, outcomes, first)
+
+
+async def _hedged_search_async(query: str, database: str, search_url: str,
+                               filters: Optional[Dict], delay: float) -> str:
+    tasks = {asyncio.ensure_future(fetch_webpage_content_async(search_url, timeout=30, use_cache=True)): "direct"}
+    outcomes: Dict[str, any] = {}
+    pending = set(tasks)
+
+    try:
+        done, pending = await asyncio.wait(pending, timeout=delay)
+        if done:
+            outcomes["direct"] = _future_outcome(next(iter(done)))
+            if _hedge_usable("direct", outcomes["direct"]):
+                _record_hedge("direct_fast")
+                return _format_direct_result(database, query, outcomes["direct"])
+            print(f"⚠️ {database.upper()} 直接访问失败，回退到 PubMed 策略")
+        else:
+            print(f"⏱️ {database.upper()} {delay:g}s 内未返回，并行启动 PubMed 回退")
+        _record_hedge("pubmed_started")
+
+        print(f"🔄 执行 PubMed 回退策略: {query}")
+        pubmed_task = asyncio.ensure_future(extract_patents_from_pubmed_async(query, 20, filters))
+        tasks[pubmed_task] = "pubmed"
+        pending.add(pubmed_task)
+
+        first = None
+        while pending and first is None:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                outcomes[tasks[task]] = _future_outcome(task)
+            first = _hedge_winner(outcomes)
+
+        if pending and first is not None:
+            done, pending = await asyncio.wait(pending, timeout=_hedge_merge_window())
+            for task in done:
+                outcomes[tasks[task]] = _future_outcome(task)
+
+        return _hedge_result(query, database, outcomes, first)
+
+    finally:
+        # 落败（或调用方被取消时仍在途）的一路直接取消
+        for task in pending:
+            task.cancel()
+
+
+def _future_outcome(future):
+    """取出一路结果；异常转换为错误字符串，按不可用处理"""
+    try:
+        return future.result()
+    except Exception as e:
+        return f"网页抓取异常: {type(e).__name__} - {str(e)}"
+
+
+def _direct_fetch_failed(result: str) -> bool:
+    """直接抓取结果是否不可用（抓取 / 解析错误信息或无结果页）"""
+    return result.startswith(("网页", PARSE_ERROR_PREFIX)) or "NO_RESULTS" in result
+
+
+def _format_direct_result(database: str, query: str, result: str) -> str:
+    return f"=== {database.upper()} 专利搜索结果 ===\n查询: {query}\n\n{result[:2000]}"
+
+
+def _dynamic_db_message(database: str, query: str) -> str:
+    search_url = PATENT_DB_URLS[database].format(query=query)
+    return f"""⚠️ {database.upper()} 需要动态渲染支持
+
+数据库: {database}
+查询: {query}
+URL: {search_url}
+
+建议：使用 fallback_to_pubmed=True 自动切换到 PubMed 策略
+"""
+
+
+def _restricted_message(database: str, result: str) -> str:
+    return f"""专利数据库访问受限: {database}
+
+{result}
+
+建议：使用 fallback_to_pubmed=True 自动切换到 PubMed 策略
+"""
+
+
+def _fallback_to_pubmed_search(query: str, original_database: str, filters: Optional[Dict] = None) -> str:
     """
     回退到 PubMed 搜索策略
 
@@ -233,8 +549,21 @@ def _fallback_to_pubmed_search(query: str, original_database: str) -> str:
     print(f"🔄 执行 PubMed 回退策略: {query}")
 
     # 从 PubMed 提取专利
-    result = extract_patents_from_pubmed(query, max_results=20)
+    result = extract_patents_from_pubmed(query, max_results=20, filters=filters)
+    return _format_fallback_result(result, query, original_database)
+
 
+async def _fallback_to_pubmed_search_async(query: str, original_database: str,
+                                           filters: Optional[Dict] = None) -> str:
+    """_fallback_to_pubmed_search 的异步版本"""
+    print(f"🔄 执行 PubMed 回退策略: {query}")
+
+    result = await extract_patents_from_pubmed_async(query, max_results=20, filters=filters)
+    return _format_fallback_result(result, query, original_database)
+
+
+def _format_fallback_result(result: Dict, query: str, original_database: str) -> str:
+    """把 extract_patents_from_pubmed 的结果格式化为 PubMed 回退策略文本"""
     if result['status'] == 'error':
         return f"""专利搜索失败（PubMed 回退策略）
 
@@ -287,39 +616,341 @@ def _fallback_to_pubmed_search(query: str, original_database: str) -> str:
     return "\n".join(output)
 
 
+# ============================================================================
+# 全源检索：并发查询 + 共享 PubMed 回退 + 按规范化专利号合并
+# ============================================================================
+
+def search_all_patent_dbs(
+    query: str,
+    databases: Optional[List[str]] = None,
+    max_results: int = 20,
+    filters: Optional[Dict] = None
+) -> Dict[str, any]:
+    """
+    并发查询全部专利数据源，按规范化专利号合并去重
+
+    Google Patents / Espacenet 并发直接抓取；动态网站（药智网 / CNIPA / J-PlatPat）与直接抓取失败的
+    数据源共享同一次 PubMed 回退（同一查询只执行一次 esearch/efetch）
+
+    Args:
+        query: 搜索关键词
+        databases: 数据源列表（默认 ALL_PATENT_DATABASES）
+        max_results: PubMed 回退的最大文献数
+        filters: PubMed 回退使用的结构化过滤器
+
+    Returns:
+        {"status", "query", "databases", "pubmed", "backend_calls", "patents_found", "patents",
+         "articles", "elapsed_s"}；patents 每项含 patent_key、canonical_id、patent_numbers（各源写法）、
+         sources（[{database(s), via, url, pmid, context}]）
+    """
+    return get_single_flight("patent").do(
+        ("all", query, tuple(databases or ()), max_results, _filters_key(filters)),
+        _search_all_patent_dbs, query, databases, max_results, filters
+    )
+
+
+def _search_all_patent_dbs(query: str, databases: Optional[List[str]], max_results: int,
+                           filters: Optional[Dict]) -> Dict[str, any]:
+    start = time.perf_counter()
+    try:
+        databases, sources = _plan_databases(databases)
+        direct = [db for db in databases if db not in DYNAMIC_DATABASES]
+        pubmed = None
+
+        with ThreadPoolExecutor(max_workers=len(direct) + 1) as pool:
+            # 动态网站必然回退：PubMed 查询与直接抓取同时开始
+            pubmed_future = None
+            if len(direct) < len(databases):
+                pubmed_future = pool.submit(extract_patents_from_pubmed, query, max_results, filters)
+
+            futures = {pool.submit(_fetch_direct_source, db, query): db for db in direct}
+            for future in as_completed(futures):
+                sources[futures[future]] = future.result()
+                if sources[futures[future]]["via"] == "pubmed_fallback" and pubmed_future is None:
+                    pubmed_future = pool.submit(extract_patents_from_pubmed, query, max_results, filters)
+
+            if pubmed_future is not None:
+                pubmed = pubmed_future.result()
+
+        return _merge_patent_sources(query, sources, pubmed, len(direct), start)
+
+    except Exception as e:
+        return _all_patent_error(query, e, start)
+
+
+async def search_all_patent_dbs_async(
+    query: str,
+    databases: Optional[List[str]] = None,
+    max_results: int = 20,
+    filters: Optional[Dict] = None
+) -> Dict[str, any]:
+    """search_all_patent_dbs 的异步版本（参数与返回结构一致）"""
+    return await get_single_flight("patent").do_async(
+        ("all", query, tuple(databases or ()), max_results, _filters_key(filters)),
+        _search_all_patent_dbs_async, query, databases, max_results, filters
+    )
+
+
+async def _search_all_patent_dbs_async(query: str, databases: Optional[List[str]], max_results: int,
+                                       filters: Optional[Dict]) -> Dict[str, any]:
+    start = time.perf_counter()
+    try:
+        databases, sources = _plan_databases(databases)
+        direct = [db for db in databases if db not in DYNAMIC_DATABASES]
+
+        pubmed_task = None
+        if len(direct) < len(databases):
+            pubmed_task = asyncio.ensure_future(extract_patents_from_pubmed_async(query, max_results, filters))
+
+        try:
+            results = await asyncio.gather(*(_fetch_direct_source_async(db, query) for db in direct))
+            for db, source in zip(direct, results):
+                sources[db] = source
+                if source["via"] == "pubmed_fallback" and pubmed_task is None:
+                    pubmed_task = asyncio.ensure_future(
+                        extract_patents_from_pubmed_async(query, max_results, filters)
+                    )
+            pubmed = await pubmed_task if pubmed_task is not None else None
+        finally:
+            if pubmed_task is not None and not pubmed_task.done():
+                pubmed_task.cancel()
+
+        return _merge_patent_sources(query, sources, pubmed, len(direct), start)
+
+    except Exception as e:
+        return _all_patent_error(query, e, start)
+
+
+def _plan_databases(databases: Optional[List[str]]) -> Tuple[List[str], Dict[str, Dict]]:
+    """去重并校验数据源，返回 (有效数据源, 不支持的数据源状态)"""
+    valid, sources = [], {}
+    for db in databases or ALL_PATENT_DATABASES:
+        db = db.lower().strip()
+        if db in PATENT_DB_URLS:
+            if db not in valid:
+                valid.append(db)
+        else:
+            sources[db] = {"via": "error", "error": f"不支持的专利数据库 '{db}'"}
+    for db in valid:
+        if db in DYNAMIC_DATABASES:
+            sources[db] = {"via": "pubmed_fallback", "error": "需要动态渲染"}
+    return valid, sources
+
+
+def _fetch_direct_source(database: str, query: str) -> Dict[str, any]:
+    """直接抓取单个数据源（不抛异常，失败时标记为需要 PubMed 回退）"""
+    start = time.perf_counter()
+    url = PATENT_DB_URLS[database].format(query=query)
+    try:
+        content = fetch_webpage_content(url, timeout=30, use_cache=True)
+    except Exception as e:
+        content = f"网页抓取异常: {type(e).__name__} - {str(e)}"
+    return _direct_source(url, content, start)
+
+
+async def _fetch_direct_source_async(database: str, query: str) -> Dict[str, any]:
+    start = time.perf_counter()
+    url = PATENT_DB_URLS[database].format(query=query)
+    try:
+        content = await fetch_webpage_content_async(url, timeout=30, use_cache=True)
+    except Exception as e:
+        content = f"网页抓取异常: {type(e).__name__} - {str(e)}"
+    return _direct_source(url, content, start)
+
+
+def _direct_source(url: str, content: str, start: float) -> Dict[str, any]:
+    elapsed = round(time.perf_counter() - start, 3)
+    if _direct_fetch_failed(content):
+        return {"via": "pubmed_fallback", "url": url, "error": content[:200], "elapsed_s": elapsed}
+    return {"via": "direct", "url": url, "content": content, "elapsed_s": elapsed}
+
+
+def _merge_patent_sources(
+    query: str,
+    sources: Dict[str, Dict],
+    pubmed: Optional[Dict],
+    direct_calls: int,
+    start: float
+) -> Dict[str, any]:
+    """把直接抓取页面中的专利号与 PubMed 回退提取的专利按 patent_key 合并"""
+    patents: Dict[str, Dict] = {}
+
+    def _add(pid, number: str, attribution: Dict) -> None:
+        entry = patents.get(pid.key)
+        if entry is None:
+            entry = patents[pid.key] = {
+                "patent_key": pid.key, "canonical_id": str(pid), "patent_numbers": [], "sources": []
+            }
+        elif pid.kind and entry["canonical_id"] == pid.key:
+            entry["canonical_id"] = str(pid)  # 优先保留带类型码的写法
+        if number not in entry["patent_numbers"]:
+            entry["patent_numbers"].append(number)
+        entry["sources"].append(attribution)
+
+    databases = {}
+    for db, source in sources.items():
+        status = {k: v for k, v in source.items() if k != "content"}
+        status["patents"] = 0
+        content = source.get("content")
+        if content:
+            seen = set()
+            for pid, s, e in find_patent_ids(content):
+                if pid.key in seen:
+                    continue
+                seen.add(pid.key)
+                _add(pid, content[s:e].upper(), {
+                    "database": db,
+                    "via": "direct",
+                    "url": source["url"],
+                    "context": context_window(content, s, e, 150)
+                })
+            status["patents"] = len(seen)
+            status["excerpt"] = content[:300]
+        databases[db] = status
+
+    # 共享的 PubMed 回退结果归属于所有回退的数据源
+    fallback_dbs = [db for db, source in sources.items() if source["via"] == "pubmed_fallback"]
+    pubmed_summary = None
+    if pubmed is not None:
+        for p in pubmed.get("patents", []):
+            pid = normalize_patent_number(p["canonical_id"])
+            if pid is not None:
+                _add(pid, p["patent_number"], {
+                    "databases": fallback_dbs,
+                    "via": "pubmed_fallback",
+                    "pmid": p["source_pmid"],
+                    "url": p["source_url"],
+                    "context": p.get("context", "")
+                })
+        pubmed_summary = {
+            "status": pubmed.get("status"),
+            "articles_searched": pubmed.get("articles_searched", 0),
+            "patents_found": pubmed.get("patents_found", 0),
+        }
+        if pubmed.get("error"):
+            pubmed_summary["error"] = pubmed["error"]
+        for db in fallback_dbs:
+            databases[db]["patents"] = pubmed_summary["patents_found"]
+
+    # 被越多数据源命中的专利越靠前
+    merged = sorted(patents.values(), key=lambda p: -len(p["sources"]))
+    any_success = any(s["via"] == "direct" for s in sources.values()) or (
+        pubmed is not None and pubmed.get("status") in ("success", "no_results")
+    )
+
+    return {
+        "status": "success" if any_success else "error",
+        "query": query,
+        "databases": databases,
+        "pubmed": pubmed_summary,
+        "backend_calls": {"direct": direct_calls, "pubmed": 1 if pubmed is not None else 0},
+        "patents_found": len(merged),
+        "patents": merged,
+        "articles": (pubmed or {}).get("articles", []),
+        "elapsed_s": round(time.perf_counter() - start, 3),
+    }
+
+
+def _all_patent_error(query: str, error: Exception, start: float) -> Dict[str, any]:
+    return {
+        "status": "error",
+        "query": query,
+        "error": f"{type(error).__name__}: {str(error)}",
+        "databases": {},
+        "pubmed": None,
+        "backend_calls": {"direct": 0, "pubmed": 0},
+        "patents_found": 0,
+        "patents": [],
+        "articles": [],
+        "elapsed_s": round(time.perf_counter() - start, 3),
+    }
+
+
+def format_all_patent_result(result: Dict) -> str:
+    """把 search_all_patent_dbs 的结果格式化为文本"""
+    if result.get("error") and not result.get("databases"):
+        return f"全源专利检索失败\n\n查询: {result.get('query')}\n错误: {result['error']}"
+
+    calls = result.get("backend_calls", {})
+    output = [
+        "=== 全源专利检索结果 ===",
+        f"查询: {result.get('query')}",
+        f"后端调用: 直接抓取 {calls.get('direct', 0)} 次, PubMed 回退 {calls.get('pubmed', 0)} 次"
+        f"（耗时 {result.get('elapsed_s', 0)}s）",
+        "",
+        "数据源状态："
+    ]
+    via_labels = {"direct": "直接抓取", "pubmed_fallback": "PubMed 回退", "error": "错误"}
+    for db, status in result.get("databases", {}).items():
+        note = f"  ({status['error'][:80]})" if status.get("error") else ""
+        output.append(f"  - {db}: {via_labels.get(status['via'], status['via'])}, "
+                      f"{status.get('patents', 0)} 个专利{note}")
+
+    pubmed = result.get("pubmed")
+    if pubmed is not None:
+        output.append(f"  PubMed: 搜索文献 {pubmed.get('articles_searched', 0)} 篇, "
+                      f"摘要中找到专利 {pubmed.get('patents_found', 0)} 个"
+                      + (f"  (错误: {pubmed['error']})" if pubmed.get("error") else ""))
+
+    output.append(f"\n合并去重后专利数: {result.get('patents_found', 0)}")
+    for i, patent in enumerate(result.get("patents", [])[:20], 1):
+        output.append(f"\n{i}. {patent['canonical_id']}  （写法: {', '.join(patent['patent_numbers'])}）")
+        for source in patent["sources"]:
+            if source["via"] == "direct":
+                output.append(f"   来源: {source['database']}（直接抓取） {source['url']}")
+            else:
+                on_behalf = ", ".join(source["databases"]) or "pubmed"
+                output.append(f"   来源: PubMed 回退（{on_behalf}） PMID {source['pmid']} {source['url']}")
+            if source.get("context"):
+                output.append(f"   上下文: {source['context'][:200]}")
+
+    if not result.get("patents") and result.get("articles"):
+        output.append("\n⚠️ 未找到专利号，相关文献（建议访问全文查看 Conflicts of Interest 部分）：")
+        for i, article in enumerate(result["articles"][:10], 1):
+            output.append(f"  {i}. PMID {article['pmid']} {article['title'][:100]}")
+            output.append(f"     {article['url']}")
+
+    return "\n".join(output)
+
+
 def search_patent_by_number(patent_number: str) -> Dict[str, str]:
     """
     根据专利号查询专利详情
 
     Args:
-        patent_number: 专利号（如 US20240182490A1, CN114269365A）
+        patent_number: 专利号（如 US20240182490A1, CN114269365A；
+                       也接受 "US 2024/0182490 A1"、"WO/2024/123456" 等写法，先规范化）
 
     Returns:
-        专利详情字典
+        专利详情字典（canonical_id 为规范化专利号）
     """
     try:
-        # 根据专利号前缀判断数据库
-        if patent_number.startswith("US"):
-            url = f"https://patents.google.com/patent/{patent_number}"
-        elif patent_number.startswith("CN"):
-            url = f"https://patents.google.com/patent/{patent_number}"
-        elif patent_number.startswith("JP"):
-            url = f"https://patents.google.com/patent/{patent_number}"
-        elif patent_number.startswith("EP"):
-            url = f"https://worldwide.espacenet.com/patent/search?q={patent_number}"
-        else:
+        canonical_id, url = _patent_detail_url(patent_number)
+        if url is None:
             return {"error": f"无法识别的专利号格式: {patent_number}"}
 
-        # 抓取专利页面
-        content = fetch_webpage_content(url, timeout=30)
+        # 抓取专利页面（专利文档几乎不变，有效期内直接读取页面缓存）
+        content = fetch_webpage_content(url, timeout=30, use_cache=True)
+        return _patent_detail(patent_number, canonical_id, url, content)
 
+    except Exception as e:
         return {
             "patent_number": patent_number,
-            "url": url,
-            "content": content[:3000],  # 限制长度
-            "status": "success" if not content.startswith("网页") else "failed"
+            "error": f"{type(e).__name__}: {str(e)}",
+            "status": "error"
         }
 
+
+async def search_patent_by_number_async(patent_number: str) -> Dict[str, str]:
+    """search_patent_by_number 的异步版本（返回结构一致）"""
+    try:
+        canonical_id, url = _patent_detail_url(patent_number)
+        if url is None:
+            return {"error": f"无法识别的专利号格式: {patent_number}"}
+
+        content = await fetch_webpage_content_async(url, timeout=30, use_cache=True)
+        return _patent_detail(patent_number, canonical_id, url, content)
+
     except Exception as e:
         return {
             "patent_number": patent_number,
@@ -328,18 +959,43 @@ def search_patent_by_number(patent_number: str) -> Dict[str, str]:
         }
 
 
+def _patent_detail_url(patent_number: str) -> Tuple[Optional[str], Optional[str]]:
+    """规范化专利号并按专利局选择详情页，返回 (规范化专利号, URL)，无法识别时均为 None"""
+    pid = normalize_patent_number(patent_number)
+    if pid is None:
+        return None, None
+    canonical_id = str(pid)
+
+    # 根据专利局判断数据库
+    if pid.office in ("US", "CN", "JP", "WO"):
+        return canonical_id, f"https://patents.google.com/patent/{canonical_id}"
+    return canonical_id, f"https://worldwide.espacenet.com/patent/search?q={canonical_id}"
+
+
+def _patent_detail(patent_number: str, canonical_id: str, url: str, content: str) -> Dict[str, str]:
+    return {
+        "patent_number": patent_number,
+        "canonical_id": canonical_id,
+        "url": url,
+        "content": content[:3000],  # 限制长度
+        "status": "success" if not content.startswith("网页") else "failed"
+    }
+
+
 if __name__ == "__main__":
     # 测试用例
     import sys
 
     if len(sys.argv) < 2:
         print("用法: python3 patent_engine.py <查询词> [数据库]")
-        print("数据库选项: yaozh, cnipa, jplatpat, google, espacenet")
+        print("数据库选项: yaozh, cnipa, jplatpat, google, espacenet, all（全源并发检索）")
         sys.exit(1)
 
     query = sys.argv[1]
     database = sys.argv[2] if len(sys.argv) > 2 else PatentDatabase.GOOGLE_PATENTS
 
     print(f"正在搜索专利数据库: {database}")
-    result = search_patent_db(query, database)
-    print(result)
+    if database == "all":
+        print(format_all_patent_result(search_all_patent_dbs(query)))
+    else:
+        print(search_patent_db(query, database))
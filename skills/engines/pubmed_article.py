@@ -0,0 +1,203 @@
+"""
+L1 引擎层：PubMed 文献记录模型
+efetch 结果只解析一次，文本输出、JSON 输出与 COI 解析均基于同一记录渲染
+
+记录字段：pmid / title / abstract / pub_date / affiliation
+- 使用 __slots__ 保持内存紧凑（缓存中常驻上千篇文献）
+- to_dict / from_dict 用于磁盘缓存与 JSON 输出
+
+流式解码：
+- iter_efetch_articles 基于 iterparse 逐篇解码 efetch XML
+- 每篇解码完成后立即清理已处理节点，峰值内存与批量大小无关
+
+轻量摘要：
+- parse_esummary 解析 esummary DocSum（标题 / 日期 / 出版类型），用于两阶段检索预筛
+"""
+
+import xml.etree.ElementTree as ET
+from typing import Any, Dict, Iterator, List, Optional
+
+
+class PubMedArticle:
+    """单篇 PubMed 文献的紧凑记录"""
+
+    __slots__ = ("pmid", "title", "abstract", "pub_date", "affiliation")
+
+    def __init__(
+        self,
+        pmid: str,
+        title: str = "",
+        abstract: str = "",
+        pub_date: str = "",
+        affiliation: str = ""
+    ):
+        self.pmid = pmid
+        self.title = title
+        self.abstract = abstract
+        self.pub_date = pub_date
+        self.affiliation = affiliation
+
+    @property
+    def url(self) -> str:
+        return f"https://pubmed.ncbi.nlm.nih.gov/{self.pmid}/"
+
+    @property
+    def text(self) -> str:
+        """标题 + 摘要，用于专利号 / COI 正则匹配"""
+        return f"{self.title} {self.abstract}"
+
+    def to_dict(self) -> Dict[str, str]:
+        """转换为 search_medical_db_json 的输出结构"""
+        return {
+            "pmid": self.pmid,
+            "title": self.title,
+            "abstract": self.abstract,
+            "pub_date": self.pub_date,
+            "affiliation": self.affiliation,
+            "url": self.url
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PubMedArticle":
+        return cls(
+            pmid=str(data.get("pmid", "")),
+            title=data.get("title", ""),
+            abstract=data.get("abstract", ""),
+            pub_date=data.get("pub_date", ""),
+            affiliation=data.get("affiliation", "")
+        )
+
+    @classmethod
+    def from_element(cls, elem: ET.Element) -> Optional["PubMedArticle"]:
+        """
+        从 efetch XML 的 <PubmedArticle> 元素构建记录（单次遍历）
+
+        Returns:
+            PubMedArticle，缺少 PMID 时返回 None
+        """
+        medline = elem.find("MedlineCitation")
+        if medline is None:
+            return None
+        pmid = _text(medline.find("PMID"))
+        if not pmid:
+            return None
+
+        info = medline.find("Article")
+        if info is None:
+            return cls(pmid)
+
+        title = _text(info.find("ArticleTitle"))
+        abstract = " ".join(_text(p) for p in info.iterfind("Abstract/AbstractText"))
+
+        # 提取出版日期
+        pub_date = ""
+        pd = info.find("Journal/JournalIssue/PubDate")
+        if pd is not None:
+            pub_date = format_pub_date(
+                _text(pd.find("Year")),
+                _text(pd.find("Month")),
+                _text(pd.find("Day")),
+                _text(pd.find("MedlineDate"))
+            )
+
+        # 提取第一作者机构（含国别信息）
+        affiliation = ""
+        for aff in info.iterfind("AuthorList/Author/AffiliationInfo/Affiliation"):
+            affiliation = _text(aff)
+            break
+
+        return cls(pmid, title, abstract, pub_date, affiliation)
+
+    def __repr__(self) -> str:
+        return f"PubMedArticle(pmid={self.pmid!r}, title={self.title[:40]!r})"
+
+
+def format_pub_date(year: str, month: str, day: str, medline_date: str = "") -> str:
+    """规范化 PubDate：优先 Year-Month-Day，否则截取 MedlineDate 前 7 位"""
+    if year:
+        return "-".join(filter(None, [
+            year,
+            month.zfill(2) if month.isdigit() else month,
+            day.zfill(2) if day.isdigit() else day
+        ]))
+    if medline_date:
+        return medline_date[:7]  # e.g. "2024 Jan-Feb" -> "2024 Ja"
+    return ""
+
+
+def _text(elem: Optional[ET.Element]) -> str:
+    """元素的完整文本（含 <i>/<sup> 等内联标签中的文字）"""
+    if elem is None:
+        return ""
+    return "".join(elem.itertext()).strip()
+
+
+def iter_efetch_articles(stream) -> Iterator[PubMedArticle]:
+    """
+    流式解码 efetch XML，逐篇产出 PubMedArticle
+
+    每个顶层节点（PubmedArticle / PubmedBookArticle 等）处理完毕后立即
+    从根节点上清除，内存占用只与单篇文献大小相关。
+
+    Args:
+        stream: efetch 返回的文件句柄（bytes 或 str 均可）
+
+    Yields:
+        PubMedArticle
+    """
+    root = None
+    depth = 0
+
+    for event, elem in ET.iterparse(stream, events=("start", "end")):
+        if event == "start":
+            if root is None:
+                root = elem
+            depth += 1
+            continue
+
+        depth -= 1
+        if depth != 1:
+            continue
+
+        if elem.tag == "PubmedArticle":
+            article = PubMedArticle.from_element(elem)
+            if article is not None:
+                yield article
+
+        # 清理已处理的顶层节点
+        root.clear()
+
+
+def parse_esummary(stream) -> List[Dict[str, Any]]:
+    """
+    解析 esummary（v1.0）响应
+
+    Returns:
+        [{"pmid", "title", "pub_date", "pub_types"}]，顺序与响应一致
+    """
+    summaries = []
+
+    for _, elem in ET.iterparse(stream, events=("end",)):
+        if elem.tag != "DocSum":
+            continue
+
+        summary = {
+            "pmid": _text(elem.find("Id")),
+            "title": "",
+            "pub_date": "",
+            "pub_types": []
+        }
+        for item in elem.iterfind("Item"):
+            name = item.get("Name")
+            if name == "Title":
+                summary["title"] = _text(item)
+            elif name == "PubDate":
+                summary["pub_date"] = _text(item)
+            elif name == "PubTypeList":
+                summary["pub_types"] = [_text(t) for t in item.iterfind("Item")]
+
+        if summary["pmid"]:
+            summaries.append(summary)
+        elem.clear()
+
+    return summaries
@@ -0,0 +1,235 @@
+"""
+L1 引擎层：PubMed baseline / updatefile 离线 COI 批量挖掘
+对本地 gzip 压缩的年度 baseline（pubmed26n0001.xml.gz …）与每日 updatefile 运行 Deep COI Parsing，
+完全离线，不访问 NCBI
+
+实现：
+- 每个文件用 iter_efetch_articles 流式解码（iterparse + 逐篇清理），内存占用与文件大小无关
+- 文件分发到进程池（imap_unordered），每个工作进程逐篇调用 analyze_article_coi
+- 主进程按完成顺序把命中记录写为 NDJSON（每行一篇，紧凑分隔符；输出名以 .gz 结尾时 gzip 压缩）
+- 吞吐统计：墙钟 articles/s 与按工作进程 CPU 时间折算的 articles/s/核
+
+环境变量：
+- PUBMED_BASELINE_WORKERS: 工作进程数（默认 CPU 核数）
+
+用法：
+    python skills/engines/pubmed_baseline.py <文件或目录 ...> -o coi.ndjson[.gz] [-j 进程数]
+    python skills/engines/pubmed_baseline.py --bench [-n 每文件篇数] [-f 文件数]
+"""
+
+import os
+import io
+import sys
+import gzip
+import json
+import time
+import multiprocessing
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+sys.path.append(str(Path(__file__).parent.parent))
+from engines.pubmed_article import iter_efetch_articles
+from engines.medical_engine import analyze_article_coi
+
+BASELINE_SUFFIXES = (".xml.gz", ".xml")
+
+
+def _default_workers() -> int:
+    try:
+        return max(1, int(os.getenv("PUBMED_BASELINE_WORKERS", "")))
+    except ValueError:
+        return os.cpu_count() or 1
+
+
+def iter_baseline_files(paths: Iterable[str]) -> Iterator[Path]:
+    """展开文件 / 目录参数，按文件名顺序产出 .xml.gz / .xml 文件"""
+    for raw in paths:
+        path = Path(raw)
+        if path.is_dir():
+            for child in sorted(path.iterdir()):
+                if child.is_file() and child.name.endswith(BASELINE_SUFFIXES):
+                    yield child
+        elif path.is_file():
+            yield path
+
+
+def _open_xml(path: Path):
+    return gzip.open(path, "rb") if path.name.endswith(".gz") else open(path, "rb")
+
+
+def mine_file(path: str) -> Tuple[str, List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    挖掘单个 baseline 文件（进程池工作函数）
+
+    Returns:
+        (文件名, 命中记录列表, {"articles", "findings", "elapsed_s", "cpu_s", "error"})
+    """
+    start = time.perf_counter()
+    cpu_start = time.process_time()
+    findings = []
+    articles = 0
+    error = None
+
+    try:
+        with _open_xml(Path(path)) as stream:
+            for article in iter_efetch_articles(stream):
+                articles += 1
+                finding = analyze_article_coi(article)
+                if finding is not None:
+                    finding["pub_date"] = article.pub_date
+                    findings.append(finding)
+    except Exception as e:
+        # 截断 / 损坏的文件只影响自身，已解析的文献照常输出
+        error = f"{type(e).__name__}: {str(e)}"
+
+    return Path(path).name, findings, {
+        "articles": articles,
+        "findings": len(findings),
+        "elapsed_s": round(time.perf_counter() - start, 3),
+        "cpu_s": round(time.process_time() - cpu_start, 3),
+        "error": error,
+    }
+
+
+def _open_output(output: str):
+    if output == "-":
+        return io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", write_through=True)
+    if output.endswith(".gz"):
+        return gzip.open(output, "wt", encoding="utf-8")
+    return open(output, "w", encoding="utf-8")
+
+
+def mine_baseline_coi(
+    paths: Iterable[str],
+    output: str,
+    workers: Optional[int] = None,
+    progress: bool = False
+) -> Dict[str, Any]:
+    """
+    对本地 baseline / updatefile 批量运行 COI 解析，写出 NDJSON
+
+    Args:
+        paths: 文件或目录列表
+        output: 输出路径（.gz 结尾时压缩，'-' 为标准输出）
+        workers: 工作进程数（默认 PUBMED_BASELINE_WORKERS 或 CPU 核数；1 表示在当前进程执行）
+        progress: 是否在 stderr 逐文件打印进度
+
+    Returns:
+        汇总统计（文件数、文献数、命中数、吞吐、逐文件明细）
+    """
+    files = [str(p) for p in iter_baseline_files(paths)]
+    workers = max(1, min(workers or _default_workers(), len(files) or 1))
+
+    totals = {"articles": 0, "findings": 0, "cpu_s": 0.0}
+    per_file = []
+    start = time.perf_counter()
+
+    out = _open_output(output)
+    try:
+        if workers == 1:
+            results = map(mine_file, files)
+            pool = None
+        else:
+            pool = multiprocessing.Pool(workers)
+            # 单个 baseline 文件约 3 万篇，按文件粒度分发即可摊薄进程间通信
+            results = pool.imap_unordered(mine_file, files, chunksize=1)
+
+        try:
+            for name, findings, file_stats in results:
+                for finding in findings:
+                    finding["source_file"] = name
+                    out.write(json.dumps(finding, ensure_ascii=False, separators=(",", ":")))
+                    out.write("\n")
+
+                totals["articles"] += file_stats["articles"]
+                totals["findings"] += file_stats["findings"]
+                totals["cpu_s"] += file_stats["cpu_s"]
+                per_file.append({"file": name, **file_stats})
+
+                if progress:
+                    rate = file_stats["articles"] / file_stats["elapsed_s"] if file_stats["elapsed_s"] else 0
+                    status = f"  错误: {file_stats['error']}" if file_stats["error"] else ""
+                    print(f"[{len(per_file)}/{len(files)}] {name}: {file_stats['articles']} 篇, "
+                          f"{file_stats['findings']} 条命中, {rate:.0f} 篇/秒{status}", file=sys.stderr)
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+    finally:
+        if output == "-":
+            out.flush()
+            out.detach()
+        else:
+            out.close()
+
+    elapsed = time.perf_counter() - start
+    return {
+        "files": len(files),
+        "workers": workers,
+        "articles": totals["articles"],
+        "findings": totals["findings"],
+        "elapsed_s": round(elapsed, 3),
+        "articles_per_s": round(totals["articles"] / elapsed, 1) if elapsed else 0.0,
+        "articles_per_s_per_core": round(totals["articles"] / totals["cpu_s"], 1) if totals["cpu_s"] else 0.0,
+        "failed_files": [f["file"] for f in per_file if f["error"]],
+        "per_file": sorted(per_file, key=lambda f: f["file"]),
+    }
+
+
+# ============================================================================
+# 基准测试：合成 baseline 文件（单进程 vs 进程池）
+# ============================================================================
+
+def _write_sample_baseline(path: Path, count: int, offset: int) -> None:
+    from xml.sax.saxutils import escape
+    from scrapers.entity_extractor import _sample_abstracts
+
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        f.write('<?xml version="1.0" encoding="utf-8"?>\n<PubmedArticleSet>\n')
+        for i, abstract in enumerate(_sample_abstracts(count)):
+            pmid = 30000000 + offset + i
+            f.write(
+                f'<PubmedArticle><MedlineCitation Status="MEDLINE" Owner="NLM"><PMID Version="1">{pmid}</PMID>'
+                f'<Article><Journal><JournalIssue><PubDate><Year>2024</Year><Month>Mar</Month></PubDate>'
+                f'</JournalIssue></Journal><ArticleTitle>Targeted protein degradation study {i}</ArticleTitle>'
+                f'<Abstract><AbstractText>{escape(abstract)}</AbstractText></Abstract>'
+                f'</Article></MedlineCitation></PubmedArticle>\n'
+            )
+        f.write('<DeleteCitation><PMID Version="1">1</PMID></DeleteCitation>\n</PubmedArticleSet>\n')
+
+
+def _run_benchmark(per_file: int = 5000, file_count: int = 4) -> None:
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = Path(tmp)
+        for n in range(file_count):
+            _write_sample_baseline(tmp_path / f"pubmed_sample{n:04d}.xml.gz", per_file, n * per_file)
+
+        print(f"合成 baseline: {file_count} 个文件 × {per_file} 篇")
+        for workers in sorted({1, min(file_count, _default_workers())}):
+            stats = mine_baseline_coi([tmp], str(tmp_path / "coi.ndjson.gz"), workers=workers)
+            print(f"  {workers} 进程: {stats['elapsed_s']:.2f}s  {stats['articles_per_s']:.0f} 篇/秒  "
+                  f"{stats['articles_per_s_per_core']:.0f} 篇/秒/核  命中 {stats['findings']} 篇")
+
+
+if __name__ == "__main__":
+    if "--bench" in sys.argv:
+        n = int(sys.argv[sys.argv.index("-n") + 1]) if "-n" in sys.argv else 5000
+        f = int(sys.argv[sys.argv.index("-f") + 1]) if "-f" in sys.argv else 4
+        _run_benchmark(n, f)
+        sys.exit(0)
+
+    if "-o" not in sys.argv:
+        print("用法: python3 pubmed_baseline.py <文件或目录 ...> -o <输出.ndjson[.gz]> [-j 进程数]")
+        print("      python3 pubmed_baseline.py --bench [-n 每文件篇数] [-f 文件数]")
+        sys.exit(1)
+
+    args = sys.argv[1:]
+    output = args[args.index("-o") + 1]
+    jobs = int(args[args.index("-j") + 1]) if "-j" in args else None
+    inputs = [a for i, a in enumerate(args) if not a.startswith("-") and (i == 0 or args[i - 1] not in ("-o", "-j"))]
+
+    summary = mine_baseline_coi(inputs, output, workers=jobs, progress=True)
+    summary.pop("per_file")
+    print(json.dumps(summary, ensure_ascii=False, indent=2), file=sys.stderr)
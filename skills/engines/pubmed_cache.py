@@ -0,0 +1,292 @@
+"""
+L1 引擎层：PubMed 响应缓存
+内存 LRU + 磁盘持久化两级缓存，由 medical_engine 的所有入口共享
+
+缓存键：
+- esearch: (query, retmax, sort)
+- article: 单篇 PMID（efetch 解析后的文献记录，不同查询之间复用）
+
+策略：
+- TTL 过期：条目超过 TTL 后视为未命中并删除
+- 容量淘汰：内存按条目数 LRU 淘汰，磁盘按总字节数淘汰最久未访问的文件
+- 命中统计：memory_hits / disk_hits / misses / evictions 计数
+- 编解码：命名空间可注册 codec，内存层保存解码后的对象，磁盘层保存 JSON 结构
+- 安全策略：缓存读写失败只记为未命中，绝不影响检索主流程
+
+环境变量：
+- PUBMED_CACHE_DIR: 磁盘缓存目录（默认 ~/.cache/lingnexus/pubmed）
+- PUBMED_CACHE_TTL_S: 条目有效期（秒，默认 86400；<=0 表示禁用缓存）
+- PUBMED_CACHE_MAX_MB: 磁盘缓存上限（MB，默认 256）
+- PUBMED_CACHE_MEMORY_ITEMS: 内存 LRU 条目上限（默认 2048）
+"""
+
+import os
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# 缓存默认配置
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "lingnexus" / "pubmed"
+DEFAULT_TTL_S = 86400
+DEFAULT_MAX_DISK_MB = 256
+DEFAULT_MEMORY_ITEMS = 2048
+
+# 磁盘淘汰时清理到上限的比例，避免每次写入都触发扫描
+EVICT_LOW_WATERMARK = 0.9
+
+
+def _env_int(name: str, default: int) -> int:
+    """读取整数环境变量，非法值回退到默认值"""
+    try:
+        return int(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+class PubMedCache:
+    """PubMed 两级缓存（内存 LRU + 磁盘 JSON）"""
+
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        ttl_s: int = DEFAULT_TTL_S,
+        max_disk_bytes: int = DEFAULT_MAX_DISK_MB * 1024 * 1024,
+        memory_items: int = DEFAULT_MEMORY_ITEMS
+    ):
+        self.cache_dir = Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR
+        self.ttl_s = ttl_s
+        self.max_disk_bytes = max_disk_bytes
+        self.memory_items = memory_items
+
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_bytes: Optional[int] = None  # 首次写入时扫描得到
+        self._codecs: Dict[str, Tuple[Callable, Callable]] = {}
+        self._stats = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "writes": 0,
+            "evictions": 0,
+        }
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_s > 0
+
+    def register_codec(self, namespace: str, encode: Callable, decode: Callable) -> None:
+        """
+        为命名空间注册编解码函数
+
+        Args:
+            namespace: 命名空间
+            encode: 对象 -> 可 JSON 序列化结构（写磁盘时调用）
+            decode: JSON 结构 -> 对象（读磁盘时调用，结果常驻内存层）
+        """
+        self._codecs[namespace] = (encode, decode)
+
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        """
+        读取缓存条目
+
+        Args:
+            namespace: 命名空间（'esearch' | 'article'）
+            key: 条目键
+
+        Returns:
+            缓存值，未命中或已过期时返回 None
+        """
+        if not self.enabled:
+            return None
+
+        digest = self._digest(namespace, key)
+        now = time.time()
+
+        with self._lock:
+            entry = self._memory.get(digest)
+            if entry is not None:
+                created_at, value = entry
+                if now - created_at < self.ttl_s:
+                    self._memory.move_to_end(digest)
+                    self._stats["memory_hits"] += 1
+                    return value
+                del self._memory[digest]
+
+        path = self._path(namespace, digest)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            created_at = float(entry["created_at"])
+            if now - created_at >= self.ttl_s:
+                self._remove_file(path)
+                raise KeyError(digest)
+            value = entry["value"]
+            if namespace in self._codecs:
+                value = self._codecs[namespace][1](value)
+            os.utime(path, None)  # 刷新访问时间，供磁盘 LRU 淘汰使用
+        except Exception:
+            with self._lock:
+                self._stats["misses"] += 1
+            return None
+
+        with self._lock:
+            self._remember(digest, created_at, value)
+            self._stats["disk_hits"] += 1
+        return value
+
+    def set(self, namespace: str, key: str, value: Any) -> None:
+        """写入缓存条目（value 必须可 JSON 序列化，或已注册 codec）"""
+        if not self.enabled:
+            return
+
+        digest = self._digest(namespace, key)
+        created_at = time.time()
+
+        with self._lock:
+            self._remember(digest, created_at, value)
+            self._stats["writes"] += 1
+
+        path = self._path(namespace, digest)
+        try:
+            if namespace in self._codecs:
+                value = self._codecs[namespace][0](value)
+            payload = json.dumps(
+                {"created_at": created_at, "key": key, "value": value},
+                ensure_ascii=False
+            ).encode("utf-8")
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(tmp_path, "wb") as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+        except Exception:
+            return
+
+        with self._lock:
+            if self._disk_bytes is None:
+                self._disk_bytes = self._scan_disk_bytes()
+            else:
+                self._disk_bytes += len(payload)
+            over_limit = self._disk_bytes > self.max_disk_bytes
+
+        if over_limit:
+            self._evict_disk()
+
+    def stats(self) -> Dict[str, Any]:
+        """返回命中/未命中计数及当前容量"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_items"] = len(self._memory)
+            stats["disk_bytes"] = self._disk_bytes
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = round((stats["memory_hits"] + stats["disk_hits"]) / lookups, 4) if lookups else 0.0
+        return stats
+
+    def clear(self) -> None:
+        """清空内存与磁盘缓存"""
+        with self._lock:
+            self._memory.clear()
+            self._disk_bytes = 0
+        for path in self._iter_files():
+            self._remove_file(path)
+
+    # ------------------------------------------------------------------
+    # 内部实现
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _digest(namespace: str, key: str) -> str:
+        return namespace + "-" + hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+    def _path(self, namespace: str, digest: str) -> Path:
+        return self.cache_dir / namespace / digest[-2:] / f"{digest}.json"
+
+    def _remember(self, digest: str, created_at: float, value: Any) -> None:
+        """写入内存 LRU（调用方持有锁）"""
+        self._memory[digest] = (created_at, value)
+        self._memory.move_to_end(digest)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def _iter_files(self):
+        if not self.cache_dir.exists():
+            return []
+        return [p for p in self.cache_dir.glob("*/*/*.json") if p.is_file()]
+
+    def _scan_disk_bytes(self) -> int:
+        total = 0
+        for path in self._iter_files():
+            try:
+                total += path.stat().st_size
+            except OSError:
+                continue
+        return total
+
+    def _evict_disk(self) -> None:
+        """按最久未访问顺序删除磁盘文件，直到低于低水位"""
+        files = []
+        for path in self._iter_files():
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            files.append((st.st_mtime, st.st_size, path))
+
+        total = sum(size for _, size, _ in files)
+        target = int(self.max_disk_bytes * EVICT_LOW_WATERMARK)
+        evicted = 0
+
+        for _, size, path in sorted(files, key=lambda f: f[0]):
+            if total <= target:
+                break
+            if self._remove_file(path):
+                total -= size
+                evicted += 1
+
+        with self._lock:
+            self._disk_bytes = total
+            self._stats["evictions"] += evicted
+
+    @staticmethod
+    def _remove_file(path: Path) -> bool:
+        try:
+            path.unlink()
+            return True
+        except OSError:
+            return False
+
+
+def esearch_key(query: str, retmax: int, sort: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """esearch 缓存键：(query, retmax, sort) + 可选的日期窗口等附加参数"""
+    key = [query, int(retmax), sort]
+    if params:
+        key.append(sorted(params.items()))
+    return json.dumps(key, ensure_ascii=False)
+
+
+_CACHE: Optional[PubMedCache] = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_pubmed_cache() -> PubMedCache:
+    """获取进程级共享缓存实例（按环境变量配置）"""
+    global _CACHE
+    with _CACHE_LOCK:
+        if _CACHE is None:
+            _CACHE = PubMedCache(
+                cache_dir=Path(os.getenv("PUBMED_CACHE_DIR", str(DEFAULT_CACHE_DIR))),
+                ttl_s=_env_int("PUBMED_CACHE_TTL_S", DEFAULT_TTL_S),
+                max_disk_bytes=_env_int("PUBMED_CACHE_MAX_MB", DEFAULT_MAX_DISK_MB) * 1024 * 1024,
+                memory_items=_env_int("PUBMED_CACHE_MEMORY_ITEMS", DEFAULT_MEMORY_ITEMS)
+            )
+        return _CACHE
+
+
+def get_pubmed_cache_stats() -> Dict[str, Any]:
+    """返回共享缓存的命中统计"""
+    return get_pubmed_cache().stats()
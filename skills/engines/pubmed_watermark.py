@@ -0,0 +1,102 @@
+"""
+L1 引擎层：PubMed 增量抓取水位线
+为每个检索式记录上次运行日期与已处理的 PMID，供 delta 模式只抓取新文献
+
+存储：
+- 每个检索式一个 JSON 文件（文件名为检索式 + 参数的 SHA1）
+- 写入采用临时文件 + os.replace，避免并发运行写出半截文件
+- 已见 PMID 超过上限时保留数值最大的部分（PMID 随入库时间递增），
+  被淘汰的最大 PMID 记为 seen_floor，不大于它的 PMID 一律视为已见，淘汰后不会被当作新文献重新返回
+- 单次运行处理不完的候选 PMID 记为 pending_pmids，下次运行优先处理
+
+环境变量：
+- PUBMED_WATERMARK_DIR: 水位线目录（默认 ~/.cache/lingnexus/pubmed_watermarks）
+"""
+
+import os
+import json
+import time
+import hashlib
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+DEFAULT_WATERMARK_DIR = Path.home() / ".cache" / "lingnexus" / "pubmed_watermarks"
+
+# 单个检索式最多保留的已见 PMID 数
+MAX_SEEN_PMIDS = 50000
+
+
+def _watermark_dir() -> Path:
+    return Path(os.getenv("PUBMED_WATERMARK_DIR", str(DEFAULT_WATERMARK_DIR)))
+
+
+def watermark_key(term: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """水位线键：编译后的检索式 + esearch 附加参数"""
+    raw = json.dumps([term, sorted((params or {}).items())], ensure_ascii=False)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def load_watermark(key: str) -> Optional[Dict[str, Any]]:
+    """
+    读取水位线
+
+    Returns:
+        {"term", "last_run", "seen_pmids"(set), "seen_floor"(int), "pending_pmids"(list), "runs"}，
+        不存在或损坏时返回 None
+    """
+    path = _watermark_dir() / f"{key}.json"
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        data["seen_pmids"] = set(data.get("seen_pmids", []))
+        data["seen_floor"] = int(data.get("seen_floor", 0))
+        data["pending_pmids"] = list(data.get("pending_pmids", []))
+        return data
+    except Exception:
+        return None
+
+
+def save_watermark(key: str, term: str, seen_pmids: Iterable[str], last_run: Optional[str] = None,
+                   runs: int = 1, pending_pmids: Optional[List[str]] = None, seen_floor: int = 0) -> None:
+    """
+    写入水位线（原子替换）
+
+    Args:
+        key: watermark_key 生成的键
+        term: 检索式（仅用于排查）
+        seen_pmids: 已处理的 PMID 集合
+        last_run: 本次运行日期（YYYY/MM/DD，默认今天）
+        runs: 累计运行次数
+        pending_pmids: 已检索到但尚未处理的 PMID（下次运行优先处理）
+        seen_floor: 之前淘汰的最大 PMID
+    """
+    seen = sorted(set(seen_pmids), key=lambda p: int(p) if p.isdigit() else 0)
+    if len(seen) > MAX_SEEN_PMIDS:
+        evicted, seen = seen[:-MAX_SEEN_PMIDS], seen[-MAX_SEEN_PMIDS:]
+        seen_floor = max([seen_floor] + [int(p) for p in evicted if p.isdigit()])
+
+    data = {
+        "term": term,
+        "last_run": last_run or time.strftime("%Y/%m/%d"),
+        "runs": runs,
+        "seen_floor": seen_floor,
+        "seen_pmids": seen,
+        "pending_pmids": list(pending_pmids or []),
+    }
+
+    directory = _watermark_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{key}.json"
+    tmp_path = directory / f"{key}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def reset_watermark(key: str) -> bool:
+    """删除水位线，下次运行回到全量模式"""
+    try:
+        (_watermark_dir() / f"{key}.json").unlink()
+        return True
+    except OSError:
+        return False
@@ -0,0 +1,168 @@
+"""
+L1 引擎层：在途请求合并（single-flight）
+相同参数的调用同时在途时只执行一次底层调用，其余调用者等待并共享结果
+（如多个专利数据源同时回退到同一 PubMed 查询、两个任务同时抓取同一 Google Patents 页面）
+
+- 同步接口按线程等待（threading.Event），异步接口按事件循环共享同一个 Task
+- 底层调用抛出的异常同样传给所有等待者；调用结束即移出在途表，之后的调用重新执行（缓存由各引擎自己负责）
+- 有调用者合并进来时，每个调用者（包括发起者）都拿到非字符串结果的独立深拷贝，
+  原始结果不交给任何调用者，拷贝期间不会被修改；没有合并时发起者直接拿到原始结果
+- 异步调用者全部取消时才取消底层 Task
+
+环境变量：
+- SINGLE_FLIGHT_ENABLED: 设为 0 时关闭合并，每次调用都直接执行（默认开启）
+"""
+
+import os
+import copy
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+from engines.async_http import loop_local
+
+
+def _single_flight_enabled() -> bool:
+    return os.getenv("SINGLE_FLIGHT_ENABLED", "1").lower() not in ("0", "false", "no")
+
+
+def _share(result: Any) -> Any:
+    return result if isinstance(result, (str, bytes, int, float, type(None))) else copy.deepcopy(result)
+
+
+class _Call:
+    """一次在途的同步调用"""
+    __slots__ = ("event", "result", "error", "followers")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+        self.followers = 0
+
+
+class SingleFlight:
+    """按 key 合并同时在途的相同调用（一个实例对应一个命名空间，如 'medical'）"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self._stats = {"calls": 0, "executions": 0, "coalesced": 0, "errors": 0}
+
+    def do(self, key: Hashable, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        执行 func(*args, **kwargs)；相同 key 的调用已在途时等待它并共享结果
+
+        Raises:
+            底层调用的异常（所有等待者收到同一个异常）
+        """
+        if not _single_flight_enabled():
+            return func(*args, **kwargs)
+
+        with self._lock:
+            self._stats["calls"] += 1
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                call.followers += 1
+                self._stats["coalesced"] += 1
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return _share(call.result)
+
+        try:
+            call.result = func(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            with self._lock:
+                self._stats["errors"] += 1
+            raise
+        finally:
+            with self._lock:
+                self._stats["executions"] += 1
+                self._calls.pop(key, None)
+            call.event.set()
+
+        # 移出在途表后不会再有调用者加入；有等待者时发起者同样拿拷贝，原始结果只作为拷贝来源
+        return _share(call.result) if call.followers else call.result
+
+    async def do_async(self, key: Hashable, func: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        """do 的异步版本：同一事件循环内相同 key 的调用共享一个 Task"""
+        if not _single_flight_enabled():
+            return await func(*args, **kwargs)
+
+        in_flight: Dict[Hashable, list] = loop_local(f"single_flight:{self.name}", dict)
+        entry = in_flight.get(key)
+        with self._lock:
+            self._stats["calls"] += 1
+            if entry is not None:
+                self._stats["coalesced"] += 1
+
+        if entry is None:
+            entry = in_flight[key] = [None, 0]
+            entry[0] = task = asyncio.ensure_future(self._run_async(in_flight, key, entry, func, args, kwargs))
+            task.add_done_callback(self._finish_async)
+            leader = True
+        else:
+            leader = False
+
+        task = entry[0]
+        entry[1] += 1
+        try:
+            result = await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if not task.done():
+                entry[1] -= 1
+                if entry[1] == 0:
+                    task.cancel()  # 所有调用者都已取消
+            raise
+        # Task 结束前已移出在途表，entry[1] 不再增加；只有发起者一人时直接返回原始结果
+        return result if leader and entry[1] == 1 else _share(result)
+
+    @staticmethod
+    async def _run_async(in_flight: Dict[Hashable, list], key: Hashable, entry: list,
+                         func: Callable[..., Awaitable[Any]], args: tuple, kwargs: dict) -> Any:
+        """执行底层调用，并在 Task 结束前移出在途表（之后的调用重新执行，不会再合并到已完成的结果上）"""
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            if in_flight.get(key) is entry:
+                del in_flight[key]
+
+    def _finish_async(self, task: "asyncio.Future") -> None:
+        with self._lock:
+            self._stats["executions"] += 1
+            if task.cancelled() or task.exception() is not None:
+                self._stats["errors"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["in_flight"] = len(self._calls)
+        stats["coalesce_rate"] = round(stats["coalesced"] / stats["calls"], 4) if stats["calls"] else 0.0
+        return stats
+
+
+_GROUPS: Dict[str, SingleFlight] = {}
+_GROUPS_LOCK = threading.Lock()
+
+
+def get_single_flight(name: str) -> SingleFlight:
+    """获取命名空间对应的进程级合并器（如 'medical'、'patent'、'browser'）"""
+    with _GROUPS_LOCK:
+        if name not in _GROUPS:
+            _GROUPS[name] = SingleFlight(name)
+        return _GROUPS[name]
+
+
+def get_single_flight_stats() -> Dict[str, Dict[str, Any]]:
+    """各命名空间的调用数 / 实际执行数 / 被合并的调用数"""
+    with _GROUPS_LOCK:
+        groups = dict(_GROUPS)
+    return {name: group.stats() for name, group in groups.items()}
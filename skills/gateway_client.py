@@ -0,0 +1,205 @@
+"""
+L0 智能网关：常驻服务瘦客户端
+只依赖标准库，把 CLI 请求转发给 gateway_server，省去解释器内导入 Biopython / BeautifulSoup /
+三个引擎的启动开销；服务未运行时返回 None，由调用方回退到进程内执行
+
+协议（每行一个 JSON，同一连接可连续发送多个请求）：
+    请求: {"op": "search", "query": "...", "domain": "pubmed", "format": "text"}
+    响应: {"ok": true, "result": "..."}
+    请求: {"op": "batch", "requests": [{"query", "domain", "format"}, ...]}
+    响应: 每完成一项一行 {"item": {...}}，最后一行 {"done": true}
+    请求: {"op": "ping"} / {"op": "stats"} / {"op": "shutdown"}
+    出错: {"ok": false, "error": "..."}
+
+环境变量：
+- GATEWAY_SOCKET: Unix socket 路径（默认 ~/.cache/lingnexus/gateway.sock）
+- GATEWAY_ADDR: 改用 TCP 监听地址（如 127.0.0.1:8765，优先于 GATEWAY_SOCKET）
+- GATEWAY_CLIENT: auto（默认，服务可用时转发）| off（始终进程内执行）| required（服务不可用时报错）
+- GATEWAY_CLIENT_TIMEOUT_S: 单次请求超时（默认 600 秒）
+"""
+
+import os
+import sys
+import json
+import socket
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+DEFAULT_SOCKET_PATH = Path.home() / ".cache" / "lingnexus" / "gateway.sock"
+DEFAULT_TIMEOUT_S = 600
+
+
+class GatewayUnavailable(Exception):
+    """常驻服务未运行或无法连接"""
+
+
+def gateway_address() -> Union[str, Tuple[str, int]]:
+    """服务地址：GATEWAY_ADDR 指定时为 (host, port)，否则为 Unix socket 路径"""
+    addr = os.getenv("GATEWAY_ADDR")
+    if addr:
+        host, _, port = addr.rpartition(":")
+        return (host or "127.0.0.1", int(port))
+    return os.getenv("GATEWAY_SOCKET", str(DEFAULT_SOCKET_PATH))
+
+
+def _connect(timeout: float) -> socket.socket:
+    address = gateway_address()
+    if isinstance(address, str):
+        if not hasattr(socket, "AF_UNIX") or not os.path.exists(address):
+            raise GatewayUnavailable(f"网关服务未运行: {address}")
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    else:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(address)
+    except OSError as e:
+        sock.close()
+        raise GatewayUnavailable(f"网关服务连接失败: {address} - {e}")
+    return sock
+
+
+class GatewayClient:
+    """常驻网关服务客户端（一个实例对应一条连接，可连续发送多个请求）"""
+
+    def __init__(self, timeout: Optional[float] = None):
+        if timeout is None:
+            try:
+                timeout = float(os.getenv("GATEWAY_CLIENT_TIMEOUT_S", str(DEFAULT_TIMEOUT_S)))
+            except ValueError:
+                timeout = DEFAULT_TIMEOUT_S
+        self._sock = _connect(timeout)
+        self._reader = self._sock.makefile("r", encoding="utf-8")
+
+    def search(self, query: str, domain: str, output_format: str = "text") -> str:
+        """与 global_intelligence_search 相同的调用约定"""
+        response = self._call({"op": "search", "query": query, "domain": domain, "format": output_format})
+        if not response.get("ok"):
+            return f"L0 网关兜底捕获异常: GatewayError - {response.get('error')}"
+        return response["result"]
+
+    def batch(self, requests: List[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """与 batch_intelligence_search 相同的产出结构，按完成顺序流式返回"""
+        self._send({"op": "batch", "requests": requests})
+        while True:
+            response = self._receive()
+            if response.get("done"):
+                return
+            if "item" in response:
+                yield response["item"]
+            elif not response.get("ok", True):
+                raise GatewayUnavailable(response.get("error") or "批量请求失败")
+
+    def ping(self) -> Dict[str, Any]:
+        return self._call({"op": "ping"})
+
+    def stats(self) -> Dict[str, Any]:
+        return self._call({"op": "stats"})
+
+    def shutdown(self) -> Dict[str, Any]:
+        return self._call({"op": "shutdown"})
+
+    def close(self) -> None:
+        try:
+            self._reader.close()
+        finally:
+            self._sock.close()
+
+    def __enter__(self) -> "GatewayClient":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _call(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        self._send(payload)
+        return self._receive()
+
+    def _send(self, payload: Dict[str, Any]) -> None:
+        try:
+            self._sock.sendall((json.dumps(payload, ensure_ascii=False) + "\n").encode("utf-8"))
+        except OSError as e:
+            raise GatewayUnavailable(f"网关服务写入失败: {e}")
+
+    def _receive(self) -> Dict[str, Any]:
+        try:
+            line = self._reader.readline()
+        except OSError as e:
+            raise GatewayUnavailable(f"网关服务读取失败: {e}")
+        if not line:
+            raise GatewayUnavailable("网关服务连接已关闭")
+        return json.loads(line)
+
+
+def forward_cli(argv: List[str]) -> Optional[int]:
+    """
+    把 global_search_skill.py 的命令行请求转发给常驻服务
+
+    Args:
+        argv: sys.argv
+
+    Returns:
+        已由服务处理时返回退出码；服务不可用（或 GATEWAY_CLIENT=off / 参数不完整）时返回 None，
+        调用方应在进程内执行
+    """
+    mode = os.getenv("GATEWAY_CLIENT", "auto").lower()
+    if mode == "off":
+        return None
+
+    batch = "--batch" in argv
+    if not batch and len(argv) < 3:
+        return None  # 用法提示由进程内入口输出
+
+    try:
+        if batch:
+            index = argv.index("--batch")
+            source = argv[index + 1] if len(argv) > index + 1 else "-"
+            # 先连接再读取请求：服务不可用时标准输入尚未消费，进程内执行仍可读取
+            with GatewayClient() as client:
+                try:
+                    requests = _read_batch_requests(source)
+                except (OSError, ValueError) as e:
+                    print(f"错误: 无法读取批量请求 {source}: {type(e).__name__} - {str(e)}")
+                    return 1
+                try:
+                    for item in client.batch(requests):
+                        print(json.dumps(item, ensure_ascii=False), flush=True)
+                except GatewayUnavailable as e:
+                    # 请求已被消费且可能已部分输出，不能回退到进程内重跑
+                    print(f"错误: 批量请求中断: {e}")
+                    return 1
+            return 0
+
+        output_format = "json" if "--json" in argv else "text"
+        with GatewayClient() as client:
+            print(client.search(argv[1], argv[2], output_format))
+        return 0
+
+    except GatewayUnavailable as e:
+        if mode == "required":
+            print(f"错误: {e}")
+            return 1
+        return None
+
+
+def _read_batch_requests(source: str) -> List[Dict[str, Any]]:
+    handle = sys.stdin if source == "-" else open(source, "r", encoding="utf-8")
+    try:
+        return [json.loads(line) for line in handle if line.strip()]
+    finally:
+        if handle is not sys.stdin:
+            handle.close()
+
+
+if __name__ == "__main__":
+    # 服务管理：python skills/gateway_client.py ping | stats | shutdown
+    command = sys.argv[1] if len(sys.argv) > 1 else "ping"
+    if command not in ("ping", "stats", "shutdown"):
+        print("用法: python3 gateway_client.py [ping|stats|shutdown]")
+        sys.exit(1)
+    try:
+        with GatewayClient(timeout=10) as client:
+            print(json.dumps(getattr(client, command)(), ensure_ascii=False, indent=2))
+    except GatewayUnavailable as e:
+        print(f"错误: {e}")
+        sys.exit(1)
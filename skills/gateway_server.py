@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+L0 智能网关：常驻服务模式
+启动一次解释器并导入全部引擎，之后在本地 Unix socket（或 TCP 端口）上持续接收
+(query, domain, format) 请求；PubMed 缓存、页面缓存、keep-alive 连接池、NCBI 令牌桶在请求之间保持常驻
+
+- 协议与瘦客户端见 gateway_client（global_search_skill.py 在服务运行时自动转发，CLI 约定不变）
+- 每个连接一个线程，同一连接可连续发送多个请求；批量请求复用 batch_intelligence_search 流式返回
+- 每个请求仍经过 global_intelligence_search 的兜底错误约定，服务本身不会因单个请求崩溃
+
+用法：
+    python skills/gateway_server.py [--socket PATH | --port N]
+    python skills/gateway_client.py stats | shutdown
+    python skills/gateway_server.py --bench [-n 20]     # 冷启动 CLI vs 常驻服务延迟
+"""
+
+import os
+import sys
+import json
+import time
+import signal
+import importlib
+import socket
+import threading
+import socketserver
+from pathlib import Path
+from typing import Any, Dict, Tuple, Union
+
+sys.path.append(str(Path(__file__).parent))
+from gateway_client import GatewayClient, GatewayUnavailable, gateway_address
+from global_search_skill import batch_intelligence_search, global_intelligence_search
+from domain_registry import get_domain_registry_stats
+
+from engines.pubmed_cache import get_pubmed_cache, get_pubmed_cache_stats
+from engines.page_cache import get_page_cache, get_page_cache_stats
+from engines.http_pool import get_http_pool
+from engines.ncbi_rate_limiter import get_ncbi_rate_limiter, get_ncbi_rate_limiter_stats
+from engines.browser_engine import get_fetch_path_stats
+from engines.single_flight import get_single_flight_stats
+from engines.patent_engine import get_patent_hedge_stats
+from scrapers.data_cleaner import clean_html_to_text
+
+_SERVER_STATS: Dict[str, Any] = {"started_at": None, "connections": 0, "requests": 0, "errors": 0}
+_SERVER_STATS_LOCK = threading.Lock()
+
+
+def _warm_up() -> None:
+    """预先初始化进程级单例（缓存索引、连接池、令牌桶、HTML 解析后端）"""
+    # 网关本身按 domain 延迟导入引擎，常驻服务启动时一次性加载全部内置引擎
+    importlib.import_module("engines.medical_engine")
+    importlib.import_module("engines.patent_engine")
+    get_pubmed_cache()
+    get_page_cache()
+    get_http_pool()
+    get_ncbi_rate_limiter()
+    clean_html_to_text("<html><body><p>warm up</p></body></html>")
+
+
+def server_stats() -> Dict[str, Any]:
+    """服务与各引擎的常驻状态统计"""
+    with _SERVER_STATS_LOCK:
+        stats = dict(_SERVER_STATS)
+    stats["uptime_s"] = round(time.time() - stats.pop("started_at"), 1) if stats["started_at"] else 0.0
+    stats["pid"] = os.getpid()
+    stats["pubmed_cache"] = get_pubmed_cache_stats()
+    stats["page_cache"] = get_page_cache_stats()
+    stats["http_pool"] = get_http_pool().stats()
+    stats["ncbi_rate_limiter"] = get_ncbi_rate_limiter_stats()
+    stats["fetch_paths"] = get_fetch_path_stats()
+    stats["domains"] = get_domain_registry_stats()
+    stats["single_flight"] = get_single_flight_stats()
+    stats["patent_hedge"] = get_patent_hedge_stats()
+    return stats
+
+
+class GatewayRequestHandler(socketserver.StreamRequestHandler):
+    """逐行读取 JSON 请求并写回响应，直到客户端关闭连接"""
+
+    def handle(self) -> None:
+        with _SERVER_STATS_LOCK:
+            _SERVER_STATS["connections"] += 1
+
+        for raw in self.rfile:
+            if not raw.strip():
+                continue
+            with _SERVER_STATS_LOCK:
+                _SERVER_STATS["requests"] += 1
+            try:
+                request = json.loads(raw)
+                if not self._dispatch(request):
+                    return
+            except (BrokenPipeError, ConnectionResetError):
+                return
+            except Exception as e:
+                with _SERVER_STATS_LOCK:
+                    _SERVER_STATS["errors"] += 1
+                try:
+                    self._reply({"ok": False, "error": f"{type(e).__name__}: {str(e)}"})
+                except OSError:
+                    return
+
+    def _dispatch(self, request: Dict[str, Any]) -> bool:
+        """处理单个请求，返回 False 表示关闭连接"""
+        op = request.get("op", "search")
+
+        if op == "search":
+            result = global_intelligence_search(
+                request.get("query"), request.get("domain"), request.get("format") or "text"
+            )
+            self._reply({"ok": True, "result": result})
+        elif op == "batch":
+            for item in batch_intelligence_search(request.get("requests") or []):
+                self._reply({"item": item})
+            self._reply({"done": True})
+        elif op == "ping":
+            self._reply({"ok": True, "pid": os.getpid()})
+        elif op == "stats":
+            self._reply(dict(server_stats(), ok=True))
+        elif op == "shutdown":
+            self._reply({"ok": True})
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+            return False
+        else:
+            self._reply({"ok": False, "error": f"不支持的操作: {op}"})
+        return True
+
+    def _reply(self, payload: Dict[str, Any]) -> None:
+        self.wfile.write((json.dumps(payload, ensure_ascii=False) + "\n").encode("utf-8"))
+        self.wfile.flush()
+
+
+if hasattr(socketserver, "ThreadingUnixStreamServer"):
+    class _UnixGatewayServer(socketserver.ThreadingUnixStreamServer):
+        daemon_threads = True
+
+
+class _TCPGatewayServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+def _prepare_socket_path(path: str) -> None:
+    """清理残留的 socket 文件；已有服务在监听时报错"""
+    if not os.path.exists(path):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except OSError:
+        os.unlink(path)  # 上次未正常退出留下的 socket 文件
+        return
+    finally:
+        probe.close()
+    raise RuntimeError(f"网关服务已在运行: {path}")
+
+
+def serve(address: Union[str, Tuple[str, int], None] = None) -> None:
+    """
+    启动常驻网关服务（阻塞直到收到 shutdown 请求或 SIGTERM / SIGINT）
+
+    Args:
+        address: Unix socket 路径或 (host, port)，默认按 GATEWAY_ADDR / GATEWAY_SOCKET
+    """
+    address = address or gateway_address()
+    _warm_up()
+
+    if isinstance(address, str):
+        _prepare_socket_path(address)
+        server = _UnixGatewayServer(address, GatewayRequestHandler)
+        os.chmod(address, 0o600)
+    else:
+        server = _TCPGatewayServer(address, GatewayRequestHandler)
+
+    def _stop(signum, frame):
+        threading.Thread(target=server.shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGTERM, _stop)
+    signal.signal(signal.SIGINT, _stop)
+
+    with _SERVER_STATS_LOCK:
+        _SERVER_STATS["started_at"] = time.time()
+    print(f"🟢 L0 网关服务已启动: {address}（pid {os.getpid()}）", file=sys.stderr, flush=True)
+
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        if isinstance(address, str) and os.path.exists(address):
+            os.unlink(address)
+        print("🔴 L0 网关服务已停止", file=sys.stderr, flush=True)
+
+
+# ============================================================================
+# 基准测试：每次启动解释器（冷 CLI）vs 常驻服务
+# ============================================================================
+
+def _run_benchmark(runs: int = 20) -> None:
+    import subprocess
+    import tempfile
+
+    skill = str(Path(__file__).parent / "global_search_skill.py")
+    # 不支持的 domain 在网关内立即返回错误信息，不发出网络请求，测得的即为启动 + 导入 + 通信开销
+    command = [sys.executable, skill, "PROTAC BRD4", "bench_noop"]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sock_path = os.path.join(tmp, "gateway.sock")
+        env = dict(os.environ, GATEWAY_SOCKET=sock_path)
+        env.pop("GATEWAY_ADDR", None)
+
+        def _timed(extra_env: Dict[str, str]) -> list:
+            samples = []
+            for _ in range(runs):
+                start = time.perf_counter()
+                subprocess.run(command, env=dict(env, **extra_env), capture_output=True, check=False)
+                samples.append(time.perf_counter() - start)
+            return samples
+
+        cold = _timed({"GATEWAY_CLIENT": "off"})
+
+        server = subprocess.Popen([sys.executable, __file__, "--socket", sock_path], env=env,
+                                  stderr=subprocess.DEVNULL)
+        try:
+            os.environ["GATEWAY_SOCKET"] = sock_path
+            for _ in range(100):
+                try:
+                    with GatewayClient(timeout=5) as client:
+                        client.ping()
+                    break
+                except GatewayUnavailable:
+                    time.sleep(0.1)
+
+            warm_cli = _timed({"GATEWAY_CLIENT": "required"})
+
+            with GatewayClient(timeout=30) as client:
+                warm_inproc = []
+                for _ in range(runs):
+                    start = time.perf_counter()
+                    client.search("PROTAC BRD4", "bench_noop")
+                    warm_inproc.append(time.perf_counter() - start)
+                client.shutdown()
+        finally:
+            try:
+                server.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                server.kill()
+
+    def _fmt(samples):
+        ordered = sorted(samples)
+        return f"中位数 {ordered[len(ordered) // 2] * 1000:8.1f} ms  最小 {ordered[0] * 1000:8.1f} ms"
+
+    print(f"{runs} 次调用（domain=bench_noop，不含网络请求）")
+    print(f"  冷启动 CLI（每次新解释器 + 导入全部引擎）  {_fmt(cold)}")
+    print(f"  瘦客户端 CLI → 常驻服务                    {_fmt(warm_cli)}")
+    print(f"  常驻服务（复用连接，仅通信开销）           {_fmt(warm_inproc)}")
+
+
+if __name__ == "__main__":
+    if "--bench" in sys.argv:
+        n = int(sys.argv[sys.argv.index("-n") + 1]) if "-n" in sys.argv else 20
+        _run_benchmark(n)
+        sys.exit(0)
+
+    if "--socket" in sys.argv:
+        target = sys.argv[sys.argv.index("--socket") + 1]
+    elif "--port" in sys.argv:
+        target = ("127.0.0.1", int(sys.argv[sys.argv.index("--port") + 1]))
+    else:
+        target = None
+
+    try:
+        serve(target)
+    except Exception as e:
+        print(f"错误: 网关服务启动失败: {type(e).__name__} - {str(e)}")
+        sys.exit(1)
@@ -2,19 +2,33 @@
 """
 L0 智能网关：全局情报搜索统一入口
 安全策略：最后一层兜底防线，捕获所有越界逃逸错误
+
+批量入口（batch_intelligence_search）：
+- 一次提交多个 (query, domain, options)，在有界线程池上并发执行
+- 每个 domain 有独立并发上限（如 PubMed 受 NCBI 限额约束、浏览器会话开销大）
+- 结果按完成顺序流式产出，每一项都遵循与单次调用相同的兜底错误约定
+
+domain 分发见 domain_registry：各引擎在对应 domain 首次被调用时才导入，
+插件（GATEWAY_PLUGINS）可注册新的 domain；python global_search_skill.py --bench-import 测量导入开销
+
+环境变量：
+- GATEWAY_BATCH_WORKERS: 批量模式线程池大小（默认 8）
+- GATEWAY_DOMAIN_LIMITS: 各 domain 并发上限，如 "pubmed=3,general_web=4"（未列出的 domain 默认 2）
 """
 
+import os
 import sys
 import json
+import time
 from pathlib import Path
 from enum import Enum
+from typing import Any, Dict, Iterable, Iterator, Optional
 
 # 添加引擎路径
 sys.path.append(str(Path(__file__).parent.parent))
+sys.path.append(str(Path(__file__).parent))
 
-from engines.medical_engine import search_medical_db, search_medical_db_json
-from engines.browser_engine import fetch_webpage_content
-from engines.patent_engine import search_patent_db, PatentDatabase
+from domain_registry import register_domain, registered_domains, resolve_domain
 
 
 class SearchDomain(str, Enum):
@@ -26,6 +40,56 @@ class SearchDomain(str, Enum):
     PATENT_JPLATPAT = "patent_jplatpat"
     PATENT_GOOGLE = "patent_google"
     PATENT_ESPACENET = "patent_espacenet"
+    PATENT_ALL = "patent_all"
+
+
+# ============================================================================
+# 内置搜索域：引擎在处理函数内导入，首次使用该 domain 时才加载
+# ============================================================================
+
+def _search_pubmed(query: str, output_format: str) -> str:
+    from engines.medical_engine import search_medical_db, search_medical_db_json
+
+    if output_format == 'json':
+        articles = search_medical_db_json(query, source='pubmed', max_results=10)
+        return json.dumps(articles, ensure_ascii=False)
+    result = search_medical_db(query, source='pubmed', max_results=10)
+    return f"=== PubMed 检索结果 ===\n关键词: {query}\n\n{result}"
+
+
+def _fetch_general_web(query: str, output_format: str) -> str:
+    from engines.browser_engine import fetch_webpage_content
+
+    result = fetch_webpage_content(query, timeout=15)
+    return f"=== 网页抓取结果 ===\nURL: {query}\n\n{result}"
+
+
+def _patent_handler(database: str):
+    """专利检索处理函数（database 为 PatentDatabase 成员名）"""
+    def _search_patent(query: str, output_format: str) -> str:
+        from engines.patent_engine import search_patent_db, PatentDatabase
+
+        return search_patent_db(query, PatentDatabase[database])
+    return _search_patent
+
+
+def _search_all_patents(query: str, output_format: str) -> str:
+    from engines.patent_engine import search_all_patent_dbs, format_all_patent_result
+
+    result = search_all_patent_dbs(query)
+    if output_format == 'json':
+        return json.dumps(result, ensure_ascii=False)
+    return format_all_patent_result(result)
+
+
+register_domain(SearchDomain.PUBMED.value, _search_pubmed, "PubMed 文献检索（含 COI 解析）", "engines.medical_engine")
+register_domain(SearchDomain.GENERAL_WEB.value, _fetch_general_web, "通用网页抓取（query 为 URL）", "engines.browser_engine")
+register_domain(SearchDomain.PATENT_YAOZH.value, _patent_handler("YAOZH"), "药智网专利", "engines.patent_engine")
+register_domain(SearchDomain.PATENT_CNIPA.value, _patent_handler("CNIPA"), "中国国家知识产权局", "engines.patent_engine")
+register_domain(SearchDomain.PATENT_JPLATPAT.value, _patent_handler("JPLATPAT"), "日本 J-PlatPat", "engines.patent_engine")
+register_domain(SearchDomain.PATENT_GOOGLE.value, _patent_handler("GOOGLE_PATENTS"), "Google Patents", "engines.patent_engine")
+register_domain(SearchDomain.PATENT_ESPACENET.value, _patent_handler("ESPACENET"), "欧洲专利局 Espacenet", "engines.patent_engine")
+register_domain(SearchDomain.PATENT_ALL.value, _search_all_patents, "全部专利数据源并发检索，按专利号合并", "engines.patent_engine")
 
 
 def global_intelligence_search(query: str, domain: str, output_format: str = 'text') -> str:
@@ -34,7 +98,7 @@ def global_intelligence_search(query: str, domain: str, output_format: str = 'te
 
     Args:
         query: 搜索关键词（PubMed）或目标 URL（通用网页）
-        domain: 搜索域 ('pubmed' | 'general_web')
+        domain: 搜索域（内置见 SearchDomain，插件 domain 见 domain_registry）
         output_format: 输出格式 ('text' | 'json')，json 模式返回结构化列表
 
     Returns:
@@ -48,58 +112,237 @@ def global_intelligence_search(query: str, domain: str, output_format: str = 'te
         if not domain or not isinstance(domain, str):
             return "错误: domain 参数无效，必须为非空字符串"
 
-        domain_lower = domain.lower().strip()
+        # 路由逻辑：按注册表分发
+        handler = resolve_domain(domain)
+        if handler is None:
+            supported = ", ".join(registered_domains())
+            return f"错误: 不支持的 domain '{domain}'，支持的域: {supported}"
+
+        return handler(query, output_format)
+
+    except Exception as e:
+        # 最后一层兜底防线
+        return f"L0 网关兜底捕获异常: {type(e).__name__} - {str(e)}"
 
-        # 路由逻辑
-        if domain_lower == SearchDomain.PUBMED:
-            if output_format == 'json':
-                articles = search_medical_db_json(query, source='pubmed', max_results=10)
-                return json.dumps(articles, ensure_ascii=False)
-            else:
-                result = search_medical_db(query, source='pubmed', max_results=10)
-                return f"=== PubMed 检索结果 ===\n关键词: {query}\n\n{result}"
 
-        elif domain_lower == SearchDomain.GENERAL_WEB:
-            # 路由到浏览器引擎
-            result = fetch_webpage_content(query, timeout=15)
-            return f"=== 网页抓取结果 ===\nURL: {query}\n\n{result}"
+# 批量模式默认配置
+DEFAULT_BATCH_WORKERS = 8
+DEFAULT_DOMAIN_LIMITS = {
+    SearchDomain.PUBMED.value: 3,        # 与 NCBI 无 API Key 限额（3 次/秒）一致
+    SearchDomain.GENERAL_WEB.value: 4,
+}
+DEFAULT_DOMAIN_LIMIT = 2
 
-        elif domain_lower == SearchDomain.PATENT_YAOZH:
-            result = search_patent_db(query, PatentDatabase.YAOZH)
-            return result
 
-        elif domain_lower == SearchDomain.PATENT_CNIPA:
-            result = search_patent_db(query, PatentDatabase.CNIPA)
-            return result
+def _batch_config() -> tuple:
+    """读取批量模式线程池大小与各 domain 并发上限"""
+    try:
+        workers = max(1, int(os.getenv("GATEWAY_BATCH_WORKERS", str(DEFAULT_BATCH_WORKERS))))
+    except ValueError:
+        workers = DEFAULT_BATCH_WORKERS
 
-        elif domain_lower == SearchDomain.PATENT_JPLATPAT:
-            result = search_patent_db(query, PatentDatabase.JPLATPAT)
-            return result
+    limits = dict(DEFAULT_DOMAIN_LIMITS)
+    for entry in os.getenv("GATEWAY_DOMAIN_LIMITS", "").split(","):
+        name, _, value = entry.partition("=")
+        try:
+            limits[name.strip().lower()] = max(1, int(value))
+        except ValueError:
+            continue
+    return workers, limits
 
-        elif domain_lower == SearchDomain.PATENT_GOOGLE:
-            result = search_patent_db(query, PatentDatabase.GOOGLE_PATENTS)
-            return result
 
-        elif domain_lower == SearchDomain.PATENT_ESPACENET:
-            result = search_patent_db(query, PatentDatabase.ESPACENET)
-            return result
+def _normalize_request(item: Any) -> Dict[str, Any]:
+    """把 (query, domain[, options]) 元组或字典统一为 {"query", "domain", "output_format"}"""
+    if isinstance(item, dict):
+        query, domain, options = item.get("query"), item.get("domain"), item
+    else:
+        query, domain = item[0], item[1]
+        options = item[2] if len(item) > 2 and isinstance(item[2], dict) else {}
+
+    output_format = options.get("output_format") or options.get("format") or "text"
+    return {"query": query, "domain": domain, "output_format": output_format}
 
-        else:
-            supported = "pubmed, general_web, patent_yaozh, patent_cnipa, patent_jplatpat, patent_google, patent_espacenet"
-            return f"错误: 不支持的 domain '{domain}'，支持的域: {supported}"
 
+def _run_batch_item(request: Dict[str, Any]) -> str:
+    """执行单个批量请求（任何异常都转换为网关兜底错误字符串）"""
+    try:
+        return global_intelligence_search(request["query"], request["domain"], request["output_format"])
     except Exception as e:
-        # 最后一层兜底防线
         return f"L0 网关兜底捕获异常: {type(e).__name__} - {str(e)}"
 
 
+def batch_intelligence_search(
+    requests: Iterable[Any],
+    max_workers: Optional[int] = None,
+    domain_limits: Optional[Dict[str, int]] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    批量全局情报搜索：有界并发执行，按完成顺序流式产出
+
+    Args:
+        requests: 请求列表，每项为 (query, domain[, options]) 或
+                  {"query", "domain", "output_format"}（options 支持 output_format / format）
+        max_workers: 线程池大小（默认 GATEWAY_BATCH_WORKERS）
+        domain_limits: 各 domain 并发上限（覆盖 GATEWAY_DOMAIN_LIMITS，未列出的默认 2）
+
+    Yields:
+        {"index", "query", "domain", "output_format", "result", "elapsed_s"}，
+        index 为请求在输入中的位置；result 与 global_intelligence_search 返回值一致（含错误字符串）
+    """
+    from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+    workers, limits = _batch_config()
+    if max_workers is not None:
+        workers = max(1, max_workers)
+    if domain_limits:
+        limits.update({k.lower(): max(1, v) for k, v in domain_limits.items()})
+
+    # 按 domain 排队；只有线程池与该 domain 都有空位时才提交，避免工作线程阻塞在 domain 上限上
+    queues: Dict[str, list] = {}
+    order = []
+    total = 0
+    for index, item in enumerate(requests):
+        total += 1
+        try:
+            request = _normalize_request(item)
+        except Exception as e:
+            yield {
+                "index": index, "query": None, "domain": None, "output_format": "text",
+                "result": f"L0 网关兜底捕获异常: {type(e).__name__} - {str(e)}", "elapsed_s": 0.0
+            }
+            continue
+        request["index"] = index
+        key = str(request["domain"] or "").lower().strip()
+        if key not in queues:
+            queues[key] = []
+            order.append(key)
+        queues[key].append(request)
+
+    if not queues:
+        return
+
+    running: Dict[str, int] = {key: 0 for key in order}
+    in_flight = {}
+
+    def _timed(request):
+        start = time.perf_counter()
+        result = _run_batch_item(request)
+        return result, time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="gateway-batch") as pool:
+        while in_flight or any(queues.values()):
+            # 按 domain 轮转提交，保证各 domain 公平推进
+            submitted = True
+            while submitted and len(in_flight) < workers:
+                submitted = False
+                for key in order:
+                    if len(in_flight) >= workers:
+                        break
+                    if queues[key] and running[key] < limits.get(key, DEFAULT_DOMAIN_LIMIT):
+                        request = queues[key].pop(0)
+                        running[key] += 1
+                        in_flight[pool.submit(_timed, request)] = (key, request)
+                        submitted = True
+
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                key, request = in_flight.pop(future)
+                running[key] -= 1
+                try:
+                    result, elapsed = future.result()
+                except Exception as e:
+                    result, elapsed = f"L0 网关兜底捕获异常: {type(e).__name__} - {str(e)}", 0.0
+                yield {
+                    "index": request["index"],
+                    "query": request["query"],
+                    "domain": request["domain"],
+                    "output_format": request["output_format"],
+                    "result": result,
+                    "elapsed_s": round(elapsed, 3)
+                }
+
+
+def _read_batch_requests(source: str) -> Iterator[Dict[str, Any]]:
+    """读取 NDJSON 批量请求（每行一个 {"query", "domain", "format"}，'-' 为标准输入）"""
+    handle = sys.stdin if source == "-" else open(source, "r", encoding="utf-8")
+    try:
+        for line in handle:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+    finally:
+        if handle is not sys.stdin:
+            handle.close()
+
+
+def _run_import_benchmark(runs: int = 9) -> None:
+    """测量单 domain 冷启动的导入开销：网关本身 / 各 domain 首次加载 / 旧版一次性导入全部引擎"""
+    import subprocess
+
+    skills_dir = str(Path(__file__).parent)
+    probe = (
+        "import sys, time; sys.path.insert(0, {dir!r}); t = time.perf_counter(); {code}; "
+        "print((time.perf_counter() - t) * 1000)"
+    )
+    cases = [
+        ("网关模块（不加载引擎）", "import global_search_skill"),
+        ("pubmed（medical_engine）", "import engines.medical_engine"),
+        ("general_web（browser_engine）", "import engines.browser_engine"),
+        ("patent_*（patent_engine，依赖前两者）", "import engines.patent_engine"),
+        ("旧版：全部引擎", "import engines.medical_engine, engines.browser_engine, engines.patent_engine"),
+    ]
+
+    print(f"冷启动导入耗时（每项 {runs} 次新解释器，取中位数）")
+    for label, code in cases:
+        samples = []
+        for _ in range(runs):
+            out = subprocess.run(
+                [sys.executable, "-c", probe.format(dir=skills_dir, code=code)],
+                capture_output=True, text=True, check=False
+            )
+            try:
+                samples.append(float(out.stdout.strip().splitlines()[-1]))
+            except (ValueError, IndexError):
+                print(f"  {label}: 导入失败 {out.stderr.strip()[-200:]}")
+                break
+        else:
+            print(f"  {label:<36} {sorted(samples)[len(samples) // 2]:8.1f} ms")
+
+
 def main():
     """命令行入口"""
+    # 常驻网关服务运行时直接转发请求（见 gateway_server.py）
+    from gateway_client import forward_cli
+
+    forwarded = forward_cli(sys.argv)
+    if forwarded is not None:
+        sys.exit(forwarded)
+
+    if "--bench-import" in sys.argv:
+        _run_import_benchmark()
+        return
+
+    if "--batch" in sys.argv:
+        # 批量模式：读取 NDJSON 请求，按完成顺序逐行输出 NDJSON 结果
+        index = sys.argv.index("--batch")
+        source = sys.argv[index + 1] if len(sys.argv) > index + 1 else "-"
+        try:
+            requests = list(_read_batch_requests(source))
+        except Exception as e:
+            print(f"错误: 无法读取批量请求 {source}: {type(e).__name__} - {str(e)}")
+            sys.exit(1)
+        for item in batch_intelligence_search(requests):
+            print(json.dumps(item, ensure_ascii=False), flush=True)
+        return
+
     if len(sys.argv) < 3:
         print("用法: global_search_skill.py <query> <domain> [--json]")
+        print("      global_search_skill.py --batch <requests.ndjson | ->")
+        print("      global_search_skill.py --bench-import")
         print("示例: global_search_skill.py 'PROTAC BRD4' pubmed")
         print("示例: global_search_skill.py 'PROTAC BRD4' pubmed --json")
         print("示例: global_search_skill.py 'https://example.com' general_web")
+        print('示例: echo \'{"query": "PROTAC BRD4", "domain": "pubmed"}\' | global_search_skill.py --batch -')
         sys.exit(1)
 
     query = sys.argv[1]
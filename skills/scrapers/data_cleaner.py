@@ -1,52 +1,627 @@
 """
 L2 解析层：HTML 清洗与文本提取
 安全策略：所有异常必须捕获并返回错误字符串，绝不向上抛出
+
+解析后端（HTML_CLEANER_BACKEND 环境变量或 backend 参数选择）：
+- lxml: libxml2（C 实现）事件流解析，逐块喂入并在输出达到 8000 字符上限后立即停止
+- stream: 标准库 HTMLParser 事件流解析，同样提前停止；标签嵌套规则与 bs4 html.parser 一致
+- bs4: 原实现（构建完整 BeautifulSoup 树后再提取文本）
+- auto（默认）: stream
+
+stream 与 bs4 的输出逐字节一致（包括不规范嵌套），因此作为默认后端；lxml 对规范 HTML 输出一致，
+但不规范嵌套与 CDATA 等按 libxml2 的容错规则处理，输出可能不同（如 `<div>a</span>b</div><![CDATA[x]]>`），
+需显式设置 HTML_CLEANER_BACKEND=lxml 才会启用。
+
+三种后端的分行规则一致：每个文本节点按换行拆分、去除首尾空白、丢弃空行，
+移除 script/style/nav/footer/header/aside/iframe/noscript 内的全部文本。
+
+正文提取模式（mode='main' 或 HTML_CLEANER_MODE=main）：
+- 按块级元素把页面切分为文本块，计算每块的文本长度与链接文本占比（链接密度）
+- 丢弃：链接密度过高的块（菜单、相关文章列表）、class/id/role 命中样板特征的块
+  （cookie 横幅、侧边栏、分享、订阅等）
+- 保留：足够长且链接密度低的正文块；短块（小标题、短段落）只在夹在正文块之间时保留
+- extract_main_content 返回保留/丢弃字符数，get_main_content_stats 汇总全部调用的比例
+
+基准测试：
+    python skills/scrapers/data_cleaner.py --bench [page1.html page2.html ...]
+    不指定文件时生成一个约 5MB 的专利详情页样本
 """
 
-from bs4 import BeautifulSoup
+import os
 import re
+import sys
+import time
+import threading
+import importlib.util
+from html.parser import HTMLParser
+from typing import Any, Callable, Dict, List, Optional
+
+# bs4 仅作为对照后端，导入开销约 60ms，只检测是否安装，首次使用时再导入
+BS4_AVAILABLE = importlib.util.find_spec("bs4") is not None
+
+try:
+    from lxml import etree
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+MAX_TEXT_CHARS = 8000
+TRUNCATION_NOTICE = '\n[内容已截断至 8000 字符]'
+# 解析异常时返回的错误信息前缀（调用方据此区分正文与错误，避免写入缓存）
+PARSE_ERROR_PREFIX = '解析失败: '
+
+# 非正文标签（其中的全部文本被丢弃）
+REMOVED_TAGS = ('script', 'style', 'nav', 'footer', 'header', 'aside', 'iframe', 'noscript')
+
+# bs4 get_text 默认不输出这些标签内的字符串（TemplateString / RubyTextString 等）
+_HIDDEN_STRING_TAGS = ('template', 'rt', 'rp')
+
+_SKIPPED_TAGS = frozenset(REMOVED_TAGS + _HIDDEN_STRING_TAGS)
+
+# 空元素（bs4 在开始标签处立即关闭）
+_VOID_TAGS = frozenset((
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'keygen', 'link',
+    'menuitem', 'meta', 'param', 'source', 'track', 'wbr', 'basefont', 'bgsound',
+    'command', 'frame', 'image', 'isindex', 'nextid', 'spacer'
+))
+
+# 流式解析每次喂入的字符数（输出达到上限后不再喂入剩余内容）
+FEED_CHUNK_CHARS = 64 * 1024
+
+
+class _TextCollector:
+    """按 bs4 get_text('\\n', strip=True) 的规则收集文本，超过上限后标记为已满"""
+
+    def __init__(self, limit: int = MAX_TEXT_CHARS):
+        self.limit = limit
+        self.lines: List[str] = []
+        self.length = 0
+        self.full = False
+        self._pending: List[str] = []
+
+    def data(self, text: str) -> None:
+        self._pending.append(text)
+
+    def flush(self, keep: bool = True) -> None:
+        """结束当前文本节点（相邻的 data 片段属于同一节点）"""
+        if not self._pending:
+            return
+        text = ''.join(self._pending)
+        self._pending = []
+        if not keep or self.full:
+            return
+        for line in text.split('\n'):
+            line = line.strip()
+            if not line:
+                continue
+            self.length += len(line) + (1 if self.lines else 0)
+            self.lines.append(line)
+            if self.length > self.limit:
+                self.full = True
+                return
+
+    def result(self) -> str:
+        text = '\n'.join(self.lines)
+        if len(text) > self.limit:
+            text = text[:self.limit] + TRUNCATION_NOTICE
+        return text
+
+
+class _StreamTextParser(HTMLParser):
+    """标准库 HTMLParser 事件流；开闭标签的处理方式与 bs4 html.parser 树构建一致"""
+
+    def __init__(self, collector: _TextCollector):
+        super().__init__(convert_charrefs=True)
+        self.collector = collector
+        self._stack: List[str] = []
+        self._skipping = 0            # 栈中被跳过标签的数量
+        self._already_closed: List[str] = []
+
+    def handle_starttag(self, tag, attrs, handle_empty_element=True):
+        self.collector.flush(keep=not self._skipping)
+        self._stack.append(tag)
+        if tag in _SKIPPED_TAGS:
+            self._skipping += 1
+        if tag in _VOID_TAGS and handle_empty_element:
+            self.handle_endtag(tag, check_already_closed=False)
+            self._already_closed.append(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs, handle_empty_element=False)
+        self.handle_endtag(tag)
+
+    def handle_endtag(self, tag, check_already_closed=True):
+        if check_already_closed and tag in self._already_closed:
+            self._already_closed.remove(tag)
+            return
+        self.collector.flush(keep=not self._skipping)
+        if tag not in self._stack:
+            return
+        while self._stack:
+            popped = self._stack.pop()
+            if popped in _SKIPPED_TAGS:
+                self._skipping -= 1
+            if popped == tag:
+                break
+
+    def handle_data(self, data):
+        self.collector.data(data)
+
+    def handle_comment(self, data):
+        self.collector.flush(keep=not self._skipping)
+
+    def handle_decl(self, decl):
+        self.collector.flush(keep=not self._skipping)
+
+    def handle_pi(self, data):
+        self.collector.flush(keep=not self._skipping)
+
+    def unknown_decl(self, data):
+        self.collector.flush(keep=not self._skipping)
+        if data.upper().startswith('CDATA['):
+            self.collector.data(data[len('CDATA['):])
+            self.collector.flush(keep=not self._skipping)
+
+
+class _LxmlTextTarget:
+    """lxml 解析器回调目标（libxml2 保证开闭事件成对出现）"""
+
+    def __init__(self, collector: _TextCollector):
+        self.collector = collector
+        self._skipping = 0
+
+    def start(self, tag, attrib):
+        self.collector.flush(keep=not self._skipping)
+        if tag in _SKIPPED_TAGS:
+            self._skipping += 1
+
+    def end(self, tag):
+        self.collector.flush(keep=not self._skipping)
+        if tag in _SKIPPED_TAGS:
+            self._skipping -= 1
+
+    def data(self, data):
+        self.collector.data(data)
+
+    def comment(self, text):
+        self.collector.flush(keep=not self._skipping)
+
+    def pi(self, target, data=None):
+        self.collector.flush(keep=not self._skipping)
+
+    def close(self):
+        self.collector.flush(keep=not self._skipping)
+
+
+def _feed_until_full(feed: Callable[[str], None], html_content: str, collector: _TextCollector) -> None:
+    """分块喂入解析器，输出达到上限后停止"""
+    for start in range(0, len(html_content), FEED_CHUNK_CHARS):
+        feed(html_content[start:start + FEED_CHUNK_CHARS])
+        if collector.full:
+            return
+
+
+def _clean_with_lxml(html_content: str) -> str:
+    collector = _TextCollector()
+    target = _LxmlTextTarget(collector)
+    parser = etree.HTMLParser(target=target)
+    _feed_until_full(parser.feed, html_content, collector)
+    if not collector.full:
+        try:
+            parser.close()
+        except etree.XMLSyntaxError:
+            pass  # 空文档：libxml2 报告 "no element found"
+    return collector.result()
+
+
+def _clean_with_stream(html_content: str) -> str:
+    collector = _TextCollector()
+    parser = _StreamTextParser(collector)
+    _feed_until_full(parser.feed, html_content, collector)
+    if not collector.full:
+        parser.close()
+        collector.flush(keep=not parser._skipping)
+    return collector.result()
+
+
+def _clean_with_bs4(html_content: str) -> str:
+    from bs4 import BeautifulSoup
+
+    # 创建 BeautifulSoup 对象
+    soup = BeautifulSoup(html_content, 'html.parser')
+
+    # 移除非正文标签
+    for tag in soup(list(REMOVED_TAGS)):
+        tag.decompose()
+
+    # 提取纯文本
+    text = soup.get_text(separator='\n', strip=True)
+
+    # 去除多余空行（连续的换行符压缩为最多两个）
+    text = re.sub(r'\n{3,}', '\n\n', text)
+
+    # 去除每行首尾空格
+    lines = [line.strip() for line in text.split('\n')]
+    text = '\n'.join(line for line in lines if line)
+
+    # 硬截断至 8000 字符
+    if len(text) > MAX_TEXT_CHARS:
+        text = text[:MAX_TEXT_CHARS] + TRUNCATION_NOTICE
+
+    return text
+
+
+_BACKENDS: Dict[str, Callable[[str], str]] = {
+    'lxml': _clean_with_lxml,
+    'stream': _clean_with_stream,
+    'bs4': _clean_with_bs4,
+}
+
+
+def available_backends() -> List[str]:
+    """当前环境可用的解析后端"""
+    backends = ['stream']
+    if LXML_AVAILABLE:
+        backends.append('lxml')
+    if BS4_AVAILABLE:
+        backends.append('bs4')
+    return backends
+
 
+def get_cleaner_backend(backend: Optional[str] = None) -> str:
+    """解析后端名称：参数 > HTML_CLEANER_BACKEND 环境变量 > auto（即 stream；指定的后端不可用时同样回退到 stream）"""
+    name = (backend or os.getenv('HTML_CLEANER_BACKEND') or 'auto').lower()
+    if name not in available_backends():
+        name = 'stream'
+    return name
 
-def clean_html_to_text(html_content: str) -> str:
+
+def clean_html_to_text(html_content: str, backend: Optional[str] = None, mode: Optional[str] = None) -> str:
     """
     清洗 HTML 内容，提取纯文本
 
     Args:
         html_content: 原始 HTML 字符串
+        backend: 解析后端（'lxml' | 'stream' | 'bs4'），默认按 HTML_CLEANER_BACKEND 选择
+        mode: 'full'（整页文本）| 'main'（仅正文），默认按 HTML_CLEANER_MODE 选择
 
     Returns:
         清洗后的纯文本（最大 8000 字符）或错误信息
     """
     try:
-        # 创建 BeautifulSoup 对象
-        soup = BeautifulSoup(html_content, 'html.parser')
+        if (mode or os.getenv('HTML_CLEANER_MODE') or 'full').lower() == 'main':
+            return extract_main_content(html_content, backend=backend)['text']
+        return _BACKENDS[get_cleaner_backend(backend)](html_content)
 
-        # 移除非正文标签
-        for tag in soup(['script', 'style', 'nav', 'footer', 'header',
-                        'aside', 'iframe', 'noscript']):
-            tag.decompose()
+    except Exception as e:
+        return f"{PARSE_ERROR_PREFIX}{type(e).__name__} - {str(e)}"
 
-        # 提取纯文本
-        text = soup.get_text(separator='\n', strip=True)
 
-        # 去除多余空行（连续的换行符压缩为最多两个）
-        text = re.sub(r'\n{3,}', '\n\n', text)
+# ============================================================================
+# 正文提取（文本密度 + 链接密度）
+# ============================================================================
 
-        # 去除每行首尾空格
-        lines = [line.strip() for line in text.split('\n')]
-        text = '\n'.join(line for line in lines if line)
+# 块级元素：开始和结束都会切分文本块
+_BLOCK_TAGS = frozenset((
+    'address', 'article', 'aside', 'blockquote', 'body', 'br', 'dd', 'details', 'dialog', 'div',
+    'dl', 'dt', 'fieldset', 'figcaption', 'figure', 'footer', 'form', 'h1', 'h2', 'h3', 'h4',
+    'h5', 'h6', 'header', 'hr', 'li', 'main', 'nav', 'ol', 'p', 'pre', 'section', 'summary',
+    'table', 'tbody', 'td', 'tfoot', 'th', 'thead', 'title', 'tr', 'ul'
+))
+_HEADING_TAGS = frozenset(('h1', 'h2', 'h3', 'h4', 'h5', 'h6'))
 
-        # 硬截断至 8000 字符
-        if len(text) > 8000:
-            text = text[:8000] + '\n[内容已截断至 8000 字符]'
+# class / id 中出现这些词的元素整体视为样板内容
+_BOILERPLATE_ATTR_PATTERN = re.compile(
+    r'(?:^|[\s_-])(?:cookies?|consent|gdpr|banner|sidebar|related|recommend(?:ed|ations)?|menu|navbar|'
+    r'breadcrumbs?|share|sharing|social|advert|ads?|promo|newsletter|subscribe|popup|modal|'
+    r'footer|masthead|comments?|widget|toolbar|pagination|pager|disclaimer)(?:$|[\s_-])',
+    re.IGNORECASE
+)
+_BOILERPLATE_ROLES = frozenset(('navigation', 'banner', 'contentinfo', 'complementary', 'dialog',
+                                'alertdialog', 'search', 'menu', 'menubar'))
 
-        return text
+MIN_MAIN_BLOCK_CHARS = 80       # 正文块的最小长度
+MAX_MAIN_LINK_DENSITY = 0.3     # 正文块的最大链接密度
+MAX_LINK_DENSITY = 0.5          # 超过即视为导航 / 链接列表
+
+_MAIN_STATS = {"documents": 0, "kept_chars": 0, "dropped_chars": 0, "fallbacks": 0}
+_MAIN_STATS_LOCK = threading.Lock()
+
+
+class _TextBlock:
+    __slots__ = ("lines", "chars", "link_chars", "boilerplate", "heading")
+
+    def __init__(self, lines: List[str], chars: int, link_chars: int, boilerplate: bool, heading: bool):
+        self.lines = lines
+        self.chars = chars
+        self.link_chars = link_chars
+        self.boilerplate = boilerplate
+        self.heading = heading
+
+    @property
+    def link_density(self) -> float:
+        return self.link_chars / self.chars if self.chars else 0.0
+
+
+class _BlockSegmenter:
+    """
+    把事件流切分为文本块（lxml 解析器回调目标；stream 后端经 _StreamEventAdapter 转发）
+
+    结束标签弹出到最近的同名元素，未闭合标签由外层结束标签一并关闭
+    """
+
+    def __init__(self):
+        self.blocks: List[_TextBlock] = []
+        self._stack: List[tuple] = []   # (tag, skipped, boilerplate, link, heading)
+        self._skipping = 0
+        self._boilerplate = 0
+        self._links = 0
+        self._headings = 0
+        self._pieces: List[tuple] = []  # (text, in_link)
+        self._block_boilerplate = False
+        self._block_heading = False
+
+    def start(self, tag, attrib):
+        if tag in _BLOCK_TAGS:
+            self._flush_block()
+        attrs = dict(attrib or {})
+        marker = " ".join(filter(None, (attrs.get("class"), attrs.get("id"))))
+        entry = (
+            tag,
+            tag in _SKIPPED_TAGS,
+            bool(marker and _BOILERPLATE_ATTR_PATTERN.search(marker))
+            or (attrs.get("role") or "").lower() in _BOILERPLATE_ROLES,
+            tag == 'a',
+            tag in _HEADING_TAGS,
+        )
+        self._push(entry)
+
+    def end(self, tag):
+        if not any(entry[0] == tag for entry in self._stack):
+            return
+        if tag in _BLOCK_TAGS:
+            self._flush_block()
+        while self._stack:
+            entry = self._stack.pop()
+            self._skipping -= entry[1]
+            self._boilerplate -= entry[2]
+            self._links -= entry[3]
+            self._headings -= entry[4]
+            if entry[0] == tag:
+                break
+        if tag in _BLOCK_TAGS:
+            self._flush_block()
+
+    def data(self, data):
+        if self._skipping:
+            return
+        self._pieces.append((data, self._links > 0))
+        self._block_boilerplate = self._block_boilerplate or self._boilerplate > 0
+        self._block_heading = self._block_heading or self._headings > 0
+
+    def comment(self, text):
+        pass
+
+    def pi(self, target, data=None):
+        pass
+
+    def close(self):
+        self._flush_block()
+        return self.blocks
+
+    def _push(self, entry: tuple) -> None:
+        self._stack.append(entry)
+        self._skipping += entry[1]
+        self._boilerplate += entry[2]
+        self._links += entry[3]
+        self._headings += entry[4]
+        if entry[0] in _VOID_TAGS:
+            self.end(entry[0])
+
+    def _flush_block(self) -> None:
+        if not self._pieces:
+            return
+        text = "".join(piece for piece, _ in self._pieces)
+        lines = [line.strip() for line in text.split("\n")]
+        lines = [line for line in lines if line]
+        if lines:
+            chars = len(" ".join(text.split()))
+            link_chars = len(" ".join("".join(p for p, in_link in self._pieces if in_link).split()))
+            self.blocks.append(_TextBlock(lines, chars, min(link_chars, chars),
+                                          self._block_boilerplate, self._block_heading))
+        self._pieces = []
+        self._block_boilerplate = False
+        self._block_heading = False
+
+
+class _StreamEventAdapter(HTMLParser):
+    """把标准库 HTMLParser 事件转发给 lxml 风格的回调目标"""
+
+    def __init__(self, target):
+        super().__init__(convert_charrefs=True)
+        self.target = target
+
+    def handle_starttag(self, tag, attrs):
+        self.target.start(tag, dict(attrs))
+
+    def handle_startendtag(self, tag, attrs):
+        self.target.start(tag, dict(attrs))
+        if tag not in _VOID_TAGS:
+            self.target.end(tag)
+
+    def handle_endtag(self, tag):
+        if tag not in _VOID_TAGS:
+            self.target.end(tag)
+
+    def handle_data(self, data):
+        self.target.data(data)
 
-    except Exception as e:
-        return f"解析失败: {type(e).__name__} - {str(e)}"
+
+def _segment_blocks(html_content: str, backend: str) -> List[_TextBlock]:
+    segmenter = _BlockSegmenter()
+    if backend == 'lxml':
+        parser = etree.HTMLParser(target=segmenter)
+        parser.feed(html_content)
+        try:
+            return parser.close()
+        except etree.XMLSyntaxError:
+            return segmenter.close()
+    parser = _StreamEventAdapter(segmenter)
+    parser.feed(html_content)
+    parser.close()
+    return segmenter.close()
+
+
+def _classify_blocks(blocks: List[_TextBlock]) -> List[bool]:
+    """逐块判定是否属于正文（good / bad 直接判定，short 块参考前后最近的非 short 块）"""
+    labels = []
+    for block in blocks:
+        if block.boilerplate or block.link_density > MAX_LINK_DENSITY:
+            labels.append("bad")
+        elif block.chars >= MIN_MAIN_BLOCK_CHARS and block.link_density <= MAX_MAIN_LINK_DENSITY:
+            labels.append("good")
+        else:
+            labels.append("short")
+
+    def _neighbour(index: int, step: int) -> str:
+        index += step
+        while 0 <= index < len(labels):
+            if labels[index] != "short":
+                return labels[index]
+            index += step
+        return "bad"
+
+    keep = []
+    for i, (block, label) in enumerate(zip(blocks, labels)):
+        if label == "short":
+            after = _neighbour(i, 1)
+            keep.append((after == "good" and (block.heading or _neighbour(i, -1) == "good")))
+        else:
+            keep.append(label == "good")
+    return keep
+
+
+def extract_main_content(html_content: str, backend: Optional[str] = None) -> Dict[str, Any]:
+    """
+    提取正文（丢弃菜单、侧边栏、cookie 横幅、相关文章等样板内容）
+
+    Args:
+        html_content: 原始 HTML 字符串
+        backend: 'lxml' | 'stream'（bs4 按 stream 处理），默认按 HTML_CLEANER_BACKEND 选择
+
+    Returns:
+        {
+            "text": 正文纯文本（最大 8000 字符）,
+            "kept_chars": 保留的字符数,
+            "dropped_chars": 丢弃的字符数,
+            "kept_ratio": 保留比例,
+            "blocks_kept": 保留块数, "blocks_total": 总块数,
+            "fallback": 未识别出正文、退回整页文本时为 True
+        }
+    """
+    backend = 'lxml' if get_cleaner_backend(backend) == 'lxml' else 'stream'
+    blocks = _segment_blocks(html_content, backend)
+    keep = _classify_blocks(blocks)
+
+    kept = [block for block, flag in zip(blocks, keep) if flag]
+    fallback = not kept and bool(blocks)
+    if fallback:
+        kept = blocks
+
+    total_chars = sum(block.chars for block in blocks)
+    kept_chars = sum(block.chars for block in kept)
+
+    text = "\n".join(line for block in kept for line in block.lines)
+    if len(text) > MAX_TEXT_CHARS:
+        text = text[:MAX_TEXT_CHARS] + TRUNCATION_NOTICE
+
+    with _MAIN_STATS_LOCK:
+        _MAIN_STATS["documents"] += 1
+        _MAIN_STATS["kept_chars"] += kept_chars
+        _MAIN_STATS["dropped_chars"] += total_chars - kept_chars
+        _MAIN_STATS["fallbacks"] += fallback
+
+    return {
+        "text": text,
+        "kept_chars": kept_chars,
+        "dropped_chars": total_chars - kept_chars,
+        "kept_ratio": round(kept_chars / total_chars, 4) if total_chars else 0.0,
+        "blocks_kept": len(kept),
+        "blocks_total": len(blocks),
+        "fallback": fallback,
+    }
+
+
+def get_main_content_stats() -> Dict[str, Any]:
+    """正文提取的累计保留/丢弃字符数（衡量流入 validator 的文本缩减量）"""
+    with _MAIN_STATS_LOCK:
+        stats = dict(_MAIN_STATS)
+    total = stats["kept_chars"] + stats["dropped_chars"]
+    stats["kept_ratio"] = round(stats["kept_chars"] / total, 4) if total else 0.0
+    return stats
+
+
+# ============================================================================
+# 基准测试
+# ============================================================================
+
+def _sample_patent_page(target_bytes: int = 5 * 1024 * 1024) -> str:
+    """生成专利详情页样本（大量权利要求 / 引用文献表格 + 内联脚本）"""
+    head = (
+        '<!DOCTYPE html><html><head><title>US20240182490A1 - PROTAC degraders</title>'
+        '<style>.claim{margin:0}</style><script>window.__data={"a":1};</script></head><body>'
+        '<header><a href="/">Google Patents</a></header><nav><ul><li>Search</li></ul></nav>'
+        '<main><h1>Bifunctional compounds for targeted protein degradation</h1>'
+    )
+    claim = (
+        '<div class="claim" num="{n}"><div class="claim-text">{n}. The compound of claim 1, '
+        'wherein the linker comprises a polyethylene glycol chain &amp; an E3 ligase ligand '
+        'selected from thalidomide, lenalidomide and pomalidomide.</div></div>\n'
+    )
+    row = ('<tr><td><a href="/patent/WO20{n:06d}A1">WO20{n:06d}A1</a></td><td>2021-03-0{d}</td>'
+           '<td>Arvinas Operations, Inc.</td><td>Compounds and methods for degradation</td></tr>\n')
+    parts = [head, '<section id="claims">']
+    size, n = len(head), 0
+    while size < target_bytes:
+        n += 1
+        chunk = claim.format(n=n) + (row.format(n=n, d=n % 9 + 1) if n % 2 else '')
+        if n % 50 == 0:
+            chunk += '<script>trackImpression(%d);</script><!-- cite %d -->' % (n, n)
+        parts.append(chunk)
+        size += len(chunk)
+    parts.append('</section></main><footer>Privacy Terms</footer></body></html>')
+    return ''.join(parts)
+
+
+def _run_benchmark(paths: List[str], repeat: int = 3) -> None:
+    pages = []
+    for path in paths:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            pages.append((os.path.basename(path), f.read()))
+    if not pages:
+        pages.append(('synthetic-patent-page', _sample_patent_page()))
+
+    backends = available_backends()
+    for name, html in pages:
+        print(f"{name}: {len(html) / 1024 / 1024:.2f} MB")
+        outputs = {}
+        for backend in backends:
+            best = float('inf')
+            for _ in range(repeat):
+                start = time.perf_counter()
+                outputs[backend] = _BACKENDS[backend](html)
+                best = min(best, time.perf_counter() - start)
+            print(f"  {backend:<8} {best * 1000:9.1f} ms  输出 {len(outputs[backend])} 字符")
+        if 'bs4' in outputs:
+            same = [b for b in backends if b != 'bs4' and outputs[b] == outputs['bs4']]
+            print(f"  与 bs4 输出完全一致: {', '.join(same) or '无'}")
 
 
 if __name__ == "__main__":
+    if "--bench" in sys.argv:
+        _run_benchmark([arg for arg in sys.argv[1:] if arg != "--bench"])
+        sys.exit(0)
+
     # 测试用例
     test_html = """
     <html>
@@ -63,4 +638,11 @@ if __name__ == "__main__":
         </body>
     </html>
     """
-    print(clean_html_to_text(test_html))
+    for name in available_backends():
+        print(f"[{name}]")
+        print(clean_html_to_text(test_html, backend=name))
+
+    result = extract_main_content(test_html)
+    print(f"[main] 保留 {result['kept_chars']} 字符 / 丢弃 {result['dropped_chars']} 字符"
+          f"（保留比例 {result['kept_ratio']}）")
+    print(result["text"])
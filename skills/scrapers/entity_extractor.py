@@ -0,0 +1,202 @@
+"""
+L2 解析层：企业关联单次扫描提取器
+medical_engine（COI 解析）使用，替代"每个正则各跑一遍 findall + 每个匹配重新 upper() 定位上下文"；
+专利号扫描统一使用 patent_normalizer.find_patent_ids（专利引擎与 COI 解析共用同一套规则）
+
+实现：
+- 全部触发短语编译为一个合并正则，文本转小写后一次 finditer 扫描返回全部匹配及其偏移
+  （每个分支以字面量开头、不使用 IGNORECASE，sre 可按首字符集跳过，比逐模式 findall 快一个数量级）
+- 企业关联模式只消耗触发短语（如 "licensed to "），企业名通过前瞻分组捕获，
+  因此企业名中出现的其他触发短语（"... and holds stock in X"）仍会被单独识别；
+  同一触发短语落在自己上一个匹配（短语 + 企业名）范围内时跳过，与逐模式 findall 的不重叠语义一致
+- 上下文窗口直接按匹配偏移截取，不再二次查找（重复出现的企业名各自取到自己的上下文）
+
+基准测试：
+    python skills/scrapers/entity_extractor.py [-n 5000]
+"""
+
+import re
+import sys
+import time
+from typing import Dict, Iterator, List, Optional
+
+# 模式均按小写文本编写：扫描前先把文本转为小写（长度不变时），合并正则无需 IGNORECASE，
+# 且每个分支都以字面量开头，sre 可以用首字符集快速跳过不可能匹配的位置
+
+# 企业授权 / 雇佣 / 持股触发短语（其后最多 4 个词视为企业名）
+COMPANY_TRIGGER_PATTERNS = {
+    'licensed to': r'licensed\s+to\s+',
+    'sponsored by': r'sponsored\s+by\s+',
+    'funded by': r'funded\s+by\s+',
+    'collaboration with': r'collaboration\s+with\s+',
+    'employee of': r'employee\s+of\s+',
+    'consultant for': r'consultant\s+for\s+',
+    'stock in': r'stock\s+in\s+',
+    'equity in': r'equity\s+in\s+',
+}
+COMPANY_NAME_PATTERN = r'\w+(?:\s+\w+){0,3}'
+
+
+class EntityMatch:
+    """单个匹配（start / end 为 value 在原文中的偏移）"""
+
+    __slots__ = ("label", "value", "start", "end")
+
+    def __init__(self, label: str, value: str, start: int, end: int):
+        self.label = label      # 触发短语（'licensed to' 等）
+        self.value = value      # 原文中的企业名
+        self.start = start
+        self.end = end
+
+    def __repr__(self) -> str:
+        return f"EntityMatch({self.label!r}, {self.value!r}, {self.start}, {self.end})"
+
+
+class EntityExtractor:
+    """合并正则提取器（编译一次，线程安全，可在多篇文本间复用）"""
+
+    def __init__(self, company_patterns: Optional[Dict[str, str]] = None):
+        """
+        Args:
+            company_patterns: 触发短语标签 -> 触发短语正则（小写写法，企业名由 COMPANY_NAME_PATTERN 捕获）
+        """
+        alternatives = []
+        self._companies: Dict[str, str] = {}
+
+        # 每个分支只消耗触发短语，企业名在前瞻分组中捕获
+        for i, (label, pattern) in enumerate((company_patterns or {}).items()):
+            name = f"c{i}"
+            alternatives.append(rf'{pattern}(?=(?P<{name}>{COMPANY_NAME_PATTERN}))')
+            self._companies[name] = label
+
+        joined = "|".join(alternatives)
+        self.pattern = re.compile(joined) if alternatives else None
+        # 小写转换改变长度时（极少数 Unicode 字符）偏移无法对应，退回大小写不敏感扫描原文
+        self._fallback_pattern = re.compile(joined, re.IGNORECASE) if alternatives else None
+
+    def finditer(self, text: str) -> Iterator[EntityMatch]:
+        """单次扫描，按出现顺序产出全部匹配"""
+        if self.pattern is None or not text:
+            return
+
+        lowered = text.lower()
+        if len(lowered) == len(text):
+            pattern, scanned = self.pattern, lowered
+        else:
+            pattern, scanned = self._fallback_pattern, text
+
+        # 每个触发短语上一个匹配（短语 + 企业名）的结束位置
+        consumed: Dict[str, int] = {}
+        for m in pattern.finditer(scanned):
+            group = m.lastgroup
+            if m.start() < consumed.get(group, 0):
+                continue
+            start, end = m.span(group)
+            consumed[group] = end
+            yield EntityMatch(self._companies[group], text[start:end], start, end)
+
+    def extract(self, text: str) -> List[EntityMatch]:
+        return list(self.finditer(text))
+
+
+def context_window(text: str, start: int, end: int, context_chars: int = 150) -> str:
+    """按偏移截取匹配前后各 context_chars 个字符，两端被截断时加省略号"""
+    left = max(0, start - context_chars)
+    right = min(len(text), end + context_chars)
+
+    context = text[left:right]
+    if left > 0:
+        context = "..." + context
+    if right < len(text):
+        context = context + "..."
+
+    return context.strip()
+
+
+# 预编译的共享实例
+COMPANY_EXTRACTOR = EntityExtractor(COMPANY_TRIGGER_PATTERNS)
+
+
+# ============================================================================
+# 基准测试：逐模式 findall + upper().find 上下文（旧实现） vs 单次扫描
+# ============================================================================
+
+# 旧实现的 COI 专利号格式（仅用于基准对照）
+_LEGACY_COI_PATENT_PATTERNS = {
+    'WO': r'\s?/?\s?\d{4}\s?/?\s?\d{6}',
+    'US': r'\s?\d{7,13}[a-z]\d?',
+    'CN': r'\s?\d{9}[a-z]',
+    'JP': r'\s?\d{7,10}[a-z]?',
+    'EP': r'\s?\d{7}[a-z]\d?',
+}
+
+
+def _legacy_coi_extract(text: str) -> int:
+    found = 0
+    for office, pattern in _LEGACY_COI_PATENT_PATTERNS.items():
+        for match in re.findall(rf'\b({office}{pattern})\b', text, re.IGNORECASE):
+            idx = text.upper().find(match.upper())
+            text[max(0, idx - 100):idx + len(match) + 100]
+            found += 1
+    for pattern in COMPANY_TRIGGER_PATTERNS.values():
+        for match in re.findall(rf'{pattern}({COMPANY_NAME_PATTERN})', text, re.IGNORECASE):
+            idx = text.upper().find(match.upper())
+            text[max(0, idx - 100):idx + len(match) + 100]
+            found += 1
+    return found
+
+
+def _sample_abstracts(count: int) -> List[str]:
+    base = (
+        "Proteolysis-targeting chimeras (PROTACs) are heterobifunctional molecules that recruit an "
+        "E3 ubiquitin ligase to a protein of interest, leading to its ubiquitination and proteasomal "
+        "degradation. Here we report the discovery of a potent and selective degrader of the estrogen "
+        "receptor with oral bioavailability and robust tumor regression in xenograft models. "
+    )
+    extras = [
+        "",
+        "The compound is described in patent WO2021/123456 and US20240182490A1. ",
+        "J.D. is an employee of Arvinas Operations and holds stock in Arvinas. ",
+        "This work was funded by Pfizer Inc and licensed to Novartis AG under CN114269365A. ",
+    ]
+    return [base * 3 + extras[i % len(extras)] + f"PMID {38000000 + i}." for i in range(count)]
+
+
+def _run_benchmark(count: int = 5000, repeat: int = 3) -> None:
+    abstracts = _sample_abstracts(count)
+    total_chars = sum(len(a) for a in abstracts)
+    print(f"{count} 篇摘要，共 {total_chars / 1024 / 1024:.1f} MB")
+
+    try:
+        from scrapers.patent_normalizer import find_patent_ids
+    except ImportError:  # 作为脚本直接运行时 scrapers/ 即当前目录
+        from patent_normalizer import find_patent_ids
+
+    def _single_pass():
+        found = 0
+        for text in abstracts:
+            for _, start, end in find_patent_ids(text):
+                context_window(text, start, end, 100)
+                found += 1
+            for m in COMPANY_EXTRACTOR.finditer(text):
+                context_window(text, m.start, m.end, 100)
+                found += 1
+        return found
+
+    def _legacy():
+        return sum(_legacy_coi_extract(text) for text in abstracts)
+
+    for label, func in (("逐模式 findall（旧实现）", _legacy), ("专利号扫描 + 合并正则", _single_pass)):
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            found = func()
+            best = min(best, time.perf_counter() - start)
+        print(f"  {label:<20} {best * 1000:8.1f} ms  {count / best:10.0f} 篇/秒  匹配 {found} 个")
+
+
+if __name__ == "__main__":
+    n = 5000
+    if "-n" in sys.argv:
+        n = int(sys.argv[sys.argv.index("-n") + 1])
+    _run_benchmark(n)
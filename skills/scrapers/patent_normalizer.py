@@ -0,0 +1,361 @@
+"""
+L2 解析层：专利号规范化 + 证据哈希索引
+各数据源对同一专利的写法不一（US 2024/0182490 A1、WO/2024/123456、JP2024-123456、CN202410987654.3），
+规范化为 (office, number, kind) 后即可用字典完成跨源关联，不再依赖 LLM 去重
+
+规范化规则：
+- 去掉空白、斜杠、连字符、千分位逗号，统一大写；末尾字母 + 可选数字视为文献类型码（kind）
+- US: 申请公开号为 4 位年份 + 7 位序号（US2024789012 这类 6 位序号写法补零为 US20240789012）；
+      授权专利号去掉前导零
+- CN: 去掉申请号的校验位（CN202410987654.3 -> CN202410987654）
+- JP: 年份与序号直接拼接（JP2024-123456 -> JP2024123456）
+- EP: 6 位序号补零至 7 位（不足 6 位视为无效）
+- WO: 4 位年份 + 6 位序号（旧式 5 位序号补零：WO2004/12345 -> WO2004012345）
+
+关联键（key）不含 kind：同一文献带不带类型码（US20240182490 / US20240182490A1）视为同一专利
+
+文本扫描（find_patent_ids）比规范化更严格，避免把普通文本（"in the US 2020-2021"、"EP 12 mg"）当作专利号：
+- 专利局前缀只匹配大写的完整单词（英文 "us" 不会命中）
+- 不带类型码时须符合该专利局的序号形态（见 _plausible_in_text），且不允许千分位逗号
+
+用法：
+    python skills/scrapers/patent_normalizer.py mock_raw_evidence.json test-dedup-data.json
+    python skills/scrapers/patent_normalizer.py --check      # 文本扫描的接受 / 拒绝用例
+"""
+
+import re
+import sys
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+OFFICES = ("US", "CN", "JP", "EP", "WO")
+
+# 各专利局规范化后的数字位数范围
+OFFICE_DIGITS = {
+    'US': (6, 11),
+    'CN': (8, 13),
+    'JP': (7, 10),
+    'EP': (6, 7),
+    'WO': (9, 10),
+}
+
+# 文本扫描用的宽松格式（区分大小写，前缀为完整单词；允许空格 / 斜杠 / 连字符 / 千分位逗号分隔）
+# 分隔后的类型码须带数字（" A1"），避免把紧随其后的英文单词（"US2024123456 A novel"）当作类型码
+TEXT_PATENT_PATTERN = re.compile(
+    r'\b(?:US|CN|JP|EP|WO)[\s/]?\s?\d[\d,/\-]*\d(?:\.[\dX](?!\d))?(?:[A-Z]\d?|\s[A-Z]\d)?\b'
+)
+
+# 证据记录中直接存放专利号的字段 / 需要扫描专利号的文本字段
+ID_FIELDS = ("patent_id", "patent_number", "number", "canonical_id")
+TEXT_FIELDS = ("source_url", "url", "raw_text", "evidence_quote", "context", "title")
+
+_SEPARATORS = re.compile(r'[\s/,\-]+')
+_COMPACT = re.compile(r'^(US|CN|JP|EP|WO)(\d+)(?:\.[\dX])?([A-Z]\d?)?$')
+
+
+class PatentId(NamedTuple):
+    """规范化专利号"""
+    office: str
+    number: str
+    kind: str = ""
+
+    @property
+    def key(self) -> str:
+        """关联键（不含 kind），用作索引 / 去重的字典键"""
+        return f"{self.office}{self.number}"
+
+    def __str__(self) -> str:
+        return f"{self.office}{self.number}{self.kind}"
+
+
+def normalize_patent_number(raw: str) -> Optional[PatentId]:
+    """
+    把任意写法的 US/CN/JP/EP/WO 专利号规范化为 PatentId
+
+    Args:
+        raw: 原始专利号（如 "WO/2024/123456"、"US 2024/0182490 A1"、"JP2024-123456"）
+
+    Returns:
+        PatentId，无法识别时返回 None
+    """
+    if not raw:
+        return None
+
+    compact = _SEPARATORS.sub("", raw.strip().upper())
+    m = _COMPACT.match(compact)
+    if not m:
+        return None
+    office, digits, kind = m.group(1), m.group(2), m.group(3) or ""
+
+    if office == "US":
+        if len(digits) == 10 and digits[:2] in ("19", "20"):
+            digits = digits[:4] + "0" + digits[4:]
+        elif len(digits) < 11:
+            digits = digits.lstrip("0")
+    elif office == "EP":
+        if len(digits) < 6:
+            return None
+        digits = digits.zfill(7)
+    elif office == "WO":
+        if len(digits) == 9:
+            digits = digits[:4] + "0" + digits[4:]
+
+    low, high = OFFICE_DIGITS[office]
+    if not low <= len(digits) <= high:
+        return None
+
+    return PatentId(office, digits, kind)
+
+
+def canonical_patent_id(raw: str, with_kind: bool = True) -> Optional[str]:
+    """
+    规范化专利号字符串
+
+    Args:
+        raw: 原始专利号
+        with_kind: 是否保留文献类型码（False 时返回关联键）
+
+    Returns:
+        规范化字符串（如 "US20240182490A1"），无法识别时返回 None
+    """
+    pid = normalize_patent_number(raw)
+    if pid is None:
+        return None
+    return str(pid) if with_kind else pid.key
+
+
+# "年份 + 序号"两段写法中序号的位数范围（CN 申请号不分段书写）
+_SERIAL_DIGITS = {"US": (6, 7), "JP": (6, 6), "WO": (5, 6)}
+
+
+def _is_year(digits: str) -> bool:
+    return len(digits) == 4 and digits[:2] in ("19", "20")
+
+
+def _plausible_in_text(raw: str, pid: PatentId) -> bool:
+    """
+    文本中不带类型码的专利号须符合所属专利局的序号形态：
+    - US: 7-8 位授权号，或 4 位年份 + 6-7 位序号的申请公开号
+    - CN: 12 位申请号（可带 .校验位）
+    - JP: 4 位年份 + 6 位序号
+    - EP: 7 位
+    - WO: 4 位年份 + 5-6 位序号
+    带分隔符（空格 / 斜杠 / 连字符）时须为"年份 + 序号"两段（EP 只看总位数）
+    """
+    if pid.kind:
+        return True
+
+    body = raw[2:]
+    if "," in body:
+        return False  # 千分位逗号多为金额 / 数量（"US 10,000,000 dollars"）
+    body = re.sub(r'\.[\dX]$', '', body)
+    groups = re.findall(r'\d+', body)
+    digits = "".join(groups)
+
+    if pid.office == "EP":
+        return len(digits) == 7
+    if len(groups) > 2:
+        return False
+    if len(groups) == 2:
+        year, serial = groups
+        if not _is_year(year):
+            return False
+        low, high = _SERIAL_DIGITS.get(pid.office, (1, 0))
+        return low <= len(serial) <= high
+
+    if pid.office == "US":
+        return len(digits) in (7, 8) or (len(digits) in (10, 11) and _is_year(digits[:4]))
+    if pid.office == "CN":
+        return len(digits) == 12
+    if pid.office == "JP":
+        return len(digits) == 10 and _is_year(digits[:4])
+    return len(digits) in (9, 10) and _is_year(digits[:4])  # WO
+
+
+def find_patent_ids(text: str) -> Iterator[Tuple[PatentId, int, int]]:
+    """扫描文本，产出 (PatentId, start, end)，跳过无法规范化或不符合序号形态的匹配"""
+    if not text:
+        return
+    for match in TEXT_PATENT_PATTERN.finditer(text):
+        raw = match.group()
+        pid = normalize_patent_number(raw)
+        if pid is not None and _plausible_in_text(raw, pid):
+            yield pid, match.start(), match.end()
+
+
+class PatentEvidenceIndex:
+    """
+    按规范化专利号建立的证据哈希索引
+
+    Raw_Evidence、Validated_Assets、专利检索结果等任意字典记录均可加入，
+    同一专利的所有记录落在同一个键下，跨源关联即一次字典查找
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, List[Dict[str, Any]]] = {}
+        self._kinds: Dict[str, set] = {}
+        self._records_added = 0
+        self._unindexed = 0
+
+    def add(self, record: Dict[str, Any], source: str = "") -> List[str]:
+        """
+        加入一条记录（专利号取自 ID_FIELDS，并扫描 TEXT_FIELDS 中出现的专利号）
+
+        Args:
+            record: 证据 / 资产 / 检索结果记录
+            source: 来源标签（如 'raw_evidence'、'validated_assets'）
+
+        Returns:
+            该记录关联到的专利键列表
+        """
+        found: Dict[str, PatentId] = {}
+        for field in ID_FIELDS:
+            value = record.get(field)
+            if isinstance(value, str):
+                pid = normalize_patent_number(value)
+                if pid is not None:
+                    found.setdefault(pid.key, pid)
+        for field in TEXT_FIELDS:
+            value = record.get(field)
+            if isinstance(value, str):
+                for pid, _, _ in find_patent_ids(value):
+                    found.setdefault(pid.key, pid)
+
+        self._records_added += 1
+        if not found:
+            self._unindexed += 1
+
+        for key, pid in found.items():
+            self._entries.setdefault(key, []).append({"source": source, "record": record})
+            if pid.kind:
+                self._kinds.setdefault(key, set()).add(pid.kind)
+        return list(found)
+
+    def add_all(self, records: Iterable[Dict[str, Any]], source: str = "") -> int:
+        """批量加入，返回关联到至少一个专利的记录数"""
+        return sum(1 for record in records if self.add(record, source))
+
+    def get(self, patent_number: str, source: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        按任意写法的专利号查找记录
+
+        Args:
+            patent_number: 专利号（任意写法，或 PatentId.key）
+            source: 只返回指定来源的记录
+
+        Returns:
+            记录列表（无匹配时为空）
+        """
+        pid = normalize_patent_number(patent_number)
+        if pid is None:
+            return []
+        entries = self._entries.get(pid.key, [])
+        return [e["record"] for e in entries if source is None or e["source"] == source]
+
+    def __contains__(self, patent_number: str) -> bool:
+        pid = normalize_patent_number(patent_number)
+        return pid is not None and pid.key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def keys(self) -> List[str]:
+        return list(self._entries)
+
+    def kinds(self, patent_number: str) -> List[str]:
+        """该专利在各来源中出现过的文献类型码"""
+        pid = normalize_patent_number(patent_number)
+        return sorted(self._kinds.get(pid.key, ())) if pid else []
+
+    def join(self, left_source: str, right_source: str) -> Dict[str, Dict[str, List[Dict[str, Any]]]]:
+        """
+        两个来源按专利键做内连接
+
+        Returns:
+            {专利键: {left_source: [...], right_source: [...]}}，只包含两侧都有记录的专利
+        """
+        joined = {}
+        for key, entries in self._entries.items():
+            left = [e["record"] for e in entries if e["source"] == left_source]
+            right = [e["record"] for e in entries if e["source"] == right_source]
+            if left and right:
+                joined[key] = {left_source: left, right_source: right}
+        return joined
+
+    def duplicates(self) -> Dict[str, List[Dict[str, Any]]]:
+        """被多条记录引用的专利（去重候选）"""
+        return {
+            key: [e["record"] for e in entries]
+            for key, entries in self._entries.items() if len(entries) > 1
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "records": self._records_added,
+            "unindexed_records": self._unindexed,
+            "patents": len(self._entries),
+            "duplicate_patents": sum(1 for entries in self._entries.values() if len(entries) > 1),
+        }
+
+
+def _load_records(path: str) -> List[Dict[str, Any]]:
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        # test-validator-data.json 形如 {"test_cases": [{"evidence": {...}}]}
+        items = next((v for v in data.values() if isinstance(v, list)), [])
+        return [item.get("evidence", item) for item in items if isinstance(item, dict)]
+    return [item for item in data if isinstance(item, dict)]
+
+
+# 文本扫描用例：(文本, 期望提取的规范化专利号)
+_TEXT_CASES = [
+    # 普通文本中的年份 / 金额 / 剂量不是专利号
+    ("in the US 2020-2021", []),
+    ("US 10,000,000 dollars", []),
+    ("gave us 2019/2020", []),
+    ("EP 12 mg dose", []),
+    ("CN 2015-2020 hospitals", []),
+    ("from 2019 to 2020 in the US 12 sites", []),
+    ("US2024123456 a novel degrader", ["US20240123456"]),
+    # 各种真实写法
+    ("described in US 2024/0182490 A1 and WO/2024/123456", ["US20240182490A1", "WO2024123456"]),
+    ("granted as US 11,234,567 B2", ["US11234567B2"]),
+    ("see US9876543 and EP1234567", ["US9876543", "EP1234567"]),
+    ("EP 123456 B1 family", ["EP0123456B1"]),
+    ("CN202410987654.3 and CN114269365A", ["CN202410987654", "CN114269365A"]),
+    ("JP2024-123456 filed", ["JP2024123456"]),
+    ("WO2004/12345 (old style)", ["WO2004012345"]),
+]
+
+
+def _run_checks() -> bool:
+    ok = True
+    for text, expected in _TEXT_CASES:
+        found = [str(pid) for pid, _, _ in find_patent_ids(text)]
+        passed = found == expected
+        ok = ok and passed
+        print(f"{'✓' if passed else '✗'} {text!r}: {found}" + ("" if passed else f"（期望 {expected}）"))
+    return ok
+
+
+if __name__ == "__main__":
+    if "--check" in sys.argv:
+        sys.exit(0 if _run_checks() else 1)
+
+    if len(sys.argv) < 2:
+        print("用法: python3 patent_normalizer.py <证据 JSON> [<证据 JSON> ...]")
+        print("      python3 patent_normalizer.py --check")
+        sys.exit(1)
+
+    index = PatentEvidenceIndex()
+    for path in sys.argv[1:]:
+        index.add_all(_load_records(path), source=Path(path).stem)
+
+    for key in index.keys():
+        records = index.get(key)
+        ids = [r.get("evidence_id") or r.get("validation_id") or r.get("pmid") or "?" for r in records]
+        kinds = ",".join(index.kinds(key)) or "-"
+        print(f"{key:<18} kind={kinds:<6} {len(records)} 条: {', '.join(ids)}")
+    print(index.stats())
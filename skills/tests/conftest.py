@@ -0,0 +1,8 @@
+"""
+pytest 公共配置：与各模块一致，把 skills/ 加入 sys.path，以 engines.* / scrapers.* 导入
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
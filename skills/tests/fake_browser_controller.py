@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+测试用浏览器控制进程替身：与 BrowserDaemon 使用同一 NDJSON 协议（stdin 请求 / stdout 响应，按 id 配对）
+
+URL 决定行为：
+- .../slow?ms=N   N 毫秒后响应（请求并发处理，响应顺序可能与请求顺序不同）
+- .../error       返回 ok=false
+- .../crash       不响应，直接退出进程
+- .../hang        永不响应
+- 其他            立即返回 <html>URL</html>
+
+启动时先输出一行非协议日志，验证客户端会忽略它
+"""
+
+import os
+import sys
+import json
+import time
+import threading
+from urllib.parse import parse_qs, urlsplit
+
+_WRITE_LOCK = threading.Lock()
+
+
+def _reply(payload):
+    with _WRITE_LOCK:
+        sys.stdout.write(json.dumps(payload) + "\n")
+        sys.stdout.flush()
+
+
+def _handle(request):
+    url = request.get("url", "")
+    parts = urlsplit(url)
+    if parts.path.endswith("/crash"):
+        os._exit(1)
+    if parts.path.endswith("/hang"):
+        return
+    if parts.path.endswith("/slow"):
+        time.sleep(int(parse_qs(parts.query).get("ms", ["100"])[0]) / 1000)
+    if parts.path.endswith("/error"):
+        _reply({"id": request["id"], "ok": False, "error": f"navigation failed: {url}"})
+        return
+    _reply({"id": request["id"], "ok": True, "html": f"<html>{url}</html>"})
+
+
+def main():
+    sys.stdout.write("controller ready (log line, not a response)\n")
+    sys.stdout.flush()
+    for line in sys.stdin:
+        request = json.loads(line)
+        threading.Thread(target=_handle, args=(request,), daemon=True).start()
+
+
+if __name__ == "__main__":
+    main()
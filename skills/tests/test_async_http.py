@@ -0,0 +1,219 @@
+"""
+asyncio keep-alive HTTP 客户端：对本地替身服务器验证分帧（Content-Length / chunked / 读到关闭）、
+gzip / deflate 解压、连接复用、服务端关闭空闲连接后重连、正文中途断开、超时与取消
+"""
+
+import asyncio
+import gzip
+import zlib
+
+import pytest
+
+from engines.async_http import AsyncHTTPConnectionPool, loop_local
+
+BODY = b"targeted protein degradation " * 100
+
+
+class _StubServer:
+    """按路径返回固定响应的 HTTP/1.1 服务器（记录连接数与各路径请求次数）"""
+
+    def __init__(self):
+        self.connections = 0
+        self.hits = {}
+        self.requests = []
+        self.server = None
+
+    async def __aenter__(self):
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def __aexit__(self, *exc):
+        self.server.close()
+        await self.server.wait_closed()
+
+    def url(self, path):
+        return f"http://127.0.0.1:{self.port}{path}"
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+                self.hits[path] = self.hits.get(path, 0) + 1
+                self.requests.append((method, path, headers, body))
+                if not await self._respond(path, body, writer):
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, path, body, writer):
+        """写出响应，返回 False 表示随后关闭连接"""
+        def _send(head, payload=b""):
+            writer.write(b"HTTP/1.1 " + head.encode("latin-1") + b"\r\n\r\n" + payload)
+
+        if path == "/length":
+            _send(f"200 OK\r\nContent-Length: {len(BODY)}", BODY)
+        elif path == "/echo":
+            _send(f"200 OK\r\nContent-Length: {len(body)}", body)
+        elif path == "/chunked":
+            chunks = b"".join(b"%x;ext=1\r\n%s\r\n" % (len(BODY[i:i + 700]), BODY[i:i + 700])
+                              for i in range(0, len(BODY), 700))
+            _send("200 OK\r\nTransfer-Encoding: chunked", chunks + b"0\r\nX-Trailer: 1\r\n\r\n")
+        elif path == "/gzip":
+            payload = gzip.compress(BODY)
+            _send(f"200 OK\r\nContent-Encoding: gzip\r\nContent-Length: {len(payload)}", payload)
+        elif path == "/deflate-raw":
+            compressor = zlib.compressobj(wbits=-zlib.MAX_WBITS)
+            payload = compressor.compress(BODY) + compressor.flush()
+            _send(f"200 OK\r\nContent-Encoding: deflate\r\nContent-Length: {len(payload)}", payload)
+        elif path == "/until-close":
+            _send("200 OK\r\nContent-Type: text/html", BODY)
+            return False
+        elif path == "/connection-close":
+            _send(f"200 OK\r\nConnection: close\r\nContent-Length: {len(BODY)}", BODY)
+            return False
+        elif path == "/not-modified":
+            _send('304 Not Modified\r\nETag: "v1"')
+        elif path == "/idle-close":
+            # 响应声明 keep-alive，随后像空闲超时一样关闭连接
+            _send(f"200 OK\r\nContent-Length: {len(BODY)}", BODY)
+            await writer.drain()
+            return False
+        elif path == "/truncated":
+            _send(f"200 OK\r\nContent-Length: {len(BODY)}", BODY[:100])
+            await writer.drain()
+            return False
+        elif path == "/truncated-chunked":
+            _send("200 OK\r\nTransfer-Encoding: chunked", b"%x\r\n%s" % (len(BODY), BODY[:100]))
+            await writer.drain()
+            return False
+        elif path == "/slow":
+            await asyncio.sleep(5)
+            _send("200 OK\r\nContent-Length: 0")
+        else:
+            _send("404 Not Found\r\nContent-Length: 0")
+        await writer.drain()
+        return True
+
+
+def _run(scenario):
+    """在新事件循环中启动替身服务器与连接池，执行 scenario(server, pool)"""
+    async def _main():
+        async with _StubServer() as server:
+            pool = AsyncHTTPConnectionPool(timeout=5)
+            try:
+                return await scenario(server, pool)
+            finally:
+                pool.close()
+    return asyncio.run(_main())
+
+
+@pytest.mark.parametrize("path", ["/length", "/chunked", "/gzip", "/deflate-raw", "/until-close", "/connection-close"])
+def test_body_framing_and_decoding(path):
+    async def _scenario(server, pool):
+        result = await pool.get(server.url(path))
+        assert result.status == 200 and result.body == BODY
+        if path in ("/gzip", "/deflate-raw"):
+            assert result.wire_bytes < len(BODY)
+        # 请求头：默认声明支持压缩并保持连接
+        _, _, headers, _ = server.requests[0]
+        assert headers["accept-encoding"] == "gzip, deflate" and headers["connection"] == "keep-alive"
+    _run(_scenario)
+
+
+def test_keep_alive_reuses_one_connection():
+    async def _scenario(server, pool):
+        for path in ("/length", "/chunked", "/gzip", "/not-modified", "/length"):
+            await pool.get(server.url(path))
+        result = await pool.post(server.url("/echo"), b'{"id": [1, 2]}')
+        assert result.body == b'{"id": [1, 2]}'
+
+        assert server.connections == 1
+        stats = pool.stats()
+        assert (stats["connections_created"], stats["connections_reused"], stats["idle_connections"]) == (1, 5, 1)
+    _run(_scenario)
+
+
+def test_closing_responses_are_not_pooled():
+    async def _scenario(server, pool):
+        await pool.get(server.url("/until-close"))
+        await pool.get(server.url("/connection-close"))
+        await pool.get(server.url("/length"))
+        assert server.connections == 3
+        assert pool.stats()["idle_connections"] == 1
+    _run(_scenario)
+
+
+def test_server_closing_idle_connection_reconnects_once():
+    async def _scenario(server, pool):
+        await pool.get(server.url("/idle-close"))
+        await asyncio.sleep(0.05)
+        result = await pool.post(server.url("/echo"), b"payload")
+        assert result.body == b"payload"
+        assert server.connections == 2
+        assert server.hits["/echo"] == 1
+    _run(_scenario)
+
+
+@pytest.mark.parametrize("path", ["/truncated", "/truncated-chunked"])
+def test_server_closing_mid_body_raises_without_retry(path):
+    async def _scenario(server, pool):
+        await pool.get(server.url("/length"))
+        # 复用的连接上已收到状态行后断开：请求已被服务端处理，不能自动重发
+        with pytest.raises(asyncio.IncompleteReadError):
+            await pool.get(server.url(path))
+        assert server.hits[path] == 1
+        assert pool.stats()["idle_connections"] == 0
+
+        result = await pool.get(server.url("/length"))
+        assert result.body == BODY
+    _run(_scenario)
+
+
+def test_timeout_and_cancel_discard_the_connection():
+    async def _scenario(server, pool):
+        with pytest.raises(asyncio.TimeoutError):
+            await pool.get(server.url("/slow"), timeout=0.2)
+        assert pool.stats()["idle_connections"] == 0
+
+        task = asyncio.ensure_future(pool.get(server.url("/slow")))
+        await asyncio.sleep(0.1)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert pool.stats()["idle_connections"] == 0
+
+        assert (await pool.get(server.url("/length"))).body == BODY
+    _run(_scenario)
+
+
+def test_unsupported_scheme():
+    async def _scenario(server, pool):
+        with pytest.raises(ValueError):
+            await pool.get("ftp://127.0.0.1/file")
+    _run(_scenario)
+
+
+def test_loop_local_is_per_event_loop():
+    async def _get():
+        return loop_local("test_object", object)
+
+    async def _same_loop():
+        return await _get() is await _get()
+
+    assert asyncio.run(_same_loop())
+    assert asyncio.run(_get()) is not asyncio.run(_get())
@@ -0,0 +1,142 @@
+"""
+子进程模式的时间预算：tabs / open / evaluate 共用一个截止时间，超时即停止，清理步骤仍关闭标签页；
+静态快速路径最多使用总预算的 1/3，daemon 失败后的回退只拿到剩余时间
+子进程调用以替身代替（模拟耗时），不启动 OpenClaw
+"""
+
+import asyncio
+import json
+import subprocess
+import time
+
+import pytest
+
+from engines import browser_engine
+
+TAB = "TAB123456"
+HTML = "<html><body>" + "page " * 20 + "</body></html>"
+
+
+class _FakeCLI:
+    """按命令模拟 CLI：open 耗时 open_s，evaluate 耗时 eval_s；记录每一步拿到的 timeout"""
+
+    def __init__(self, open_s=0.0, eval_s=0.0):
+        self.open_s = open_s
+        self.eval_s = eval_s
+        self.calls = []
+
+    def step(self, args, timeout):
+        command = args[len(browser_engine.OPENCLAW_CLI) + 1]
+        self.calls.append((command, timeout))
+        duration = {"open": self.open_s, "evaluate": self.eval_s}.get(command, 0.0)
+        if duration > timeout:
+            return "timeout", duration
+        if command == "tabs":
+            return (0, json.dumps({"tabs": []}), ""), duration
+        if command == "open":
+            return (0, json.dumps({"targetId": TAB}), ""), duration
+        if command == "evaluate":
+            return (0, json.dumps(HTML), ""), duration
+        return (0, "", ""), duration
+
+    def run(self, args, capture_output, text, timeout, check, env):
+        result, duration = self.step(args, timeout)
+        time.sleep(min(duration, timeout))
+        if result == "timeout":
+            raise subprocess.TimeoutExpired(args, timeout)
+        return subprocess.CompletedProcess(args, result[0], result[1], result[2])
+
+    async def run_async(self, args, timeout, env):
+        result, duration = self.step(args, timeout)
+        await asyncio.sleep(min(duration, timeout))
+        if result == "timeout":
+            raise asyncio.TimeoutError()
+        return result
+
+    def timeouts(self, command):
+        return [timeout for name, timeout in self.calls if name == command]
+
+
+@pytest.fixture
+def cli(monkeypatch):
+    fake = _FakeCLI()
+    monkeypatch.setattr(browser_engine.subprocess, "run", fake.run)
+    monkeypatch.setattr(browser_engine, "_run_cli_async", fake.run_async)
+    return fake
+
+
+def test_steps_share_one_deadline(cli):
+    cli.open_s = 0.4
+    assert browser_engine._fetch_html_via_cli("https://a.test/", timeout=1, isolated=True) == (HTML, None)
+
+    [tabs] = cli.timeouts("tabs")
+    [open_timeout] = cli.timeouts("open")
+    [eval_timeout] = cli.timeouts("evaluate")
+    assert tabs <= 1 and open_timeout <= 1
+    # evaluate 只拿到 open 之后剩下的时间，而不是又一个完整的 timeout
+    assert eval_timeout <= 1 - 0.4 + 0.05
+    assert cli.timeouts("close")
+
+
+def test_slow_open_exhausts_the_budget(cli):
+    cli.open_s = 5
+    start = time.perf_counter()
+    with pytest.raises(subprocess.TimeoutExpired):
+        browser_engine._fetch_html_via_cli("https://a.test/", timeout=0.5, isolated=True)
+    assert time.perf_counter() - start < 1.0
+    assert cli.timeouts("evaluate") == []
+
+
+def test_slow_evaluate_still_closes_the_tab(cli):
+    cli.eval_s = 5
+    start = time.perf_counter()
+    with pytest.raises(subprocess.TimeoutExpired):
+        browser_engine._fetch_html_via_cli("https://a.test/", timeout=0.5, isolated=True)
+    assert time.perf_counter() - start < 1.0
+    # 截止时间已过，关闭标签页仍有 CLI_CLOSE_GRACE_S 可用
+    assert cli.timeouts("close") == [browser_engine.CLI_CLOSE_GRACE_S]
+
+
+def test_async_steps_share_one_deadline(cli):
+    cli.open_s = 0.4
+    assert asyncio.run(browser_engine._fetch_html_via_cli_async("https://a.test/", timeout=1)) == (HTML, None)
+    [eval_timeout] = cli.timeouts("evaluate")
+    assert eval_timeout <= 1 - 0.4 + 0.05
+    assert cli.timeouts("close")
+
+    cli.calls.clear()
+    cli.open_s = 5
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(browser_engine._fetch_html_via_cli_async("https://a.test/", timeout=0.5))
+    assert cli.timeouts("evaluate") == []
+
+
+def test_browser_path_reports_timeout(cli):
+    cli.open_s = 5
+    content, path, html = browser_engine._fetch_via_browser("https://a.test/", 0.5, isolated=True)
+    assert path == "browser-cli" and content.startswith("网页抓取超时") and html is None
+
+
+@pytest.mark.parametrize("timeout, expected", [(15, 5), (60, browser_engine.STATIC_TIMEOUT_S), (3, 1), (2, 2 / 3)])
+def test_static_budget_is_a_share_of_the_timeout(timeout, expected):
+    assert browser_engine._static_budget(timeout) == pytest.approx(expected)
+
+
+def test_daemon_failure_falls_back_with_remaining_time(monkeypatch):
+    class _SlowFailingDaemon:
+        def fetch_html(self, url, timeout):
+            time.sleep(0.3)
+            raise browser_engine.BrowserDaemonError("controller exited")
+
+    budgets = []
+
+    def _fake_cli(url, timeout, isolated=False):
+        budgets.append(timeout)
+        return HTML, None
+
+    monkeypatch.setattr(browser_engine, "get_browser_daemon", lambda: _SlowFailingDaemon())
+    monkeypatch.setattr(browser_engine, "_fetch_html_via_cli", _fake_cli)
+
+    _, path, _ = browser_engine._fetch_via_browser("https://a.test/", 5, isolated=False)
+    assert path == "browser-cli"
+    assert budgets[0] <= 4.8
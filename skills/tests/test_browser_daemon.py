@@ -0,0 +1,151 @@
+"""
+BrowserDaemon：NDJSON 请求 id 配对、异步等待者、控制进程崩溃 / 卡死，以及回退到子进程模式
+控制进程由 fake_browser_controller.py 替身扮演
+"""
+
+import sys
+import asyncio
+import threading
+from pathlib import Path
+
+import pytest
+
+from engines import browser_engine
+from engines.browser_engine import BrowserDaemon, BrowserDaemonError
+
+FAKE_CONTROLLER = [sys.executable, str(Path(__file__).parent / "fake_browser_controller.py")]
+
+
+@pytest.fixture
+def daemon():
+    client = BrowserDaemon(FAKE_CONTROLLER)
+    yield client
+    client.close()
+
+
+def test_responses_are_matched_by_request_id(daemon):
+    # 慢请求先发、快请求后发：响应乱序到达，每个调用者仍拿到自己的页面
+    urls = ["https://a.test/slow?ms=400", "https://b.test/slow?ms=200", "https://c.test/fast"]
+    results = {}
+
+    def _fetch(url):
+        results[url] = daemon.fetch_html(url, timeout=5)
+
+    threads = [threading.Thread(target=_fetch, args=(url,)) for url in urls]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == {url: f"<html>{url}</html>" for url in urls}
+    assert daemon._pending == {}
+
+
+def test_error_response_raises(daemon):
+    with pytest.raises(BrowserDaemonError, match="navigation failed"):
+        daemon.fetch_html("https://a.test/error", timeout=5)
+
+
+def test_controller_crash_wakes_waiters_and_restarts(daemon):
+    waiting = []
+    thread = threading.Thread(
+        target=lambda: waiting.append(_capture(daemon.fetch_html, "https://a.test/slow?ms=2000", 5))
+    )
+    thread.start()
+
+    with pytest.raises(BrowserDaemonError, match="已退出"):
+        daemon.fetch_html("https://a.test/crash", timeout=5)
+    thread.join(5)
+
+    # 同时在途的请求也被唤醒，而不是等到超时
+    assert isinstance(waiting[0], BrowserDaemonError)
+    # 下一次请求重新启动控制进程
+    assert daemon.fetch_html("https://a.test/after", timeout=5) == "<html>https://a.test/after</html>"
+
+
+def test_hung_controller_times_out(daemon):
+    with pytest.raises(TimeoutError):
+        daemon.fetch_html("https://a.test/hang", timeout=0.5)
+    assert daemon._pending == {}
+    # 卡住的请求不影响后续请求
+    assert daemon.fetch_html("https://a.test/next", timeout=5) == "<html>https://a.test/next</html>"
+
+
+def test_async_waiters_are_matched_by_request_id(daemon):
+    urls = ["https://a.test/slow?ms=300", "https://b.test/fast", "https://c.test/slow?ms=100"]
+
+    async def _main():
+        return await asyncio.gather(*(daemon.fetch_html_async(url, 5) for url in urls))
+
+    assert asyncio.run(_main()) == [f"<html>{url}</html>" for url in urls]
+
+
+def test_async_crash_and_timeout(daemon):
+    async def _main():
+        with pytest.raises(TimeoutError):
+            await daemon.fetch_html_async("https://a.test/hang", 0.5)
+        with pytest.raises(BrowserDaemonError):
+            await daemon.fetch_html_async("https://a.test/crash", 5)
+        return await daemon.fetch_html_async("https://a.test/ok", 5)
+
+    assert asyncio.run(_main()) == "<html>https://a.test/ok</html>"
+    assert daemon._pending == {}
+
+
+@pytest.fixture
+def daemon_mode(monkeypatch):
+    """daemon 模式下使用替身控制进程（进程级单例在用例前后重置）"""
+    def _configure(command):
+        monkeypatch.setenv("BROWSER_ENGINE_MODE", "daemon")
+        monkeypatch.setenv("OPENCLAW_BROWSER_DAEMON_CMD", command)
+        monkeypatch.setattr(browser_engine, "_DAEMON", None)
+
+    yield _configure
+    if browser_engine._DAEMON is not None:
+        browser_engine._DAEMON.close()
+
+
+def _fake_cli(calls):
+    def _fetch_html_via_cli(url, timeout, isolated=False):
+        calls.append(url)
+        return "<html><body>" + "cli " * 20 + "</body></html>", None
+    return _fetch_html_via_cli
+
+
+def test_daemon_error_falls_back_to_cli(monkeypatch, daemon_mode):
+    daemon_mode(" ".join(FAKE_CONTROLLER))
+    calls = []
+    monkeypatch.setattr(browser_engine, "_fetch_html_via_cli", _fake_cli(calls))
+
+    content, path, html = browser_engine._fetch_via_browser("https://a.test/error", 5, isolated=False)
+    assert path == "browser-cli"
+    assert calls == ["https://a.test/error"]
+    assert "cli" in content and html is not None
+
+
+def test_daemon_start_failure_falls_back_to_cli(monkeypatch, daemon_mode):
+    daemon_mode("/nonexistent/openclaw-browser-daemon")
+    calls = []
+    monkeypatch.setattr(browser_engine, "_fetch_html_via_cli", _fake_cli(calls))
+
+    content, path, _ = browser_engine._fetch_via_browser("https://a.test/page", 5, isolated=False)
+    assert path == "browser-cli"
+    assert calls == ["https://a.test/page"]
+
+
+def test_daemon_success_skips_cli(monkeypatch, daemon_mode):
+    daemon_mode(" ".join(FAKE_CONTROLLER))
+    calls = []
+    monkeypatch.setattr(browser_engine, "_fetch_html_via_cli", _fake_cli(calls))
+
+    content, path, html = browser_engine._fetch_via_browser("https://a.test/" + "x" * 60, 5, isolated=False)
+    assert path == "browser-daemon"
+    assert calls == []
+    assert html == "<html>https://a.test/" + "x" * 60 + "</html>"
+
+
+def _capture(func, *args):
+    try:
+        return func(*args)
+    except Exception as e:
+        return e
@@ -0,0 +1,66 @@
+"""
+COI 解析：企业关联单次扫描与逐模式 findall（旧实现）结果一致，专利号走 patent_normalizer
+"""
+
+import re
+
+import pytest
+
+from engines.medical_engine import analyze_article_coi
+from scrapers.entity_extractor import (
+    COMPANY_EXTRACTOR,
+    COMPANY_NAME_PATTERN,
+    COMPANY_TRIGGER_PATTERNS,
+    _sample_abstracts,
+)
+
+
+def _legacy_companies(text):
+    """旧实现：每个触发短语各自 findall（IGNORECASE），结果按触发短语顺序拼接"""
+    found = []
+    for pattern in COMPANY_TRIGGER_PATTERNS.values():
+        found.extend(m.strip() for m in re.findall(rf'{pattern}({COMPANY_NAME_PATTERN})', text, re.IGNORECASE))
+    return found
+
+
+class _Article:
+    def __init__(self, text, pmid="1"):
+        self.pmid = pmid
+        self.title = "t"
+        self.text = text
+
+
+@pytest.mark.parametrize("text", [
+    # 企业名中包含另一个触发短语：两个触发短语各自计数
+    "J.D. is an employee of Arvinas and holds stock in Arvinas.",
+    # 企业名中重复同一个触发短语：与 findall 一致，被前一个匹配消耗
+    "Funded by funded by Pfizer Inc.",
+    "Licensed to Acme licensed to Beta Corp and licensed to Gamma.",
+    "This work was FUNDED BY Pfizer Inc and licensed to Novartis AG under CN114269365A.",
+    "No conflicts of interest.",
+] + _sample_abstracts(4))
+def test_company_matches_equal_per_trigger_findall(text):
+    single_pass = sorted(m.value.strip() for m in COMPANY_EXTRACTOR.finditer(text))
+    assert single_pass == sorted(_legacy_companies(text))
+
+
+def test_company_match_offsets_point_into_original_text():
+    text = "Consultant for Merck Sharp and Dohme; consultant for Merck again."
+    for match in COMPANY_EXTRACTOR.finditer(text):
+        assert text[match.start:match.end] == match.value
+    assert [m.label for m in COMPANY_EXTRACTOR.finditer(text)] == ["consultant for", "consultant for"]
+
+
+def test_coi_patents_use_shared_normalizer():
+    text = ("Disclosed in WO/2024/123456 (also WO2024123456) and US 2024/0182490 A1; "
+            "funded by Pfizer Inc and employee of Arvinas.")
+    result = analyze_article_coi(_Article(text))
+
+    assert [p["canonical_id"] for p in result["patents"]] == ["WO2024123456", "US20240182490A1"]
+    assert [p["type"] for p in result["patents"]] == ["WO", "US"]
+    assert [c["company"] for c in result["companies"]] == ["Pfizer Inc and employee", "Arvinas"]
+    assert result["coi_score"] == 4
+
+
+def test_no_coi_returns_none():
+    assert analyze_article_coi(_Article("Plain abstract without disclosures.")) is None
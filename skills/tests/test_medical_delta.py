@@ -0,0 +1,114 @@
+"""
+增量抓取（search_medical_db_delta）与水位线：日期下限、待处理队列、已见 PMID 淘汰、分页 efetch
+E-utilities 调用以替身代替，不发出网络请求
+"""
+
+import pytest
+
+from engines import medical_engine, pubmed_watermark
+
+
+class _Article:
+    def __init__(self, pmid):
+        self.pmid = pmid
+
+    def to_dict(self):
+        return {"pmid": self.pmid}
+
+
+@pytest.fixture
+def pubmed(monkeypatch, tmp_path):
+    """替身 PubMed：ids 为当前检索结果（最新在前），记录每次 esearch 参数与 efetch 批次"""
+    monkeypatch.setenv("NCBI_EMAIL", "test@example.org")
+    monkeypatch.setenv("PUBMED_WATERMARK_DIR", str(tmp_path))
+
+    state = {"ids": [], "searches": [], "efetch_batches": []}
+
+    def _esearch_history(query, sort, filters):
+        state["searches"].append({"query": query, "sort": sort, "filters": filters})
+        return len(state["ids"]), "WEBENV", "1"
+
+    def _fetch_history_ids(webenv, query_key, retstart, retmax):
+        return state["ids"][retstart:retstart + retmax]
+
+    def _iter_articles(id_list):
+        state["efetch_batches"].append(list(id_list))
+        return (_Article(pmid) for pmid in id_list)
+
+    monkeypatch.setattr(medical_engine, "_esearch_history", _esearch_history)
+    monkeypatch.setattr(medical_engine, "_fetch_history_ids", _fetch_history_ids)
+    monkeypatch.setattr(medical_engine, "_iter_articles", _iter_articles)
+    return state
+
+
+def _pmids(result):
+    return [article["pmid"] for article in result["articles"]]
+
+
+def _watermark(query="PROTAC"):
+    term, params = medical_engine.build_pubmed_query(query, None)
+    return pubmed_watermark.load_watermark(pubmed_watermark.watermark_key(term, params))
+
+
+def test_first_run_is_full_then_only_new_pmids(pubmed):
+    pubmed["ids"] = ["300", "200", "100"]
+    first = medical_engine.search_medical_db_delta("PROTAC")
+    assert first["since"] is None
+    assert _pmids(first) == ["300", "200", "100"]
+    assert pubmed["searches"][-1]["sort"] == "pub_date"
+
+    pubmed["ids"] = ["400", "300"]
+    second = medical_engine.search_medical_db_delta("PROTAC")
+    assert second["since"] is not None
+    assert pubmed["searches"][-1]["filters"]["datetype"] == "edat"
+    assert _pmids(second) == ["400"]
+
+
+def test_truncated_run_keeps_date_bound_and_queues_the_rest(pubmed):
+    pubmed["ids"] = [str(pmid) for pmid in range(110, 100, -1)]
+    first = medical_engine.search_medical_db_delta("PROTAC", max_results=4)
+    assert first["truncated"] and first["pending"] == 6
+    assert _pmids(first) == ["110", "109", "108", "107"]
+
+    watermark = _watermark()
+    assert watermark["last_run"]  # 截断时同样写入日期水位，之后的检索不会退回无下限的全量扫描
+    assert watermark["pending_pmids"] == ["106", "105", "104", "103", "102", "101"]
+
+    pubmed["ids"] = ["111"]
+    second = medical_engine.search_medical_db_delta("PROTAC", max_results=4)
+    assert pubmed["searches"][-1]["filters"]["mindate"] == second["since"]
+    assert _pmids(second) == ["106", "105", "104", "103"]
+
+    third = medical_engine.search_medical_db_delta("PROTAC", max_results=None)
+    assert _pmids(third) == ["102", "101", "111"]
+    assert not third["truncated"] and _watermark()["pending_pmids"] == []
+
+
+def test_evicted_seen_pmids_are_not_returned_again(pubmed, monkeypatch):
+    monkeypatch.setattr(pubmed_watermark, "MAX_SEEN_PMIDS", 3)
+    pubmed["ids"] = ["105", "104", "103", "102", "101"]
+    medical_engine.search_medical_db_delta("PROTAC")
+
+    watermark = _watermark()
+    assert sorted(watermark["seen_pmids"]) == ["103", "104", "105"]
+    assert watermark["seen_floor"] == 102
+
+    pubmed["ids"] = ["106", "105", "102", "101"]
+    assert _pmids(medical_engine.search_medical_db_delta("PROTAC")) == ["106"]
+
+
+def test_efetch_is_paged(pubmed, monkeypatch):
+    monkeypatch.setattr(medical_engine, "DEFAULT_PAGE_SIZE", 3)
+    monkeypatch.setattr(medical_engine, "DELTA_ID_PAGE_SIZE", 4)
+    pubmed["ids"] = [str(pmid) for pmid in range(200, 190, -1)]
+
+    result = medical_engine.search_medical_db_delta("PROTAC", max_results=None)
+    assert result["candidates"] == 10 and result["new_count"] == 10
+    assert [len(batch) for batch in pubmed["efetch_batches"]] == [3, 3, 3, 1]
+
+
+def test_commit_false_leaves_watermark_untouched(pubmed):
+    pubmed["ids"] = ["10", "9"]
+    medical_engine.search_medical_db_delta("PROTAC", commit=False)
+    assert _watermark() is None
+    assert _pmids(medical_engine.search_medical_db_delta("PROTAC")) == ["10", "9"]
@@ -0,0 +1,105 @@
+"""
+NCBI 令牌桶：突发容量、按预订顺序等待、同步 / 异步共用一个桶、跨进程共享状态文件、限额选择
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from engines import ncbi_rate_limiter
+from engines.ncbi_rate_limiter import FCNTL_AVAILABLE, NCBIRateLimiter, get_ncbi_rate_limit
+
+
+def test_burst_then_wait_per_token():
+    limiter = NCBIRateLimiter(rate_per_s=10, burst=2)
+    waits = [limiter._reserve() for _ in range(4)]
+    assert waits[:2] == [0.0, 0.0]
+    # 第 3、4 个令牌依次预订在 0.1s、0.2s 之后
+    assert waits[2] == pytest.approx(0.1, abs=0.02)
+    assert waits[3] == pytest.approx(0.2, abs=0.02)
+
+    stats = limiter.stats()
+    assert (stats["acquired"], stats["throttled"]) == (4, 2)
+    assert stats["max_wait_s"] == pytest.approx(0.2, abs=0.02)
+
+
+def test_concurrent_callers_respect_rate():
+    limiter = NCBIRateLimiter(rate_per_s=20)
+    done = []
+
+    def _call():
+        limiter.acquire()
+        done.append(time.perf_counter())
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=_call) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # 1 个突发令牌 + 5 个按 20/s 补充：至少 0.25s
+    assert max(done) - start >= 0.23
+    assert limiter.stats()["throttled"] == 5
+
+
+def test_async_acquire_shares_the_bucket_without_blocking_the_loop():
+    limiter = NCBIRateLimiter(rate_per_s=20)
+    limiter.acquire()
+    ticks = []
+
+    async def _ticker():
+        for _ in range(5):
+            ticks.append(time.perf_counter())
+            await asyncio.sleep(0.01)
+
+    async def _main():
+        return await asyncio.gather(limiter.acquire_async(), limiter.acquire_async(), _ticker())
+
+    wait_a, wait_b, _ = asyncio.run(_main())
+    assert wait_a == pytest.approx(0.05, abs=0.02)
+    assert wait_b == pytest.approx(0.10, abs=0.02)
+    # 等待期间事件循环仍在运行其他协程
+    assert len(ticks) == 5 and ticks[-1] - ticks[0] < 0.09
+
+
+@pytest.mark.skipif(not FCNTL_AVAILABLE, reason="需要 fcntl")
+def test_instances_share_state_file(tmp_path):
+    state = tmp_path / "bucket.state"
+    first = NCBIRateLimiter(rate_per_s=10, state_file=state)
+    second = NCBIRateLimiter(rate_per_s=10, state_file=state)
+
+    assert first._reserve() == 0.0
+    # 另一个实例（另一个进程）看到同一个桶，令牌已被取走
+    assert second._reserve() == pytest.approx(0.1, abs=0.02)
+    assert second.stats()["shared"]
+
+
+@pytest.mark.skipif(not FCNTL_AVAILABLE, reason="需要 fcntl")
+def test_corrupt_state_file_resets_bucket(tmp_path):
+    state = tmp_path / "bucket.state"
+    state.write_text("garbage")
+    assert NCBIRateLimiter(rate_per_s=10, state_file=state)._reserve() == 0.0
+
+
+@pytest.mark.parametrize("env, expected", [
+    ({}, 3),
+    ({"NCBI_API_KEY": "key"}, 10),
+    ({"NCBI_MAX_RPS": "5"}, 5.0),
+    ({"NCBI_MAX_RPS": "0"}, 0.1),
+    ({"NCBI_MAX_RPS": "fast", "NCBI_API_KEY": "key"}, 10),
+])
+def test_rate_limit_from_env(monkeypatch, env, expected):
+    for name in ("NCBI_API_KEY", "NCBI_MAX_RPS"):
+        monkeypatch.delenv(name, raising=False)
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+    assert get_ncbi_rate_limit() == expected
+
+
+def test_shared_limiter_is_a_singleton(monkeypatch, tmp_path):
+    monkeypatch.setattr(ncbi_rate_limiter, "_LIMITER", None)
+    monkeypatch.setenv("NCBI_RATE_LIMIT_FILE", str(tmp_path / "bucket.state"))
+    assert ncbi_rate_limiter.get_ncbi_rate_limiter() is ncbi_rate_limiter.get_ncbi_rate_limiter()
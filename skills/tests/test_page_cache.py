@@ -0,0 +1,117 @@
+"""
+网页内容缓存：分域名 / 检索结果页 TTL、过期条目的条件请求续期、内容去重、容量淘汰，
+以及静态路径不缓存解析失败的页面
+"""
+
+import time
+
+import pytest
+
+from engines import browser_engine, page_cache
+from engines.http_pool import HTTPResult
+from engines.page_cache import PageCache, normalize_url
+from scrapers.data_cleaner import PARSE_ERROR_PREFIX
+
+HTML = "<html><body><p>" + "Targeted protein degradation. " * 20 + "</p></body></html>"
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return PageCache(cache_dir=tmp_path, default_ttl_s=100, domain_ttls={"patents.google.com": 1000},
+                     query_ttl_s=10)
+
+
+def test_normalize_url():
+    assert normalize_url("HTTPS://Example.COM:443/a?b=2&a=1&utm_source=x#frag") == "https://example.com/a?a=1&b=2"
+    assert normalize_url("http://example.com") == "http://example.com/"
+
+
+def test_ttl_by_domain_and_query(cache):
+    assert cache.ttl_for("https://patents.google.com/patent/US1234567B2") == 1000
+    assert cache.ttl_for("https://www.patents.google.com/patent/X") == 1000
+    assert cache.ttl_for("https://example.com/page") == 100
+    # 检索结果页不超过 query_ttl_s，即使所在域名的有效期更长
+    assert cache.ttl_for("https://patents.google.com/?q=protac") == 10
+
+
+def test_store_lookup_and_staleness(cache, monkeypatch):
+    now = time.time()
+    cache.store("https://example.com/a", "text", HTML, etag='"v1"')
+    page = cache.lookup("https://example.com/a#section")
+    assert page.fresh and page.text == "text" and cache.read_html(page) == HTML
+
+    monkeypatch.setattr(page_cache.time, "time", lambda: now + 101)
+    stale = cache.lookup("https://example.com/a")
+    assert not stale.fresh and stale.revalidatable
+    cache.touch("https://example.com/a")
+    assert cache.lookup("https://example.com/a").fresh
+    assert cache.stats()["revalidated"] == 1
+
+
+def test_query_pages_expire_sooner_and_can_be_disabled(tmp_path, monkeypatch):
+    cache = PageCache(cache_dir=tmp_path, default_ttl_s=100, domain_ttls={}, query_ttl_s=10)
+    now = time.time()
+    cache.store("https://example.com/search?q=protac", "results")
+    cache.store("https://example.com/page", "page")
+    monkeypatch.setattr(page_cache.time, "time", lambda: now + 11)
+    assert not cache.lookup("https://example.com/search?q=protac").fresh
+    assert cache.lookup("https://example.com/page").fresh
+
+    no_query = PageCache(cache_dir=tmp_path / "q0", default_ttl_s=100, domain_ttls={}, query_ttl_s=0)
+    no_query.store("https://example.com/search?q=protac", "results")
+    assert no_query.lookup("https://example.com/search?q=protac") is None
+
+
+def test_identical_content_is_stored_once(cache, tmp_path):
+    cache.store("https://a.example.com/", "same text", HTML)
+    cache.store("https://b.example.com/", "same text", HTML)
+    assert len(list((tmp_path / "blobs").glob("*/*.gz"))) == 2
+    assert cache.stats()["deduplicated"] == 2
+
+
+def test_eviction_drops_oldest_entries_and_their_blobs(tmp_path):
+    cache = PageCache(cache_dir=tmp_path, default_ttl_s=100, domain_ttls={}, max_disk_bytes=4000)
+    for i in range(30):
+        cache.store(f"https://example.com/{i}", f"text {i} " + "x" * 400 + str(i) * 400)
+    total = sum(p.stat().st_size for p in tmp_path.rglob("*") if p.is_file())
+    assert total <= 4000
+    assert cache.stats()["evictions"] > 0
+    assert cache.lookup("https://example.com/29") is not None
+    assert cache.lookup("https://example.com/0") is None
+
+
+@pytest.fixture
+def shared_cache(monkeypatch, cache):
+    monkeypatch.setattr(page_cache, "_CACHE", cache)
+    return cache
+
+
+def _result(status=200, body=HTML, headers=None):
+    headers = {"content-type": "text/html; charset=utf-8", **(headers or {})}
+    return HTTPResult("https://example.com/a", status, headers, body.encode("utf-8"), len(body))
+
+
+def test_static_path_caches_with_validators_and_reuses_on_304(shared_cache):
+    url = "https://example.com/a"
+    text, reason = browser_engine._process_static_response(url, url, _result(headers={"etag": '"v1"'}), None)
+    assert reason is None and "Targeted protein degradation" in text
+
+    cached = shared_cache.lookup(url)
+    assert cached.etag == '"v1"'
+    assert browser_engine._static_headers(cached)["If-None-Match"] == '"v1"'
+    assert browser_engine._process_static_response(url, url, _result(status=304, body=""), cached) == (text, None)
+    assert shared_cache.stats()["revalidated"] == 1
+
+
+def test_redirected_response_is_cached_without_validators(shared_cache):
+    url = "https://example.com/a"
+    browser_engine._process_static_response(url, "https://example.com/b", _result(headers={"etag": '"v1"'}), None)
+    assert not shared_cache.lookup(url).revalidatable
+
+
+def test_parse_errors_are_not_cached(shared_cache, monkeypatch):
+    url = "https://example.com/broken"
+    monkeypatch.setattr(browser_engine, "clean_html_to_text", lambda html: PARSE_ERROR_PREFIX + "boom")
+    assert browser_engine._process_static_response(url, url, _result(), None) == (None, "parse_error")
+    assert browser_engine._clean_browser_html(url, HTML) == (PARSE_ERROR_PREFIX + "boom", None)
+    assert shared_cache.lookup(url) is None
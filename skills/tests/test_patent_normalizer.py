@@ -0,0 +1,110 @@
+"""
+专利号规范化（各专利局写法 / 空白变体 / 无效输入）、文本扫描与证据哈希索引
+"""
+
+import pytest
+
+from scrapers.patent_normalizer import (
+    _TEXT_CASES,
+    PatentEvidenceIndex,
+    PatentId,
+    canonical_patent_id,
+    find_patent_ids,
+    normalize_patent_number,
+)
+
+
+@pytest.mark.parametrize("raw, expected", [
+    # JP：年份与序号直接拼接
+    ("JP2024-123456", PatentId("JP", "2024123456")),
+    ("JP 2024-123456 A", PatentId("JP", "2024123456", "A")),
+    # CN：申请号去校验位
+    ("CN202410987654", PatentId("CN", "202410987654")),
+    ("CN202410987654.3", PatentId("CN", "202410987654")),
+    ("CN114269365A", PatentId("CN", "114269365", "A")),
+    # WO：斜杠写法与旧式 5 位序号
+    ("WO/2024/123456", PatentId("WO", "2024123456")),
+    ("WO 2024/123456 A1", PatentId("WO", "2024123456", "A1")),
+    ("WO2004/12345", PatentId("WO", "2004012345")),
+    # US：申请公开号补零、授权号去前导零、千分位逗号
+    ("US 2024/0182490 A1", PatentId("US", "20240182490", "A1")),
+    ("US2024789012", PatentId("US", "20240789012")),
+    ("US 11,234,567 B2", PatentId("US", "11234567", "B2")),
+    ("US 09876543", PatentId("US", "9876543")),
+    # EP：6 位序号补零
+    ("EP 123456 B1", PatentId("EP", "0123456", "B1")),
+    ("ep1234567a1", PatentId("EP", "1234567", "A1")),
+])
+def test_normalize_variants(raw, expected):
+    assert normalize_patent_number(raw) == expected
+
+
+@pytest.mark.parametrize("raw", [
+    "WO/2024/123456",
+    " WO 2024 / 123456 ",
+    "WO\t2024/123456",
+    "wo-2024-123456",
+    "WO2024123456",
+])
+def test_whitespace_and_separator_variants_share_one_id(raw):
+    assert canonical_patent_id(raw) == "WO2024123456"
+
+
+@pytest.mark.parametrize("raw", [
+    "",
+    "DE1234567",      # 不支持的专利局
+    "EP12345",        # EP 序号不足 6 位
+    "CN1234567",      # CN 位数不足
+    "US",
+    "US 2024/0182490 / A1 extra",
+])
+def test_invalid_numbers_are_rejected(raw):
+    assert normalize_patent_number(raw) is None
+
+
+def test_key_ignores_kind():
+    assert canonical_patent_id("US20240182490A1", with_kind=False) == "US20240182490"
+    assert normalize_patent_number("US20240182490").key == normalize_patent_number("US 2024/0182490 A1").key
+
+
+@pytest.mark.parametrize("text, expected", _TEXT_CASES)
+def test_text_scan(text, expected):
+    assert [str(pid) for pid, _, _ in find_patent_ids(text)] == expected
+
+
+def test_text_scan_offsets():
+    text = "see JP2024-123456 filed"
+    [(pid, start, end)] = find_patent_ids(text)
+    assert text[start:end] == "JP2024-123456"
+
+
+def _index():
+    index = PatentEvidenceIndex()
+    index.add({"evidence_id": "E1", "patent_number": "US 2024/0182490 A1"}, source="raw_evidence")
+    index.add({"evidence_id": "E2", "raw_text": "Licensed under WO/2024/123456 and US20240182490."},
+              source="raw_evidence")
+    index.add({"validation_id": "V1", "canonical_id": "WO2024123456A1"}, source="validated_assets")
+    index.add({"evidence_id": "E3", "raw_text": "no patent here"}, source="raw_evidence")
+    return index
+
+
+@pytest.mark.parametrize("query", ["US20240182490", "US 2024/0182490 A1", "us2024-0182490b1"])
+def test_index_lookup_by_any_spelling(query):
+    assert [r["evidence_id"] for r in _index().get(query)] == ["E1", "E2"]
+
+
+def test_index_lookup_filters_by_source_and_misses():
+    index = _index()
+    assert [r["validation_id"] for r in index.get("WO/2024/123456", source="validated_assets")] == ["V1"]
+    assert index.get("WO2024123456", source="missing") == []
+    assert index.get("EP1234567") == []
+    assert index.get("not a patent") == []
+    assert "WO 2024/123456" in index and "EP1234567" not in index
+
+
+def test_index_join_duplicates_and_stats():
+    index = _index()
+    assert set(index.join("raw_evidence", "validated_assets")) == {"WO2024123456"}
+    assert set(index.duplicates()) == {"US20240182490", "WO2024123456"}
+    assert index.kinds("US20240182490") == ["A1"]
+    assert index.stats() == {"records": 4, "unindexed_records": 1, "patents": 2, "duplicate_patents": 2}
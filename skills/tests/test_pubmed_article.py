@@ -0,0 +1,108 @@
+"""
+efetch 流式解码：逐篇产出、内联标签文本、日期规范化、非文献节点与缺失字段、已处理节点被清理
+"""
+
+import io
+
+import pytest
+
+from engines import pubmed_article
+from engines.pubmed_article import PubMedArticle, format_pub_date, iter_efetch_articles, parse_esummary
+
+
+def _article(pmid, title="Title", abstract="<AbstractText>Abstract.</AbstractText>", pub_date="<Year>2024</Year>"):
+    return f"""
+<PubmedArticle><MedlineCitation><PMID Version="1">{pmid}</PMID><Article>
+  <Journal><JournalIssue><PubDate>{pub_date}</PubDate></JournalIssue></Journal>
+  <ArticleTitle>{title}</ArticleTitle>
+  <Abstract>{abstract}</Abstract>
+  <AuthorList><Author><AffiliationInfo><Affiliation>Arvinas, New Haven, USA</Affiliation></AffiliationInfo></Author>
+  <Author><AffiliationInfo><Affiliation>Second</Affiliation></AffiliationInfo></Author></AuthorList>
+</Article></MedlineCitation></PubmedArticle>"""
+
+
+def _efetch(*articles):
+    body = "".join(articles)
+    return io.BytesIO(f'<?xml version="1.0"?><PubmedArticleSet>{body}</PubmedArticleSet>'.encode("utf-8"))
+
+
+def test_articles_are_decoded_in_order():
+    stream = _efetch(
+        _article("1", title="PROTAC <i>in vivo</i> degradation",
+                 abstract='<AbstractText Label="BACKGROUND">A.</AbstractText><AbstractText>B CN114269365A.</AbstractText>',
+                 pub_date="<Year>2024</Year><Month>3</Month><Day>7</Day>"),
+        "<PubmedBookArticle><BookDocument><PMID>99</PMID></BookDocument></PubmedBookArticle>",
+        _article("2", pub_date="<MedlineDate>2023 Jan-Feb</MedlineDate>"),
+    )
+    articles = list(iter_efetch_articles(stream))
+
+    assert [a.pmid for a in articles] == ["1", "2"]
+    first = articles[0]
+    assert first.title == "PROTAC in vivo degradation"
+    assert first.abstract == "A. B CN114269365A."
+    assert first.pub_date == "2024-03-07"
+    assert first.affiliation == "Arvinas, New Haven, USA"
+    assert articles[1].pub_date == "2023 Ja"
+
+
+def test_processed_articles_are_cleared_from_the_tree(monkeypatch):
+    roots = []
+    real_iterparse = pubmed_article.ET.iterparse
+
+    def _iterparse(stream, events):
+        for event, elem in real_iterparse(stream, events):
+            if not roots:
+                roots.append(elem)
+            yield event, elem
+
+    monkeypatch.setattr(pubmed_article.ET, "iterparse", _iterparse)
+    decoder = iter_efetch_articles(_efetch(*(_article(str(i)) for i in range(1000))))
+
+    # 根节点下只保留解析器预读（按块读取）范围内的文献，与批量大小无关
+    live = []
+    for i, article in enumerate(decoder):
+        assert article.pmid == str(i)
+        live.append(len(roots[0]))
+    assert i == 999
+    assert max(live) < 100 and len(roots[0]) == 0
+
+
+def test_missing_fields():
+    stream = _efetch(
+        "<PubmedArticle><MedlineCitation><PMID>5</PMID></MedlineCitation></PubmedArticle>",
+        "<PubmedArticle><MedlineCitation></MedlineCitation></PubmedArticle>",
+    )
+    [article] = list(iter_efetch_articles(stream))
+    assert article.to_dict() == {"pmid": "5", "title": "", "abstract": "", "pub_date": "",
+                                 "affiliation": "", "url": "https://pubmed.ncbi.nlm.nih.gov/5/"}
+
+
+def test_malformed_xml_raises():
+    with pytest.raises(Exception):
+        list(iter_efetch_articles(io.BytesIO(b"<PubmedArticleSet><PubmedArticle>")))
+
+
+def test_dict_round_trip():
+    article = PubMedArticle("7", "T", "A", "2024-01", "Aff")
+    assert PubMedArticle.from_dict(article.to_dict()).to_dict() == article.to_dict()
+
+
+@pytest.mark.parametrize("parts, expected", [
+    (("2024", "Jan", "", ""), "2024-Jan"),
+    (("2024", "1", "2", ""), "2024-01-02"),
+    (("", "", "", "2024 Jan-Feb"), "2024 Ja"),
+    (("", "", "", ""), ""),
+])
+def test_format_pub_date(parts, expected):
+    assert format_pub_date(*parts) == expected
+
+
+def test_parse_esummary():
+    xml = b"""<eSummaryResult><DocSum><Id>1</Id>
+      <Item Name="PubDate" Type="Date">2024 Mar</Item>
+      <Item Name="Title" Type="String">Degrader</Item>
+      <Item Name="PubTypeList" Type="List"><Item Name="PubType">Review</Item></Item>
+    </DocSum><DocSum><Id></Id></DocSum></eSummaryResult>"""
+    assert parse_esummary(io.BytesIO(xml)) == [
+        {"pmid": "1", "title": "Degrader", "pub_date": "2024 Mar", "pub_types": ["Review"]}
+    ]
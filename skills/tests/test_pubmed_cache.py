@@ -0,0 +1,115 @@
+"""
+PubMed 两级缓存：内存 / 磁盘命中、TTL 过期、LRU 淘汰、codec 往返、读写失败不影响主流程
+"""
+
+import json
+import time
+
+import pytest
+
+from engines import pubmed_cache
+from engines.pubmed_cache import PubMedCache, esearch_key
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return PubMedCache(cache_dir=tmp_path, ttl_s=60, memory_items=2)
+
+
+def _restart(cache):
+    """同一目录上的新实例（内存层为空，模拟进程重启）"""
+    return PubMedCache(cache_dir=cache.cache_dir, ttl_s=cache.ttl_s, memory_items=cache.memory_items)
+
+
+def test_memory_then_disk_hit(cache):
+    cache.set("esearch", "k", {"ids": ["1", "2"]})
+    assert cache.get("esearch", "k") == {"ids": ["1", "2"]}
+    assert cache.stats()["memory_hits"] == 1
+
+    restarted = _restart(cache)
+    assert restarted.get("esearch", "k") == {"ids": ["1", "2"]}
+    assert restarted.get("esearch", "k") == {"ids": ["1", "2"]}
+    stats = restarted.stats()
+    assert (stats["disk_hits"], stats["memory_hits"], stats["misses"]) == (1, 1, 0)
+
+
+def test_namespaces_do_not_collide(cache):
+    cache.set("esearch", "38000000", ["a"])
+    cache.set("article", "38000000", ["b"])
+    assert _restart(cache).get("esearch", "38000000") == ["a"]
+    assert _restart(cache).get("article", "38000000") == ["b"]
+
+
+def test_expired_entries_are_misses_and_removed(cache, monkeypatch):
+    now = time.time()
+    cache.set("article", "1", {"pmid": "1"})
+    monkeypatch.setattr(pubmed_cache.time, "time", lambda: now + 61)
+
+    assert cache.get("article", "1") is None
+    restarted = _restart(cache)
+    assert restarted.get("article", "1") is None
+    assert not list(cache.cache_dir.glob("article/*/*.json"))
+    assert restarted.stats()["misses"] == 1
+
+
+def test_memory_lru_evicts_least_recently_used(cache):
+    for key in ("a", "b"):
+        cache.set("article", key, key)
+    cache.get("article", "a")          # a 成为最近使用
+    cache.set("article", "c", "c")     # 淘汰 b
+
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["memory_items"] == 2
+    hits = cache.stats()["memory_hits"]
+    assert cache.get("article", "a") == "a" and cache.get("article", "c") == "c"
+    assert cache.stats()["memory_hits"] == hits + 2
+    # b 仍可从磁盘读回
+    assert cache.get("article", "b") == "b"
+    assert cache.stats()["disk_hits"] == 1
+
+
+def test_disk_eviction_keeps_total_under_limit(tmp_path):
+    cache = PubMedCache(cache_dir=tmp_path, ttl_s=60, max_disk_bytes=2000)
+    for i in range(20):
+        cache.set("article", str(i), "x" * 200)
+    files = list(tmp_path.glob("article/*/*.json"))
+    assert sum(p.stat().st_size for p in files) <= 2000
+    assert cache.stats()["evictions"] > 0
+
+
+def test_codec_round_trip(cache):
+    class Article:
+        def __init__(self, pmid):
+            self.pmid = pmid
+
+    cache.register_codec("article", lambda a: {"pmid": a.pmid}, lambda d: Article(d["pmid"]))
+    cache.set("article", "7", Article("7"))
+
+    path = next(cache.cache_dir.glob("article/*/*.json"))
+    assert json.loads(path.read_text())["value"] == {"pmid": "7"}
+
+    restarted = _restart(cache)
+    restarted.register_codec("article", lambda a: {"pmid": a.pmid}, lambda d: Article(d["pmid"]))
+    assert restarted.get("article", "7").pmid == "7"
+
+
+def test_corrupt_file_and_unserializable_value_are_misses(cache):
+    cache.set("esearch", "k", ["1"])
+    next(cache.cache_dir.glob("esearch/*/*.json")).write_text("{not json")
+    assert _restart(cache).get("esearch", "k") is None
+
+    cache.set("esearch", "obj", object())   # 写磁盘失败只跳过
+    assert _restart(cache).get("esearch", "obj") is None
+
+
+def test_disabled_cache(tmp_path):
+    cache = PubMedCache(cache_dir=tmp_path, ttl_s=0)
+    cache.set("esearch", "k", ["1"])
+    assert cache.get("esearch", "k") is None
+    assert not any(tmp_path.iterdir())
+
+
+def test_esearch_key_includes_params():
+    assert esearch_key("q", 20, "relevance") != esearch_key("q", 20, "pub_date")
+    assert esearch_key("q", 20, "relevance", {"mindate": "2024/01/01", "datetype": "edat"}) == \
+        esearch_key("q", 20, "relevance", {"datetype": "edat", "mindate": "2024/01/01"})
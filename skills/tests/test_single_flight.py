@@ -0,0 +1,145 @@
+"""
+在途请求合并：同步 / 异步合并、结果拷贝、异常传播、完成后重新执行、取消语义、开关
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from engines.single_flight import SingleFlight
+
+
+def _run_concurrently(group, key, func, count):
+    """count 个线程同时以相同 key 调用，返回各自的结果（或异常）"""
+    results = [None] * count
+    barrier = threading.Barrier(count)
+
+    def _call(i):
+        barrier.wait()
+        try:
+            results[i] = group.do(key, func)
+        except Exception as e:
+            results[i] = e
+
+    threads = [threading.Thread(target=_call, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def _slow(calls, value, release):
+    def _func():
+        calls.append(1)
+        release.wait(5)
+        return value
+    return _func
+
+
+def test_concurrent_calls_execute_once_and_get_independent_copies():
+    group = SingleFlight("test")
+    calls, release = [], threading.Event()
+    threading.Timer(0.2, release.set).start()
+
+    results = _run_concurrently(group, "q", _slow(calls, {"ids": [1, 2]}, release), 4)
+
+    assert len(calls) == 1
+    assert all(r == {"ids": [1, 2]} for r in results)
+    # 发起者与等待者拿到的都是互不共享的拷贝
+    assert len({id(r) for r in results}) == 4
+    results[0]["ids"].append(3)
+    assert results[1]["ids"] == [1, 2]
+    stats = group.stats()
+    assert (stats["calls"], stats["executions"], stats["coalesced"], stats["in_flight"]) == (4, 1, 3, 0)
+
+
+def test_uncoalesced_leader_gets_original_result():
+    group = SingleFlight("test")
+    value = {"ids": [1]}
+    assert group.do("q", lambda: value) is value
+
+
+def test_errors_reach_every_waiter():
+    group = SingleFlight("test")
+    release = threading.Event()
+    threading.Timer(0.2, release.set).start()
+
+    def _fail():
+        release.wait(5)
+        raise RuntimeError("esearch failed")
+
+    results = _run_concurrently(group, "q", _fail, 3)
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert group.stats()["errors"] == 1
+
+
+def test_completed_calls_are_not_reused():
+    group = SingleFlight("test")
+    calls = []
+    assert group.do("q", lambda: calls.append(1) or len(calls)) == 1
+    assert group.do("q", lambda: calls.append(1) or len(calls)) == 2
+
+
+def test_disabled_by_env(monkeypatch):
+    monkeypatch.setenv("SINGLE_FLIGHT_ENABLED", "0")
+    group = SingleFlight("test")
+    calls, release = [], threading.Event()
+    release.set()
+    _run_concurrently(group, "q", _slow(calls, 1, release), 3)
+    assert len(calls) == 3
+
+
+def test_async_calls_share_one_task_and_get_copies():
+    group = SingleFlight("test")
+    calls = []
+
+    async def _fetch():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {"ids": [1]}
+
+    async def _main():
+        results = await asyncio.gather(*(group.do_async("q", _fetch) for _ in range(3)))
+        alone = await group.do_async("q", _fetch)
+        return results, alone
+
+    results, alone = asyncio.run(_main())
+    assert len(calls) == 2
+    assert all(r == {"ids": [1]} for r in results)
+    assert len({id(r) for r in results}) == 3
+    assert alone == {"ids": [1]}
+
+
+def test_async_task_survives_until_all_callers_cancel():
+    group = SingleFlight("test")
+    state = {"started": 0, "cancelled": False}
+
+    async def _fetch():
+        state["started"] += 1
+        try:
+            await asyncio.sleep(0.2)
+        except asyncio.CancelledError:
+            state["cancelled"] = True
+            raise
+        return "page"
+
+    async def _main():
+        first = asyncio.ensure_future(group.do_async("q", _fetch))
+        second = asyncio.ensure_future(group.do_async("q", _fetch))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        result = await second       # 另一个调用者仍在等待：底层调用不被取消
+        assert not state["cancelled"]
+
+        third = asyncio.ensure_future(group.do_async("q2", _fetch))
+        await asyncio.sleep(0.01)
+        third.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await third
+        await asyncio.sleep(0)
+        return result
+
+    assert asyncio.run(_main()) == "page"
+    assert state["cancelled"] and state["started"] == 2